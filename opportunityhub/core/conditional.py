@@ -0,0 +1,58 @@
+"""
+Conditional GET (``ETag`` / ``Last-Modified``) for detail views.
+
+Django's ``condition`` decorator calls its etag and last-modified functions
+separately; here one cheap lookup returns the ``updated_at`` of every row a
+representation is built from (e.g. an opportunity and its employer), and
+both validators are derived from it. A matching ``If-None-Match`` or
+``If-Modified-Since`` is answered with 304 before the view loads or
+serializes anything.
+
+Related rows that have no ``updated_at`` of their own (skills, experiences,
+the user account) touch their parent's instead; see the apps' signals.
+"""
+
+import functools
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(timestamps):
+    raw = "|".join(timestamp.isoformat() for timestamp in timestamps)
+    return quote_etag(hashlib.md5(raw.encode("utf-8")).hexdigest())
+
+
+def conditional_get(lookup):
+    """
+    Decorate an APIView ``get(self, request, *args, **kwargs)``.
+    ``lookup(request, *args, **kwargs)`` returns the timestamps the response
+    depends on, or None if the object does not exist (the view then runs
+    and produces its own 404).
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            timestamps = lookup(request, *args, **kwargs)
+            if not timestamps:
+                return view_method(self, request, *args, **kwargs)
+
+            etag = make_etag(timestamps)
+            last_modified = int(max(timestamps).timestamp())
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,201 @@
+"""
+The 47 Kenyan counties, which ones share a border, and how many borders
+apart any two are.
+
+Everything is computed once, at import: ``DISTANCES[a][b]`` is the number of
+county borders crossed going from county ``a`` to county ``b`` (indexes into
+``COUNTIES``, in official county-code order). The opportunity list uses it
+to widen ``?county=`` to neighbouring counties, and the matching scorer to
+give partial location credit.
+"""
+
+from collections import deque
+
+from core.utils import normalize_key
+
+# Official county-code order (Mombasa = 001 ... Nairobi = 047)
+COUNTIES = (
+    "Mombasa",
+    "Kwale",
+    "Kilifi",
+    "Tana River",
+    "Lamu",
+    "Taita-Taveta",
+    "Garissa",
+    "Wajir",
+    "Mandera",
+    "Marsabit",
+    "Isiolo",
+    "Meru",
+    "Tharaka-Nithi",
+    "Embu",
+    "Kitui",
+    "Machakos",
+    "Makueni",
+    "Nyandarua",
+    "Nyeri",
+    "Kirinyaga",
+    "Murang'a",
+    "Kiambu",
+    "Turkana",
+    "West Pokot",
+    "Samburu",
+    "Trans Nzoia",
+    "Uasin Gishu",
+    "Elgeyo-Marakwet",
+    "Nandi",
+    "Baringo",
+    "Laikipia",
+    "Nakuru",
+    "Narok",
+    "Kajiado",
+    "Kericho",
+    "Bomet",
+    "Kakamega",
+    "Vihiga",
+    "Bungoma",
+    "Busia",
+    "Siaya",
+    "Kisumu",
+    "Homa Bay",
+    "Migori",
+    "Kisii",
+    "Nyamira",
+    "Nairobi",
+)
+
+# Land borders (lake crossings excluded); listed once, used both ways
+BORDERS = {
+    "Mombasa": ["Kilifi", "Kwale"],
+    "Kwale": ["Kilifi", "Taita-Taveta"],
+    "Kilifi": ["Taita-Taveta", "Tana River"],
+    "Tana River": ["Lamu", "Garissa", "Isiolo", "Kitui", "Taita-Taveta"],
+    "Lamu": ["Garissa"],
+    "Taita-Taveta": ["Kitui", "Makueni", "Kajiado"],
+    "Garissa": ["Wajir", "Isiolo"],
+    "Wajir": ["Mandera", "Marsabit", "Isiolo"],
+    "Marsabit": ["Turkana", "Samburu", "Isiolo"],
+    "Isiolo": ["Samburu", "Laikipia", "Meru"],
+    "Meru": ["Laikipia", "Nyeri", "Tharaka-Nithi"],
+    "Tharaka-Nithi": ["Embu", "Kitui"],
+    "Embu": ["Kirinyaga", "Murang'a", "Machakos", "Kitui"],
+    "Kitui": ["Machakos", "Makueni"],
+    "Machakos": ["Makueni", "Kajiado", "Nairobi", "Kiambu", "Murang'a"],
+    "Makueni": ["Kajiado"],
+    "Nyandarua": ["Nakuru", "Laikipia", "Nyeri", "Murang'a", "Kiambu"],
+    "Nyeri": ["Laikipia", "Kirinyaga", "Murang'a"],
+    "Kirinyaga": ["Murang'a"],
+    "Murang'a": ["Kiambu"],
+    "Kiambu": ["Nairobi", "Kajiado", "Nakuru"],
+    "Turkana": ["West Pokot", "Baringo", "Samburu"],
+    "West Pokot": ["Trans Nzoia", "Elgeyo-Marakwet", "Baringo"],
+    "Samburu": ["Baringo", "Laikipia"],
+    "Trans Nzoia": ["Bungoma", "Kakamega", "Uasin Gishu", "Elgeyo-Marakwet"],
+    "Uasin Gishu": ["Elgeyo-Marakwet", "Baringo", "Kericho", "Nandi", "Kakamega"],
+    "Elgeyo-Marakwet": ["Baringo"],
+    "Nandi": ["Kakamega", "Vihiga", "Kisumu", "Kericho"],
+    "Baringo": ["Kericho", "Nakuru", "Laikipia"],
+    "Laikipia": ["Nakuru"],
+    "Nakuru": ["Kajiado", "Narok", "Bomet", "Kericho"],
+    "Narok": ["Kajiado", "Bomet", "Nyamira", "Kisii", "Migori"],
+    "Kajiado": ["Nairobi"],
+    "Kericho": ["Kisumu", "Nyamira", "Bomet"],
+    "Bomet": ["Nyamira"],
+    "Kakamega": ["Bungoma", "Busia", "Siaya", "Kisumu", "Vihiga"],
+    "Vihiga": ["Kisumu"],
+    "Bungoma": ["Busia"],
+    "Busia": ["Siaya"],
+    "Siaya": ["Kisumu"],
+    "Kisumu": ["Homa Bay"],
+    "Homa Bay": ["Migori", "Kisii"],
+    "Migori": ["Kisii"],
+    "Kisii": ["Nyamira"],
+}
+
+# Other spellings seen in user input
+ALIASES = {
+    "Taita-Taveta": ["Taita Taveta", "Taita/Taveta", "Taita"],
+    "Tharaka-Nithi": ["Tharaka Nithi", "Tharaka"],
+    "Murang'a": ["Muranga", "Murang’a"],
+    "Elgeyo-Marakwet": ["Elgeyo Marakwet", "Keiyo Marakwet"],
+    "Trans Nzoia": ["Trans-Nzoia", "Transnzoia"],
+    "Homa Bay": ["Homabay", "Homa-Bay"],
+    "Nairobi": ["Nairobi City"],
+}
+
+
+def _build():
+    index = {name: i for i, name in enumerate(COUNTIES)}
+    neighbours = [set() for _ in COUNTIES]
+    for county, others in BORDERS.items():
+        for other in others:
+            neighbours[index[county]].add(index[other])
+            neighbours[index[other]].add(index[county])
+
+    # Breadth-first search from every county: 47 x 47 hop counts
+    distances = []
+    for start in range(len(COUNTIES)):
+        row = [None] * len(COUNTIES)
+        row[start] = 0
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for other in neighbours[current]:
+                if row[other] is None:
+                    row[other] = row[current] + 1
+                    queue.append(other)
+        distances.append(tuple(row))
+
+    spellings = [[name, *ALIASES.get(name, [])] for name in COUNTIES]
+    keys = tuple(
+        tuple(dict.fromkeys(normalize_key(spelling) for spelling in names))
+        for names in spellings
+    )
+    lookup = {key: i for i, county_keys in enumerate(keys) for key in county_keys}
+    spelling_by_key = {
+        normalize_key(spelling): spelling for names in spellings for spelling in names
+    }
+    return (
+        tuple(map(frozenset, neighbours)),
+        tuple(distances),
+        keys,
+        lookup,
+        spelling_by_key,
+    )
+
+
+NEIGHBOURS, DISTANCES, COUNTY_KEYS, _COUNTY_INDEX, _COUNTY_NAMES = _build()
+
+
+def county_index(name):
+    """
+    Position of ``name`` (any known spelling, any case) in ``COUNTIES``, or
+    None if it is not a Kenyan county
+    """
+    return _COUNTY_INDEX.get(normalize_key(name))
+
+
+def county_name(key):
+    """
+    The table's spelling of the county name or alias with key ``key``
+    (see normalize_key), or None if it is not one
+    """
+    return _COUNTY_NAMES.get(key)
+
+
+def counties_within(name, radius):
+    """
+    ``[(county index, distance)]`` for every county at most ``radius``
+    borders from ``name``, nearest first; empty if ``name`` is unknown
+    """
+    start = county_index(name)
+    if start is None:
+        return []
+    return sorted(
+        (
+            (other, distance)
+            for other, distance in enumerate(DISTANCES[start])
+            if distance <= radius
+        ),
+        key=lambda item: (item[1], item[0]),
+    )
@@ -0,0 +1,130 @@
+"""
+``Idempotency-Key`` support for POST views.
+
+A client that may retry a request (a double-tap, a dropped connection)
+sends the same ``Idempotency-Key`` header each time. The first request
+reserves the key with an insert that the ``(user, key)`` unique constraint
+makes race-free, runs, and stores its response; any repeat gets that stored
+response back (marked ``Idempotent-Replayed: true``) without running the
+view again. A repeat that arrives while the first is still running gets 409,
+and reusing a key for a different request gets 422.
+
+Keys expire after ``IDEMPOTENCY_KEY_TTL`` seconds; the
+``purge_idempotency_keys`` command deletes expired ones.
+"""
+
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http.request import RawPostDataException
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+def get_expiry_cutoff():
+    ttl = getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60)
+    return timezone.now() - timedelta(seconds=ttl)
+
+
+def request_hash(request):
+    digest = hashlib.sha256()
+    for part in (request.method, request.get_full_path()):
+        digest.update(part.encode("utf-8") + b"\0")
+    try:
+        body = request.body
+    except RawPostDataException:
+        # A form upload already parsed from the stream: hash the fields
+        body = repr(sorted(request.data.lists())).encode("utf-8")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def reserve(user, key, fingerprint):
+    """
+    Insert the key; returns ``(record, created)``. An expired record for the
+    same key is replaced.
+    """
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=user, key=key, request_hash=fingerprint
+                )
+            return record, True
+        except IntegrityError:
+            record = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if record is None:
+                # Deleted since our insert failed: try again
+                continue
+            if record.created_at >= get_expiry_cutoff():
+                return record, False
+            record.delete()
+    return None, False
+
+
+def replay(record, fingerprint):
+    """
+    The response for a key that has been seen before
+    """
+    if record is None or record.status_code is None:
+        return Response(
+            {"error": f"A request with this {HEADER} is still being processed"},
+            status=status.HTTP_409_CONFLICT,
+        )
+    if record.request_hash != fingerprint:
+        return Response(
+            {"error": f"This {HEADER} was already used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(record.response_body, status=record.status_code)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def idempotent(view_method):
+    """
+    Decorate an APIView ``post(self, request, *args, **kwargs)``. Requests
+    without the header, or from anonymous users, run as usual. Responses
+    are stored unless they are server errors, which may succeed on retry.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_hash(request)
+        record, created = reserve(request.user, key, fingerprint)
+        if not created:
+            return replay(record, fingerprint)
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+
+        if response.status_code >= 500:
+            record.delete()
+        else:
+            IdempotencyKey.objects.filter(pk=record.pk).update(
+                status_code=response.status_code, response_body=response.data
+            )
+        return response
+
+    return wrapper
@@ -0,0 +1,133 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.relations import ManyRelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+
+def split_param(value):
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets for a ModelSerializer, driven by the request:
+
+    * ``?fields=id,title`` outputs only those fields (default: the
+      ``default_fields`` if set, else every declared field);
+    * ``?expand=employer`` replaces a compact nested representation with the
+      full serializer listed in ``expandable_fields``.
+
+    ``optimize_queryset()`` narrows a queryset to what the selected fields
+    read, so unrequested columns are not fetched either.
+    """
+
+    default_fields = None
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        params = request.query_params if request is not None else {}
+
+        selected = split_param(params.get("fields")) or self.default_fields
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+
+        for name in split_param(params.get("expand")):
+            if name in self.fields and name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name](read_only=True)
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request, extra_fields=()):
+        """
+        ``queryset`` restricted with ``only()`` to the columns the fields
+        selected by ``request`` read, plus ``select_related`` for nested
+        objects and narrowed prefetches for nested lists. ``extra_fields``
+        are loaded too (e.g. the pagination sort key).
+        """
+        plan = QueryPlan(queryset.model)
+        plan.add_serializer(cls(context={"request": request}))
+        for name in extra_fields:
+            plan.add_column(name)
+        return plan.apply(queryset)
+
+
+class QueryPlan:
+    """
+    Columns, joins and prefetches needed to serialize a model's rows
+    """
+
+    def __init__(self, model, prefix=""):
+        self.model = model
+        self.prefix = prefix
+        self.columns = []
+        self.select_related = []
+        self.prefetches = []
+        # Fields computed in Python (methods, properties) may read any
+        # column, so they disable only() for the whole queryset
+        self.narrowable = True
+
+    def get_field(self, name):
+        if name == "pk":
+            return self.model._meta.pk
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def add_column(self, name):
+        field = self.get_field(name)
+        if field is not None and field.concrete:
+            self.columns.append(self.prefix + field.name)
+
+    def add_serializer(self, serializer):
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            model_field = self.get_field(field.source)
+            if model_field is None:
+                self.narrowable = False
+            elif isinstance(field, (ListSerializer, ManyRelatedField)):
+                self.add_prefetch(field, model_field)
+            elif isinstance(field, BaseSerializer):
+                # Forward foreign key / one-to-one: join it in
+                path = self.prefix + model_field.name
+                self.columns.append(path)
+                self.select_related.append(path)
+                nested = QueryPlan(model_field.related_model, prefix=path + "__")
+                nested.add_serializer(field)
+                self.merge(nested)
+            elif model_field.concrete:
+                self.columns.append(self.prefix + model_field.name)
+            else:
+                self.narrowable = False
+
+    def add_prefetch(self, field, model_field):
+        path = self.prefix + model_field.name
+        if not isinstance(field, ListSerializer):
+            self.prefetches.append(path)
+            return
+        nested = QueryPlan(model_field.related_model)
+        nested.add_serializer(field.child)
+        if model_field.one_to_many:
+            # The prefetch matches rows back to their parent on this column
+            nested.columns.append(model_field.field.name)
+        self.prefetches.append(
+            Prefetch(path, queryset=nested.apply(model_field.related_model.objects))
+        )
+
+    def merge(self, nested):
+        self.columns += nested.columns
+        self.select_related += nested.select_related
+        self.prefetches += nested.prefetches
+        self.narrowable = self.narrowable and nested.narrowable
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetches:
+            queryset = queryset.prefetch_related(*self.prefetches)
+        if self.narrowable:
+            queryset = queryset.only(*dict.fromkeys(self.columns))
+        return queryset
@@ -0,0 +1,211 @@
+import base64
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    ValidationError,
+)
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over a compound sort key.
+
+    Each page is a single ``WHERE <sort key> after <cursor> ORDER BY ...
+    LIMIT n + 1`` query: no COUNT(*) and no OFFSET, so an index on the sort
+    key answers it with a range scan however deep the client pages. The
+    cursor is an opaque token holding the sort key of the last row served.
+
+    Views pick the sort key with a ``keyset_ordering`` attribute (or a
+    ``get_keyset_ordering(request)`` method); its last field must be unique.
+    Only the first field may be nullable: rows with no value in it come
+    last, ordered by the remaining fields, and are read with a query of
+    their own once the others run out (a cursor in that segment holds null
+    for the first field).
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    ordering = ("-id",)
+
+    def get_ordering(self, request, queryset, view):
+        if hasattr(view, "get_keyset_ordering"):
+            return tuple(view.get_keyset_ordering(request))
+        return tuple(getattr(view, "keyset_ordering", None) or self.ordering)
+
+    def check_ordering(self):
+        if any(self.is_nullable(name) for name in self.field_names[1:]) or (
+            len(self.ordering) == 1 and self.is_nullable(self.field_names[0])
+        ):
+            raise ImproperlyConfigured(
+                f"Keyset ordering {self.ordering}: only its first field may be "
+                "nullable, and then it needs more fields after it"
+            )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.model = queryset.model
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.check_ordering()
+        self.page_size = self.get_page_size(request)
+
+        rows = []
+        position = self.decode_cursor(request)
+        for segment, ordering, after in self.get_segments(queryset, position):
+            segment = segment.order_by(*ordering)
+            if after is not None:
+                segment = segment.filter(self.get_position_filter(ordering, after))
+            rows += segment[: self.page_size + 1 - len(rows)]
+            if len(rows) > self.page_size:
+                break
+
+        self.has_next = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        self.next_position = (
+            [self.get_value(rows[-1], name) for name in self.field_names]
+            if self.has_next
+            else None
+        )
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    @property
+    def field_names(self):
+        return [name.lstrip("-") for name in self.ordering]
+
+    def get_segments(self, queryset, position):
+        """
+        ``(queryset, ordering, position)`` for each part of ``queryset`` left
+        to read after ``position``, in order: all of it, or with a nullable
+        first sort field the rows having a value, then the rows without one
+        """
+        first = self.field_names[0]
+        if not self.is_nullable(first):
+            return [(queryset, self.ordering, position)]
+        with_value = queryset.filter(**{f"{first}__isnull": False})
+        without_value = queryset.filter(**{f"{first}__isnull": True})
+        if position is not None and position[0] is None:
+            return [(without_value, self.ordering[1:], position[1:])]
+        return [
+            (with_value, self.ordering, position),
+            (without_value, self.ordering[1:], None),
+        ]
+
+    def is_nullable(self, name):
+        try:
+            return self.model._meta.get_field(name).null
+        except FieldDoesNotExist:  # annotation
+            return False
+
+    def get_position_filter(self, ordering, position):
+        """
+        Rows strictly after ``position`` in ``ordering``, expanded as
+        ``a > x OR (a = x AND (b > y OR ...))`` and led by a non-strict bound
+        on the first key so the database can use it for an index range scan.
+        """
+        condition = None
+        for name, value in reversed(list(zip(ordering, position))):
+            field = name.lstrip("-")
+            lookup = "lt" if name.startswith("-") else "gt"
+            strict = Q(**{f"{field}__{lookup}": value})
+            condition = (
+                strict
+                if condition is None
+                else strict | (Q(**{field: value}) & condition)
+            )
+
+        first = ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & condition
+
+    @staticmethod
+    def get_value(row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def encode_cursor(self, position):
+        values = [
+            (
+                value.isoformat()
+                if isinstance(value, (datetime.date, datetime.datetime))
+                else str(value) if isinstance(value, decimal.Decimal) else value
+            )
+            for value in position
+        ]
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            # null first value: a position among the rows without one
+            return [
+                (
+                    None
+                    if index == 0 and value is None and self.is_nullable(name)
+                    else self.to_python(name, value)
+                )
+                for index, (name, value) in enumerate(zip(self.field_names, values))
+            ]
+        except (TypeError, ValueError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def to_python(self, name, value):
+        if value is None:
+            raise ValueError
+        try:
+            field = self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations (e.g. computed ranks) are stored as plain JSON values
+            if not isinstance(value, (int, float, str)):
+                raise ValueError
+            return value
+        return field.to_python(value)
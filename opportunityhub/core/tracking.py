@@ -0,0 +1,87 @@
+"""
+Field-change detection without re-reading the row.
+
+``pre_save`` handlers that need the old value of a field usually fetch the
+row again, one extra SELECT per save. ``LoadedValuesMixin`` instead keeps
+the values an instance was loaded with (Django's ``from_db`` hook) and
+refreshes them after each save, so ``post_save`` handlers can compare the
+current value with the stored one in memory.
+"""
+
+
+class LoadedValuesMixin:
+    """
+    Model mixin remembering the database values of ``tracked_fields``.
+    Put it before ``models.Model`` in the bases.
+    """
+
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_loaded_values()
+        return instance
+
+    def snapshot_loaded_values(self, fields=None):
+        """
+        Record the current values of ``fields`` (default: every tracked
+        field) as the database values; deferred fields are skipped
+        """
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        deferred = self.get_deferred_fields()
+        for name in self.tracked_fields:
+            if fields is not None and name not in fields:
+                continue
+            attname = self._meta.get_field(name).attname
+            if attname not in deferred:
+                loaded[name] = getattr(self, attname)
+
+    def load_missing_values(self, names):
+        """
+        Fill in loaded values not known from ``from_db``: None for a row not
+        saved yet, else read from the database (one query; only for an
+        instance built by hand with a primary key, or with deferred fields)
+        """
+        loaded = self.__dict__.setdefault("_loaded_values", {})
+        missing = [name for name in names if name not in loaded]
+        if not missing:
+            return
+        row = None
+        if self.pk is not None:
+            row = (
+                type(self)
+                ._base_manager.using(self._state.db)
+                .filter(pk=self.pk)
+                .values(*(self._meta.get_field(name).attname for name in missing))
+                .first()
+            )
+        for name in missing:
+            attname = self._meta.get_field(name).attname
+            loaded[name] = row[attname] if row is not None else None
+
+    def get_loaded_value(self, name):
+        """
+        Value of tracked field ``name`` as last loaded or saved (during
+        ``post_save``: before this save); None for a new row
+        """
+        self.load_missing_values([name])
+        return self._loaded_values[name]
+
+    def has_changed(self, name):
+        """
+        Whether tracked field ``name`` differs from its loaded value
+        """
+        current = getattr(self, self._meta.get_field(name).attname)
+        return current != self.get_loaded_value(name)
+
+    def save(self, *args, **kwargs):
+        # Once the row is written it is too late to read the old values
+        self.load_missing_values(self.tracked_fields)
+        super().save(*args, **kwargs)
+        # post_save receivers above still saw the previous values
+        self.snapshot_loaded_values(kwargs.get("update_fields"))
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self.snapshot_loaded_values(fields)
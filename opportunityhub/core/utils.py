@@ -0,0 +1,8 @@
+def normalize_key(value):
+    """
+    Normalize free-text values (skill names, counties, categories) into a
+    lookup key: surrounding/duplicate whitespace collapsed and lower-cased.
+    """
+    if value is None:
+        return ""
+    return " ".join(str(value).split()).lower()
@@ -31,6 +31,17 @@ class EmployerProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "verified", "created_at", "updated_at"]
 
 
+class EmployerSummarySerializer(serializers.ModelSerializer):
+    """
+    Compact employer representation embedded in opportunity lists
+    """
+
+    class Meta:
+        model = EmployerProfile
+        fields = ["id", "company_name", "verified"]
+        read_only_fields = fields
+
+
 class EmployerProfileCreateSerializer(serializers.ModelSerializer):
     """
     Simplified serializer for creating/updating employer profile
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from accounts.models import User
+from .models import EmployerProfile
+
+
+@receiver(post_save, sender=User)
+def touch_profile_on_user_change(sender, instance, created, update_fields, **kwargs):
+    """
+    The profile (and every opportunity response) embeds the user account, so
+    changing it must change their ETag / Last-Modified. Logins only touch
+    last_login, which is not shown.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    EmployerProfile.objects.filter(user=instance).update(updated_at=timezone.now())
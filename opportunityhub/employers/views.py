@@ -2,13 +2,21 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from core.conditional import conditional_get
 from .models import EmployerProfile
 from .serializers import EmployerProfileSerializer, EmployerProfileCreateSerializer
 
 
+def employer_profile_timestamps(request):
+    return EmployerProfile.objects.filter(user=request.user).values_list(
+        "updated_at", flat=True
+    )[:1]
+
+
 class EmployerProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @conditional_get(employer_profile_timestamps)
     def get(self, request):
         """Get current employer's profile"""
         try:
@@ -0,0 +1,323 @@
+"""
+Reproducible benchmarks for the matching subsystem.
+
+``generate_dataset`` fills the database with seeded synthetic youth profiles,
+skills and opportunities; ``run_matching_suite`` then times index build,
+single-opportunity/profile incremental rematches and the full rematch, and
+records memory for each phase. Run it through ``manage.py benchmark``,
+which uses a throwaway database and writes the report as JSON.
+"""
+
+import itertools
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.db import transaction
+
+from accounts.models import User
+from core.utils import normalize_key
+from employers.models import EmployerProfile
+from opportunities.models import Opportunity, Skill as OpportunitySkill
+from youth_profiles.models import Skill, YouthProfile, YouthSkill
+from .index import rebuild_opportunity_bitmaps, rebuild_skill_index
+from .rematch import run_full_rematch
+from .services import MatchingService
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Number of youth profiles generated at each named scale
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# One opportunity per this many profiles unless given explicitly
+PROFILES_PER_OPPORTUNITY = 50
+
+COUNTIES = [
+    "Nairobi",
+    "Mombasa",
+    "Kisumu",
+    "Nakuru",
+    "Kiambu",
+    "Machakos",
+    "Uasin Gishu",
+    "Kakamega",
+    "Nyeri",
+    "Kilifi",
+]
+SKILL_VOCABULARY = 500
+
+# Posting text: titles pair a field with a role, descriptions draw words from
+# a Zipf-like distribution so full-text search sees realistic term frequencies
+FIELDS = [
+    "software",
+    "data",
+    "agriculture",
+    "health",
+    "finance",
+    "retail",
+    "hospitality",
+    "construction",
+    "education",
+    "logistics",
+    "media",
+    "energy",
+    "transport",
+    "security",
+    "tourism",
+]
+ROLES = [
+    "developer",
+    "engineer",
+    "analyst",
+    "designer",
+    "manager",
+    "assistant",
+    "technician",
+    "accountant",
+    "teacher",
+    "nurse",
+    "driver",
+    "farmer",
+    "chef",
+    "sales",
+    "marketing",
+    "clerk",
+    "intern",
+    "officer",
+    "consultant",
+    "writer",
+]
+TEXT_VOCABULARY = FIELDS + ROLES + [f"term{i:04d}" for i in range(2000)]
+DESCRIPTION_WORDS = 40
+
+
+def timed(func, *args, trace_memory=False, **kwargs):
+    """
+    Run ``func`` and return (result, seconds, memory stats). tracemalloc's
+    peak is only recorded when ``trace_memory`` is set, as tracing slows
+    allocation-heavy phases several times over.
+    """
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        memory = {"peak_rss_mb": peak_rss_mb()}
+        if trace_memory:
+            memory["traced_peak_mb"] = round(
+                tracemalloc.get_traced_memory()[1] / 2**20, 2
+            )
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return result, elapsed, memory
+
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    return {
+        "samples": len(samples),
+        "p50_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(samples[int(0.95 * (len(samples) - 1))] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident set size of this process (or of its largest finished child
+    process) in MB; None where the ``resource`` module is unavailable
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    return round(resource.getrusage(who).ru_maxrss / 1024, 2)  # KB on Linux
+
+
+def generate_dataset(profiles, opportunities=None, seed=42, chunk_size=5000):
+    """
+    Bulk-insert ``profiles`` synthetic youth (3-8 skills each) and
+    ``opportunities`` active postings (2-5 required skills each) drawn from
+    a shared skill vocabulary. Signals are bypassed, so the skill index and
+    bitmaps must be rebuilt afterwards. Returns a summary of what was made.
+    """
+    if opportunities is None:
+        opportunities = max(1, profiles // PROFILES_PER_OPPORTUNITY)
+    rng = random.Random(seed)
+    names = [f"bench skill {i:04d}" for i in range(SKILL_VOCABULARY)]
+    proficiencies = [choice for choice, _ in YouthSkill.PROFICIENCY_CHOICES]
+    work_types = [choice for choice, _ in YouthProfile.WORK_TYPE_CHOICES]
+
+    with transaction.atomic():
+        youth_skills = Skill.objects.bulk_create([Skill(name=n) for n in names])
+        posting_skills = OpportunitySkill.objects.bulk_create(
+            [OpportunitySkill(name=n, key=normalize_key(n)) for n in names]
+        )
+        # bulk_create rather than create: no welcome email
+        (employer_user,) = User.objects.bulk_create(
+            [User(username="bench-employer", password="!", user_type="employer")]
+        )
+        employer = EmployerProfile.objects.create(
+            user=employer_user, company_name="Benchmark Ltd"
+        )
+
+    skill_links = 0
+    for start in range(0, profiles, chunk_size):
+        count = min(chunk_size, profiles - start)
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [
+                    User(username=f"bench-youth-{start + i}", password="!")
+                    for i in range(count)
+                ]
+            )
+            created = YouthProfile.objects.bulk_create(
+                [
+                    YouthProfile(
+                        user=user,
+                        county=rng.choice(COUNTIES),
+                        preferred_work_type=rng.choice(work_types),
+                        years_of_experience=rng.randint(0, 8),
+                    )
+                    for user in users
+                ]
+            )
+            links = [
+                YouthSkill(
+                    youth_profile=profile,
+                    skill=skill,
+                    proficiency=rng.choice(proficiencies),
+                    years_of_experience=rng.randint(0, 5),
+                )
+                for profile in created
+                for skill in rng.sample(youth_skills, rng.randint(3, 8))
+            ]
+            YouthSkill.objects.bulk_create(links)
+            skill_links += len(links)
+
+    types = [choice for choice, _ in Opportunity.OPPORTUNITY_TYPE_CHOICES]
+    levels = [choice for choice, _ in Opportunity.EXPERIENCE_CHOICES]
+    categories = [choice for choice, _ in Opportunity.CATEGORY_CHOICES]
+    Through = Opportunity.required_skills.through
+    cum_weights = list(
+        itertools.accumulate(1 / rank for rank in range(1, len(TEXT_VOCABULARY) + 1))
+    )
+    for start in range(0, opportunities, chunk_size):
+        count = min(chunk_size, opportunities - start)
+        with transaction.atomic():
+            postings = [
+                Opportunity(
+                    employer=employer,
+                    title=f"{rng.choice(FIELDS)} {rng.choice(ROLES)}",
+                    description=" ".join(
+                        rng.choices(
+                            TEXT_VOCABULARY,
+                            cum_weights=cum_weights,
+                            k=DESCRIPTION_WORDS,
+                        )
+                    ),
+                    category=rng.choice(categories),
+                    opportunity_type=rng.choice(types),
+                    county=rng.choice(COUNTIES),
+                    experience_required=rng.choice(levels),
+                )
+                for _ in range(count)
+            ]
+            for posting in postings:
+                posting.set_normalized_fields()
+            created = Opportunity.objects.bulk_create(postings)
+            Through.objects.bulk_create(
+                [
+                    Through(opportunity_id=opportunity.pk, skill_id=skill.pk)
+                    for opportunity in created
+                    for skill in rng.sample(posting_skills, rng.randint(2, 5))
+                ]
+            )
+
+    return {
+        "profiles": profiles,
+        "opportunities": opportunities,
+        "skills": SKILL_VOCABULARY,
+        "youth_skills": skill_links,
+        "seed": seed,
+    }
+
+
+def run_matching_suite(
+    profiles,
+    opportunities=None,
+    samples=20,
+    workers=1,
+    seed=42,
+    chunk_size=2000,
+    trace_memory=False,
+):
+    """
+    Generate a dataset and benchmark every matching phase on it. Peak RSS is
+    the process high-water mark after each phase. Returns a JSON-serialisable
+    report.
+    """
+    dataset, seconds, memory = timed(
+        generate_dataset, profiles, opportunities, seed, trace_memory=trace_memory
+    )
+    report = {
+        "dataset": dataset,
+        "generate": {"seconds": round(seconds, 3), **memory},
+    }
+
+    def build_index():
+        return rebuild_skill_index(), rebuild_opportunity_bitmaps()
+
+    (entries, bitmaps), seconds, memory = timed(build_index, trace_memory=trace_memory)
+    report["index_build"] = {
+        "seconds": round(seconds, 3),
+        **memory,
+        "entries": entries,
+        "opportunity_bitmaps": bitmaps,
+        "entries_per_second": round(entries / max(seconds, 1e-9)),
+    }
+
+    run, seconds, memory = timed(
+        run_full_rematch,
+        workers=workers,
+        chunk_size=chunk_size,
+        trace_memory=trace_memory,
+    )
+    report["full_rematch"] = {
+        "seconds": round(seconds, 3),
+        **memory,
+        "worker_peak_rss_mb": peak_rss_mb(children=True) if workers > 1 else None,
+        "workers": workers,
+        "profiles": run.profiles_processed,
+        "profiles_per_second": round(run.profiles_processed / max(seconds, 1e-9)),
+    }
+
+    rng = random.Random(seed)
+    opportunity_ids = list(Opportunity.objects.values_list("id", flat=True))
+    profile_ids = list(YouthProfile.objects.values_list("id", flat=True))
+
+    def sample_latency(func, ids):
+        latencies = []
+        for pk in rng.sample(ids, min(samples, len(ids))):
+            started = time.perf_counter()
+            func(pk)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    for name, func, ids in [
+        ("rematch_opportunity", MatchingService.rematch_opportunity, opportunity_ids),
+        ("rematch_profile", MatchingService.rematch_profile, profile_ids),
+    ]:
+        latencies, _, memory = timed(
+            sample_latency, func, ids, trace_memory=trace_memory
+        )
+        report[name] = {**latency_summary(latencies), **memory}
+
+    return report
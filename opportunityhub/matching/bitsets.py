@@ -0,0 +1,105 @@
+"""
+Compact skill bitmaps.
+
+Each CanonicalSkill id is a bit position, so a set of skills packs into a
+little-endian array of uint64 words. Skill overlap and missing-skill counts
+then reduce to bitwise AND plus a popcount, with no M2M joins.
+
+Stored bitmaps are as wide as their largest id. Canonical ids also come from
+youth free-text skills, so matrices over many bitmaps are stacked on a dense
+renumbering of just the ids they contain (``stack_dense``).
+"""
+
+import numpy as np
+
+WORD_BITS = 64
+
+
+def pack(skill_ids):
+    """
+    Pack an iterable of dense skill ids into bitmap bytes
+    """
+    ids = np.fromiter(set(skill_ids), dtype=np.uint64)
+    if not len(ids):
+        return b""
+    words = np.zeros(int(ids.max()) // WORD_BITS + 1, dtype="<u8")
+    np.bitwise_or.at(
+        words,
+        (ids // WORD_BITS).astype(np.intp),
+        np.left_shift(np.uint64(1), ids % np.uint64(WORD_BITS)),
+    )
+    return words.tobytes()
+
+
+def unpack(bits):
+    """
+    Sorted list of the skill ids set in ``bits``
+    """
+    words = np.frombuffer(bits, dtype="<u8")
+    return np.flatnonzero(
+        np.unpackbits(words.view(np.uint8), bitorder="little")
+    ).tolist()
+
+
+def as_row(bits, width):
+    """
+    One bitmap as a (width,) uint64 array, zero-padded or truncated
+    """
+    row = np.zeros(width, dtype=np.uint64)
+    words = np.frombuffer(bits, dtype="<u8")[:width]
+    row[: len(words)] = words
+    return row
+
+
+def stack(bitmaps, width=None):
+    """
+    Stack bitmaps into an (n, width) uint64 matrix, zero-padded to the
+    widest one unless ``width`` is given
+    """
+    if width is None:
+        width = max((len(bits) // 8 for bits in bitmaps), default=0)
+    matrix = np.zeros((len(bitmaps), width), dtype=np.uint64)
+    for i, bits in enumerate(bitmaps):
+        words = np.frombuffer(bits, dtype="<u8")[:width]
+        matrix[i, : len(words)] = words
+    return matrix
+
+
+def stack_dense(bitmaps):
+    """
+    Stack bitmaps like ``stack``, but with the skill ids they contain
+    renumbered 0, 1, 2, ... so the width follows the number of distinct
+    skills rather than the largest id. Returns ``(matrix, positions)``,
+    ``positions`` mapping skill id -> bit position in the matrix.
+    """
+    rows = [unpack(bits) for bits in bitmaps]
+    positions = {
+        skill_id: position
+        for position, skill_id in enumerate(sorted(set().union(*rows)))
+    }
+    width = -(-len(positions) // WORD_BITS)
+    matrix = stack(
+        [pack(positions[skill_id] for skill_id in row) for row in rows], width
+    )
+    return matrix, positions
+
+
+def popcount(words):
+    """
+    Number of set bits along the last axis
+    """
+    return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+
+def overlap(matrix, row):
+    """
+    Skills each bitmap in ``matrix`` shares with ``row``
+    """
+    return popcount(matrix & row)
+
+
+def missing(required, have):
+    """
+    Skills set in ``required`` but absent from ``have``
+    """
+    return popcount(required & ~have)
@@ -0,0 +1,317 @@
+"""
+Inverted skill index used for match candidate generation.
+
+Maps a normalized skill name (CanonicalSkill) to the youth profiles that list
+it, so a posting only has to be scored against profiles sharing at least one
+of its required skills.
+"""
+
+from django.db import transaction
+
+from core.utils import normalize_key
+from opportunities.models import Opportunity, Skill as OpportunitySkill
+from youth_profiles.models import Skill as ProfileSkill, YouthProfile, YouthSkill
+from . import bitsets
+from .models import (
+    CanonicalSkill,
+    OpportunitySkillBitmap,
+    ProfileSkillBitmap,
+    SkillIndexEntry,
+)
+
+PROFICIENCY_RANKS = {
+    "beginner": 1,
+    "intermediate": 2,
+    "advanced": 3,
+    "expert": 4,
+}
+
+# Credit a youth gets for a required skill, by proficiency
+PROFICIENCY_WEIGHTS = {
+    "beginner": 0.4,
+    "intermediate": 0.6,
+    "advanced": 0.8,
+    "expert": 1.0,
+}
+
+PROFICIENCY_WEIGHTS_BY_RANK = {
+    rank: PROFICIENCY_WEIGHTS[level] for level, rank in PROFICIENCY_RANKS.items()
+}
+
+# Extra credit per year of hands-on experience with a skill (capped at 1.0)
+SKILL_YEAR_BONUS = 0.05
+
+
+def skill_credit(rank, years):
+    """
+    0-1 credit for a skill held at proficiency ``rank`` with ``years`` of
+    hands-on experience
+    """
+    return min(
+        1.0, PROFICIENCY_WEIGHTS_BY_RANK.get(rank, 0.0) + SKILL_YEAR_BONUS * years
+    )
+
+
+def is_stronger(posting, current):
+    """
+    Whether ``posting`` (proficiency rank, years) should replace ``current``
+    (or None) when several raw skills collapse onto one key: the one earning
+    the most credit wins, as it would in the score matrix
+    """
+    return current is None or (skill_credit(*posting), posting) > (
+        skill_credit(*current),
+        current,
+    )
+
+
+def canonical_skill_ids(names, create=True):
+    """
+    Resolve skill names to CanonicalSkill ids, keyed by normalized name.
+
+    Missing canonical skills are created in bulk unless ``create`` is False,
+    in which case unknown names are left out of the result.
+    """
+    keys = {normalize_key(name) for name in names} - {""}
+    if not keys:
+        return {}
+
+    resolved = dict(
+        CanonicalSkill.objects.filter(name__in=keys).values_list("name", "id")
+    )
+    missing = keys - resolved.keys()
+    if missing and create:
+        CanonicalSkill.objects.bulk_create(
+            [CanonicalSkill(name=key) for key in missing], ignore_conflicts=True
+        )
+        resolved.update(
+            CanonicalSkill.objects.filter(name__in=missing).values_list("name", "id")
+        )
+    return resolved
+
+
+def reindex_profile(profile_id):
+    """
+    Bring the index entries and skill bitmap of a single youth profile in
+    line with its YouthSkill rows
+    """
+    postings = {}
+    rows = YouthSkill.objects.filter(youth_profile_id=profile_id).values_list(
+        "skill__name", "proficiency", "years_of_experience"
+    )
+    for name, proficiency, years in rows:
+        key = normalize_key(name)
+        posting = (PROFICIENCY_RANKS.get(proficiency, 1), years)
+        # Several raw skills can collapse onto one key; keep the strongest
+        if is_stronger(posting, postings.get(key)):
+            postings[key] = posting
+
+    skill_ids = canonical_skill_ids(postings)
+
+    with transaction.atomic():
+        SkillIndexEntry.objects.filter(youth_profile_id=profile_id).exclude(
+            skill_id__in=skill_ids.values()
+        ).delete()
+        SkillIndexEntry.objects.bulk_create(
+            [
+                SkillIndexEntry(
+                    skill_id=skill_ids[key],
+                    youth_profile_id=profile_id,
+                    proficiency=proficiency,
+                    years_of_experience=years,
+                )
+                for key, (proficiency, years) in postings.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["skill", "youth_profile"],
+            update_fields=["proficiency", "years_of_experience"],
+        )
+        if skill_ids:
+            _write_profile_bitmaps({profile_id: list(skill_ids.values())})
+        else:
+            # No skills means no bitmap; never insert rows for a profile that
+            # may be in the middle of a cascade delete
+            ProfileSkillBitmap.objects.filter(youth_profile_id=profile_id).delete()
+
+
+def reindex_skill(skill):
+    """
+    Re-index every profile that has ``skill`` (a youth_profiles.Skill),
+    e.g. after it was renamed
+    """
+    profile_ids = (
+        YouthSkill.objects.filter(skill=skill)
+        .values_list("youth_profile_id", flat=True)
+        .distinct()
+    )
+    for profile_id in profile_ids.iterator():
+        reindex_profile(profile_id)
+
+
+def rebuild_skill_index(batch_size=5000):
+    """
+    Rebuild the whole index and every profile skill bitmap from YouthSkill
+    in a single streaming pass.
+
+    Returns the number of index entries written.
+    """
+    names = set(ProfileSkill.objects.values_list("name", flat=True))
+    names.update(OpportunitySkill.objects.values_list("name", flat=True))
+    skill_ids = canonical_skill_ids(names)
+
+    canonical_by_skill = {
+        skill_id: skill_ids[normalize_key(name)]
+        for skill_id, name in ProfileSkill.objects.values_list("id", "name")
+        if normalize_key(name)
+    }
+
+    rows = (
+        YouthSkill.objects.order_by("youth_profile_id")
+        .values_list(
+            "youth_profile_id", "skill_id", "proficiency", "years_of_experience"
+        )
+        .iterator(chunk_size=batch_size)
+    )
+
+    written = 0
+    with transaction.atomic():
+        SkillIndexEntry.objects.all().delete()
+        ProfileSkillBitmap.objects.all().delete()
+
+        postings = {}
+        current_profile_id = None
+        for profile_id, skill_id, proficiency, years in rows:
+            # Only flush on a profile boundary so each profile's postings are
+            # complete before they are written
+            if profile_id != current_profile_id and len(postings) >= batch_size:
+                written += _write_postings(postings, batch_size)
+                postings = {}
+            current_profile_id = profile_id
+
+            canonical_id = canonical_by_skill.get(skill_id)
+            if canonical_id is None:
+                continue
+            posting = (PROFICIENCY_RANKS.get(proficiency, 1), years)
+            if is_stronger(posting, postings.get((canonical_id, profile_id))):
+                postings[(canonical_id, profile_id)] = posting
+        written += _write_postings(postings, batch_size)
+
+    return written
+
+
+def _write_postings(postings, batch_size):
+    skills_by_profile = {}
+    for canonical_id, profile_id in postings:
+        skills_by_profile.setdefault(profile_id, []).append(canonical_id)
+    _write_profile_bitmaps(skills_by_profile, batch_size)
+
+    SkillIndexEntry.objects.bulk_create(
+        [
+            SkillIndexEntry(
+                skill_id=canonical_id,
+                youth_profile_id=profile_id,
+                proficiency=proficiency,
+                years_of_experience=years,
+            )
+            for (canonical_id, profile_id), (proficiency, years) in postings.items()
+        ],
+        batch_size=batch_size,
+    )
+    return len(postings)
+
+
+def _write_profile_bitmaps(skills_by_profile, batch_size=5000):
+    ProfileSkillBitmap.objects.bulk_create(
+        [
+            ProfileSkillBitmap(
+                youth_profile_id=profile_id,
+                bits=bitsets.pack(skill_ids),
+                skill_count=len(set(skill_ids)),
+            )
+            for profile_id, skill_ids in skills_by_profile.items()
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["youth_profile"],
+        update_fields=["bits", "skill_count", "updated_at"],
+    )
+
+
+def refresh_opportunity_bitmaps(opportunity_ids, batch_size=5000):
+    """
+    Recompute the required-skill bitmaps of ``opportunity_ids`` (a list or
+    an ``id`` subquery), creating canonical skills as needed
+    """
+    through = Opportunity.required_skills.through
+    rows = list(
+        through.objects.filter(opportunity_id__in=opportunity_ids).values_list(
+            "opportunity_id", "skill__name"
+        )
+    )
+    skill_ids = canonical_skill_ids({name for _, name in rows})
+
+    skills_by_opportunity = {
+        opportunity_id: []
+        for opportunity_id in Opportunity.objects.filter(
+            id__in=opportunity_ids
+        ).values_list("id", flat=True)
+    }
+    for opportunity_id, name in rows:
+        canonical_id = skill_ids.get(normalize_key(name))
+        if canonical_id is not None:
+            skills_by_opportunity[opportunity_id].append(canonical_id)
+
+    OpportunitySkillBitmap.objects.bulk_create(
+        [
+            OpportunitySkillBitmap(
+                opportunity_id=opportunity_id,
+                bits=bitsets.pack(canonical_ids),
+                skill_count=len(set(canonical_ids)),
+            )
+            for opportunity_id, canonical_ids in skills_by_opportunity.items()
+        ],
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["opportunity"],
+        update_fields=["bits", "skill_count", "updated_at"],
+    )
+    return len(skills_by_opportunity)
+
+
+def rebuild_opportunity_bitmaps(batch_size=5000):
+    """
+    Recompute the bitmap of every opportunity, one id range at a time.
+    Returns the number of bitmaps written.
+    """
+    ids = list(Opportunity.objects.order_by("id").values_list("id", flat=True))
+    written = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start : start + batch_size]
+        written += refresh_opportunity_bitmaps(
+            Opportunity.objects.filter(id__gte=chunk[0], id__lte=chunk[-1]).values(
+                "id"
+            ),
+            batch_size,
+        )
+    return written
+
+
+def candidate_profile_ids(skill_names):
+    """
+    Lazy queryset of ids of youth profiles sharing at least one of
+    ``skill_names``; usable directly as an ``id__in`` subquery.
+    """
+    keys = {normalize_key(name) for name in skill_names} - {""}
+    return (
+        SkillIndexEntry.objects.filter(skill__name__in=keys)
+        .values_list("youth_profile_id", flat=True)
+        .distinct()
+    )
+
+
+def candidate_profiles(opportunity):
+    """
+    Youth profiles worth scoring against ``opportunity``: those sharing at
+    least one of its required skills
+    """
+    names = opportunity.required_skills.values_list("name", flat=True)
+    return YouthProfile.objects.filter(id__in=candidate_profile_ids(names))
@@ -0,0 +1,127 @@
+import json
+import os
+import platform
+import subprocess
+import tempfile
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+from matching.benchmarks import SCALES, run_matching_suite
+from opportunities.benchmarks import run_search_suite, run_serialization_suite
+
+SUITES = {
+    "matching": run_matching_suite,
+    "search": run_search_suite,
+    "serialization": run_serialization_suite,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark a subsystem on synthetic data in a throwaway database and "
+        "write the results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--suite", choices=sorted(SUITES), default="matching", help="Suite to run"
+        )
+        parser.add_argument(
+            "--scale",
+            choices=list(SCALES),
+            default="10k",
+            help=(
+                "Number of synthetic youth profiles (matching) or postings "
+                "(search, serialization)"
+            ),
+        )
+        parser.add_argument(
+            "--opportunities",
+            type=int,
+            default=None,
+            help="Number of synthetic opportunities (default: scale / 50)",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=20,
+            help="Incremental rematches timed per phase",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Worker processes for the full rematch",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+        parser.add_argument(
+            "--trace-memory",
+            action="store_true",
+            help="Also record tracemalloc peaks (slows every phase down)",
+        )
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Write the JSON report here (default: stdout)",
+        )
+
+    def handle(self, *args, **options):
+        report = {
+            "suite": options["suite"],
+            "scale": options["scale"],
+            "commit": self.get_commit(),
+            "started_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            old_name = connection.settings_dict["NAME"]
+            if connection.vendor == "sqlite":
+                # A file, not :memory:, so rematch worker processes share it
+                connection.settings_dict.setdefault("TEST", {})["NAME"] = os.path.join(
+                    tmpdir, "benchmark.sqlite3"
+                )
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+            try:
+                # Time the work itself, not background rematches fired by signals
+                with override_settings(MATCH_RUN_ASYNC=False):
+                    report["results"] = SUITES[options["suite"]](
+                        SCALES[options["scale"]],
+                        opportunities=options["opportunities"],
+                        samples=options["samples"],
+                        workers=options["workers"],
+                        seed=options["seed"],
+                        trace_memory=options["trace_memory"],
+                    )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                f.write(output + "\n")
+            self.stdout.write(
+                self.style.SUCCESS(f"Benchmark results written to {options['output']}")
+            )
+        else:
+            self.stdout.write(output)
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
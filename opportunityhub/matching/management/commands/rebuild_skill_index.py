@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from matching.index import rebuild_opportunity_bitmaps, rebuild_skill_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the inverted skill index and the profile/opportunity skill bitmaps"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of index entries written per batch",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_skill_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} skill entries"))
+
+        bitmaps = rebuild_opportunity_bitmaps(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {bitmaps} opportunity bitmaps"))
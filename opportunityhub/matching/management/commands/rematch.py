@@ -0,0 +1,69 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from matching.models import RematchRun
+from matching.rematch import run_full_rematch
+
+
+class Command(BaseCommand):
+    help = "Recompute stored recommendations for every youth profile"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Scoring processes to run (default: one per CPU core)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Profiles scored per task",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Recommendation rows written per INSERT",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue the most recent unfinished run instead of starting over",
+        )
+
+    def handle(self, *args, **options):
+        run = None
+        if options["resume"]:
+            run = RematchRun.objects.filter(finished_at__isnull=True).first()
+            if run is None:
+                raise CommandError("No unfinished rematch run to resume")
+            self.stdout.write(
+                f"Resuming run {run.pk} after profile {run.last_profile_id} "
+                f"({run.profiles_processed} profiles already done)"
+            )
+
+        started = time.monotonic()
+        run = run_full_rematch(
+            run=run,
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            batch_size=options["batch_size"],
+            progress=self.report_progress,
+        )
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rematched {run.profiles_processed} profiles in {elapsed:.1f}s "
+                f"(run {run.pk})"
+            )
+        )
+
+    def report_progress(self, run, rate):
+        self.stdout.write(
+            f"  up to profile {run.last_profile_id}: "
+            f"{run.profiles_processed} done, {rate:,.0f} profiles/sec"
+        )
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CanonicalSkill",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="SkillIndexEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "proficiency",
+                    models.PositiveSmallIntegerField(
+                        default=1,
+                        help_text="Proficiency rank (1=beginner ... 4=expert)",
+                    ),
+                ),
+                ("years_of_experience", models.PositiveIntegerField(default=0)),
+                (
+                    "skill",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="index_entries",
+                        to="matching.canonicalskill",
+                    ),
+                ),
+                (
+                    "youth_profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="skill_index_entries",
+                        to="youth_profiles.youthprofile",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("skill", "youth_profile")},
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0001_initial"),
+        ("opportunities", "0002_application"),
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Recommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.PositiveSmallIntegerField(help_text="Match score (0-100)"),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "opportunity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        to="opportunities.opportunity",
+                    ),
+                ),
+                (
+                    "youth_profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        to="youth_profiles.youthprofile",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-score", "-opportunity_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["youth_profile", "-score", "-opportunity"],
+                        name="matching_rec_youth_score_idx",
+                    )
+                ],
+                "unique_together": {("youth_profile", "opportunity")},
+            },
+        ),
+    ]
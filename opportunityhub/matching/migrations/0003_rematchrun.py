@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0002_recommendation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RematchRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "last_profile_id",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Every profile up to this id has been rematched",
+                    ),
+                ),
+                ("profiles_processed", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
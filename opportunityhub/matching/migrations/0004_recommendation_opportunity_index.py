@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0003_rematchrun"),
+        ("opportunities", "0002_application"),
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="recommendation",
+            index=models.Index(
+                fields=["opportunity", "-score", "-youth_profile"],
+                name="matching_rec_opp_score_idx",
+            ),
+        ),
+    ]
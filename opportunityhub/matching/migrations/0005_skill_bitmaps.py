@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0004_recommendation_opportunity_index"),
+        ("opportunities", "0002_application"),
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OpportunitySkillBitmap",
+            fields=[
+                (
+                    "opportunity",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="skill_bitmap",
+                        serialize=False,
+                        to="opportunities.opportunity",
+                    ),
+                ),
+                ("bits", models.BinaryField(default=b"")),
+                ("skill_count", models.PositiveSmallIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ProfileSkillBitmap",
+            fields=[
+                (
+                    "youth_profile",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="skill_bitmap",
+                        serialize=False,
+                        to="youth_profiles.youthprofile",
+                    ),
+                ),
+                ("bits", models.BinaryField(default=b"")),
+                ("skill_count", models.PositiveSmallIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
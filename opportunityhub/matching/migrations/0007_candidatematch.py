@@ -0,0 +1,92 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:24
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def copy_recommendations(apps, schema_editor):
+    """
+    Seed the candidate lists with the stored recommendations; the next
+    ``manage.py rematch`` adds the candidates they were trimmed of
+    """
+    Recommendation = apps.get_model("matching", "Recommendation")
+    CandidateMatch = apps.get_model("matching", "CandidateMatch")
+    rows = Recommendation.objects.values_list(
+        "opportunity_id", "youth_profile_id", "score", "computed_at"
+    ).iterator(chunk_size=5000)
+    batch = []
+    for opportunity_id, youth_profile_id, score, computed_at in rows:
+        batch.append(
+            CandidateMatch(
+                opportunity_id=opportunity_id,
+                youth_profile_id=youth_profile_id,
+                score=score,
+                computed_at=computed_at,
+            )
+        )
+        if len(batch) == 5000:
+            CandidateMatch.objects.bulk_create(batch)
+            batch = []
+    CandidateMatch.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0005_skill_bitmaps"),
+        ("opportunities", "0002_application"),
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CandidateMatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.PositiveSmallIntegerField(help_text="Match score (0-100)"),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "opportunity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidate_matches",
+                        to="opportunities.opportunity",
+                    ),
+                ),
+                (
+                    "youth_profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="candidate_matches",
+                        to="youth_profiles.youthprofile",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-score", "-youth_profile_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["opportunity", "-score", "-youth_profile"],
+                        name="matching_cand_opp_score_idx",
+                    )
+                ],
+                "unique_together": {("opportunity", "youth_profile")},
+            },
+        ),
+        migrations.RunPython(copy_recommendations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:40
+
+from django.db import migrations
+
+from core.utils import normalize_key
+from matching import bitsets
+
+
+def backfill_opportunity_bitmaps(apps, schema_editor):
+    """
+    Opportunities posted before bitmaps were maintained on save have none,
+    which kept them out of profile rematches
+    """
+    Opportunity = apps.get_model("opportunities", "Opportunity")
+    CanonicalSkill = apps.get_model("matching", "CanonicalSkill")
+    OpportunitySkillBitmap = apps.get_model("matching", "OpportunitySkillBitmap")
+    Through = Opportunity.required_skills.through
+
+    ids = list(
+        Opportunity.objects.filter(skill_bitmap__isnull=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for start in range(0, len(ids), 2000):
+        chunk = ids[start : start + 2000]
+        rows = list(
+            Through.objects.filter(opportunity_id__in=chunk).values_list(
+                "opportunity_id", "skill__name"
+            )
+        )
+        keys = {normalize_key(name) for _, name in rows} - {""}
+        CanonicalSkill.objects.bulk_create(
+            [CanonicalSkill(name=key) for key in keys], ignore_conflicts=True
+        )
+        skill_ids = dict(
+            CanonicalSkill.objects.filter(name__in=keys).values_list("name", "id")
+        )
+
+        skills_by_opportunity = {opportunity_id: [] for opportunity_id in chunk}
+        for opportunity_id, name in rows:
+            if normalize_key(name):
+                skills_by_opportunity[opportunity_id].append(
+                    skill_ids[normalize_key(name)]
+                )
+        OpportunitySkillBitmap.objects.bulk_create(
+            [
+                OpportunitySkillBitmap(
+                    opportunity_id=opportunity_id,
+                    bits=bitsets.pack(canonical_ids),
+                    skill_count=len(set(canonical_ids)),
+                )
+                for opportunity_id, canonical_ids in skills_by_opportunity.items()
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("matching", "0007_candidatematch"),
+        ("opportunities", "0002_application"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_opportunity_bitmaps, migrations.RunPython.noop),
+    ]
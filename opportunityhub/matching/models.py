@@ -1,3 +1,176 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class CanonicalSkill(models.Model):
+    """
+    Normalized skill name shared by opportunities.Skill and
+    youth_profiles.Skill, which otherwise only have a name in common
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+
+    def __str__(self):
+        return self.name
+
+
+class SkillIndexEntry(models.Model):
+    """
+    Inverted index posting: a youth profile that has a canonical skill
+    """
+
+    skill = models.ForeignKey(
+        CanonicalSkill, on_delete=models.CASCADE, related_name="index_entries"
+    )
+    youth_profile = models.ForeignKey(
+        "youth_profiles.YouthProfile",
+        on_delete=models.CASCADE,
+        related_name="skill_index_entries",
+    )
+    proficiency = models.PositiveSmallIntegerField(
+        default=1, help_text="Proficiency rank (1=beginner ... 4=expert)"
+    )
+    years_of_experience = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["skill", "youth_profile"]
+
+    def __str__(self):
+        return f"{self.skill.name} -> profile {self.youth_profile_id}"
+
+
+class Recommendation(models.Model):
+    """
+    Precomputed top-K opportunity matches for a youth profile
+    """
+
+    youth_profile = models.ForeignKey(
+        "youth_profiles.YouthProfile",
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+    )
+    opportunity = models.ForeignKey(
+        "opportunities.Opportunity",
+        on_delete=models.CASCADE,
+        related_name="recommendations",
+    )
+    score = models.PositiveSmallIntegerField(help_text="Match score (0-100)")
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-score", "-opportunity_id"]
+        unique_together = ["youth_profile", "opportunity"]
+        indexes = [
+            models.Index(
+                fields=["youth_profile", "-score", "-opportunity"],
+                name="matching_rec_youth_score_idx",
+            ),
+            models.Index(
+                fields=["opportunity", "-score", "-youth_profile"],
+                name="matching_rec_opp_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Profile {self.youth_profile_id} -> {self.opportunity_id} ({self.score}%)"
+        )
+
+
+class CandidateMatch(models.Model):
+    """
+    Precomputed best candidates for an opportunity. Kept apart from
+    Recommendation, whose rows are trimmed to each youth's own top-K.
+    """
+
+    opportunity = models.ForeignKey(
+        "opportunities.Opportunity",
+        on_delete=models.CASCADE,
+        related_name="candidate_matches",
+    )
+    youth_profile = models.ForeignKey(
+        "youth_profiles.YouthProfile",
+        on_delete=models.CASCADE,
+        related_name="candidate_matches",
+    )
+    score = models.PositiveSmallIntegerField(help_text="Match score (0-100)")
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-score", "-youth_profile_id"]
+        unique_together = ["opportunity", "youth_profile"]
+        indexes = [
+            models.Index(
+                fields=["opportunity", "-score", "-youth_profile"],
+                name="matching_cand_opp_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Opportunity {self.opportunity_id} -> {self.youth_profile_id} "
+            f"({self.score}%)"
+        )
+
+
+class RematchRun(models.Model):
+    """
+    Progress checkpoint for the ``rematch`` management command, so an
+    interrupted full rematch can resume where it stopped
+    """
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_profile_id = models.BigIntegerField(
+        default=0, help_text="Every profile up to this id has been rematched"
+    )
+    profiles_processed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        state = "finished" if self.finished_at else "in progress"
+        return f"Rematch run {self.pk} ({state}, {self.profiles_processed} profiles)"
+
+
+class ProfileSkillBitmap(models.Model):
+    """
+    A youth profile's canonical skills packed into a bitmap (see bitsets)
+    """
+
+    youth_profile = models.OneToOneField(
+        "youth_profiles.YouthProfile",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="skill_bitmap",
+    )
+    bits = models.BinaryField(default=b"")
+    skill_count = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Profile {self.youth_profile_id}: {self.skill_count} skills"
+
+
+class OpportunitySkillBitmap(models.Model):
+    """
+    An opportunity's required canonical skills packed into a bitmap
+    """
+
+    opportunity = models.OneToOneField(
+        "opportunities.Opportunity",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="skill_bitmap",
+    )
+    bits = models.BinaryField(default=b"")
+    skill_count = models.PositiveSmallIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Opportunity {self.opportunity_id}: {self.skill_count} skills"
@@ -0,0 +1,185 @@
+"""
+Full rematch of every youth profile, spread over a process pool.
+
+Profiles are split into contiguous id ranges. Worker processes score the
+ranges against a catalogue snapshot loaded once in the parent, and the
+parent writes the top-K results back in order, checkpointing after each
+range so an interrupted run can resume. The candidate lists employers see
+are ranked per opportunity, so they are recomputed afterwards, a batch of
+opportunities at a time.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import django
+from django.apps import apps
+from django.db import connections, transaction
+from django.utils import timezone
+
+from opportunities.models import Opportunity
+from youth_profiles.models import YouthProfile
+from .models import RematchRun, Recommendation
+from .scoring import load_opportunity_features, load_youth_features, score_matrix
+from .scoring import top_k as select_top_k
+from .services import MatchingService
+
+# Catalogue snapshot held by each worker process
+_catalogue = None
+
+# Opportunities whose candidate lists are recomputed together
+CANDIDATE_BATCH_SIZE = 500
+
+
+def _init_worker(catalogue):
+    global _catalogue
+    if not apps.ready:  # "spawn" start method: workers start from scratch
+        django.setup()
+    _catalogue = catalogue
+
+
+def _score_range(first_id, last_id, top_k, min_score):
+    """
+    Score the profiles with ids in [first_id, last_id] and return the top-K
+    matches of each as flat (profile ids, opportunity ids, scores) arrays
+    """
+    youth = load_youth_features(
+        _catalogue, YouthProfile.objects.filter(id__gte=first_id, id__lte=last_id)
+    )
+    rows, columns, values = select_top_k(
+        score_matrix(youth, _catalogue), top_k, min_score
+    )
+    return (
+        first_id,
+        last_id,
+        len(youth),
+        youth.ids[rows],
+        _catalogue.ids[columns],
+        values,
+    )
+
+
+def iter_id_ranges(after_id=0, chunk_size=2000):
+    """
+    Yield (first_id, last_id) ranges of ``chunk_size`` profiles each, in id
+    order, starting after ``after_id``
+    """
+    ids = (
+        YouthProfile.objects.filter(id__gt=after_id)
+        .order_by("id")
+        .values_list("id", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = []
+    for profile_id in ids:
+        chunk.append(profile_id)
+        if len(chunk) == chunk_size:
+            yield chunk[0], chunk[-1]
+            chunk = []
+    if chunk:
+        yield chunk[0], chunk[-1]
+
+
+def write_range(run, result, batch_size=5000):
+    """
+    Replace the stored recommendations of one scored id range and advance
+    the run's checkpoint in the same transaction
+    """
+    first_id, last_id, profile_count, youth_ids, opportunity_ids, scores = result
+    computed_at = timezone.now()
+    recommendations = [
+        Recommendation(
+            youth_profile_id=youth_id,
+            opportunity_id=opportunity_id,
+            score=score,
+            computed_at=computed_at,
+        )
+        for youth_id, opportunity_id, score in zip(
+            youth_ids.tolist(), opportunity_ids.tolist(), scores.tolist()
+        )
+    ]
+
+    with transaction.atomic():
+        Recommendation.objects.bulk_create(
+            recommendations,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=["youth_profile", "opportunity"],
+            update_fields=["score", "computed_at"],
+        )
+        Recommendation.objects.filter(
+            youth_profile_id__gte=first_id,
+            youth_profile_id__lte=last_id,
+            computed_at__lt=computed_at,
+        ).delete()
+
+        run.last_profile_id = last_id
+        run.profiles_processed += profile_count
+        run.save(update_fields=["last_profile_id", "profiles_processed"])
+
+
+def run_full_rematch(
+    run=None, workers=1, chunk_size=2000, batch_size=5000, progress=None
+):
+    """
+    Rematch every profile after ``run.last_profile_id`` (a fresh run by
+    default). ``progress(run, rate)`` is called after each written range with
+    the overall profiles/sec. Returns the finished run.
+    """
+    if run is None:
+        run = RematchRun.objects.create()
+
+    catalogue = load_opportunity_features()
+    top_k, min_score = MatchingService.get_top_k(), MatchingService.get_min_score()
+    ranges = iter_id_ranges(run.last_profile_id, chunk_size)
+
+    started = time.monotonic()
+    processed = 0
+
+    def record(result):
+        nonlocal processed
+        write_range(run, result, batch_size)
+        processed += result[2]
+        if progress is not None:
+            progress(run, processed / max(time.monotonic() - started, 1e-9))
+
+    if workers <= 1:
+        _init_worker(catalogue)
+        for first_id, last_id in ranges:
+            record(_score_range(first_id, last_id, top_k, min_score))
+    else:
+        # Range ids are read up front: forked workers must not inherit an
+        # open cursor or connection
+        ranges = list(ranges)
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(catalogue,)
+        ) as executor:
+            # Keep a bounded window of ranges in flight and write them back
+            # in submission order, so the checkpoint is always contiguous
+            in_flight = deque()
+            for first_id, last_id in ranges:
+                in_flight.append(
+                    executor.submit(_score_range, first_id, last_id, top_k, min_score)
+                )
+                if len(in_flight) >= workers * 2:
+                    record(in_flight.popleft().result())
+            while in_flight:
+                record(in_flight.popleft().result())
+
+    opportunity_ids = list(
+        Opportunity.objects.filter(is_active=True)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    for start in range(0, len(opportunity_ids), CANDIDATE_BATCH_SIZE):
+        MatchingService.rematch_candidates(
+            opportunity_ids[start : start + CANDIDATE_BATCH_SIZE],
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+        )
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=["finished_at"])
+    return run
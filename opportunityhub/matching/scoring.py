@@ -0,0 +1,535 @@
+"""
+Vectorized match scoring between youth profiles and opportunities.
+
+Profiles and opportunities are loaded into NumPy feature matrices so that a
+whole batch is scored with a handful of array operations instead of a Python
+loop per (youth, opportunity) pair.
+"""
+
+import numpy as np
+
+from django.db.models import Q
+
+from core.counties import (
+    COUNTIES,
+    COUNTY_KEYS,
+    DISTANCES,
+    counties_within,
+    county_index,
+)
+from core.utils import normalize_key
+from opportunities.models import Opportunity
+from youth_profiles.models import YouthProfile, YouthSkill
+from . import bitsets
+from .index import PROFICIENCY_RANKS, skill_credit
+from .models import OpportunitySkillBitmap
+
+# Minimum years of experience implied by Opportunity.EXPERIENCE_CHOICES
+EXPERIENCE_YEARS = {
+    "Entry Level": 0,
+    "1-2 years": 1,
+    "3-5 years": 3,
+    "5+ years": 5,
+}
+
+# YouthProfile.preferred_work_type -> Opportunity.opportunity_type
+WORK_TYPE_TO_OPPORTUNITY_TYPE = {
+    "full_time": "Full-time",
+    "part_time": "Part-time",
+    "freelance": "Freelance",
+    "internship": "Internship",
+}
+
+OPPORTUNITY_TYPE_CODES = {
+    value: code
+    for code, (value, label) in enumerate(Opportunity.OPPORTUNITY_TYPE_CHOICES)
+}
+
+# Relative weight of each component in the final score (sums to 1)
+SCORE_WEIGHTS = {
+    "skills": 0.6,
+    "location": 0.15,
+    "work_type": 0.1,
+    "experience": 0.15,
+}
+
+# Skill component for opportunities that list no required skills
+NEUTRAL_SKILL_SCORE = 0.5
+
+# Location component by number of county borders between youth and
+# opportunity: same county, neighbouring, two apart; nothing further out
+LOCATION_CREDIT = (1.0, 0.5, 0.25)
+
+# (47, 47) location credit between the counties in core.counties
+COUNTY_PROXIMITY = np.array(
+    [
+        [LOCATION_CREDIT[d] if d < len(LOCATION_CREDIT) else 0.0 for d in row]
+        for row in DISTANCES
+    ],
+    dtype=np.float32,
+)
+
+
+def county_code(county, extra_codes, add=True):
+    """
+    Code of ``county`` for the location component: its core.counties index,
+    or for names outside the table a code from ``extra_codes`` (allocated
+    past the real counties when ``add``, else -1 if unseen), which only
+    matches the same name
+    """
+    index = county_index(county)
+    if index is not None:
+        return index
+    key = normalize_key(county)
+    if add:
+        return extra_codes.setdefault(key, len(COUNTIES) + len(extra_codes))
+    return extra_codes.get(key, -1)
+
+
+def nearby_county_filter(county, field="county"):
+    """
+    Q matching ``field`` against every county close enough to ``county`` to
+    earn location credit (just ``county`` itself if it is not in the table)
+    """
+    nearby = counties_within(county, len(LOCATION_CREDIT) - 1)
+    if not nearby:
+        return Q(**{f"{field}__iexact": county})
+    condition = Q()
+    for index, _ in nearby:
+        for key in COUNTY_KEYS[index]:
+            condition |= Q(**{f"{field}__iexact": key})
+    return condition
+
+
+def location_credit(youth_counties, opportunity_counties):
+    """
+    Broadcast arrays of county codes to 0-1 location credit: graded by
+    distance between real counties, exact match otherwise
+    """
+    youth_counties, opportunity_counties = np.broadcast_arrays(
+        youth_counties, opportunity_counties
+    )
+    known = (
+        (youth_counties >= 0)
+        & (youth_counties < len(COUNTIES))
+        & (opportunity_counties >= 0)
+        & (opportunity_counties < len(COUNTIES))
+    )
+    nearby = COUNTY_PROXIMITY[
+        np.where(known, youth_counties, 0), np.where(known, opportunity_counties, 0)
+    ]
+    same = (youth_counties == opportunity_counties) & (youth_counties >= 0)
+    return np.where(known, nearby, same.astype(np.float32))
+
+
+class OpportunityFeatures:
+    """
+    Feature matrices for a batch of opportunities.
+
+    ``skills`` is an (n_opportunities, n_skills) 0/1 matrix whose columns are
+    given by ``vocabulary`` (normalized skill name -> column). ``counties``
+    holds county codes (see ``county_code``); ``county_codes`` the codes
+    given to names outside core.counties.
+    """
+
+    def __init__(
+        self, ids, skills, counties, types, min_years, vocabulary, county_codes
+    ):
+        self.ids = ids
+        self.skills = skills
+        self.counties = counties
+        self.types = types
+        self.min_years = min_years
+        self.vocabulary = vocabulary
+        self.county_codes = county_codes
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class YouthFeatures:
+    """
+    Feature matrices for a batch of youth profiles, projected onto the skill
+    vocabulary of the opportunities they will be scored against.
+    """
+
+    def __init__(self, ids, skills, counties, work_types, years):
+        self.ids = ids
+        self.skills = skills
+        self.counties = counties
+        self.work_types = work_types
+        self.years = years
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_opportunity_features(queryset=None):
+    """
+    Build OpportunityFeatures for ``queryset`` (all active opportunities by
+    default) using two flat queries and no model instantiation.
+    """
+    if queryset is None:
+        queryset = Opportunity.objects.filter(is_active=True)
+
+    rows = list(
+        queryset.order_by("id").values_list(
+            "id", "county", "opportunity_type", "experience_required"
+        )
+    )
+    skill_rows = Opportunity.required_skills.through.objects.filter(
+        opportunity_id__in=queryset.values("id")
+    ).values_list("opportunity_id", "skill__name")
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    row_index = {opportunity_id: i for i, opportunity_id in enumerate(ids.tolist())}
+
+    county_codes = {}
+    counties = np.fromiter(
+        (county_code(row[1], county_codes) for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    types = np.fromiter(
+        (OPPORTUNITY_TYPE_CODES.get(row[2], -1) for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    min_years = np.fromiter(
+        (EXPERIENCE_YEARS.get(row[3], 0) for row in rows),
+        dtype=np.float32,
+        count=len(rows),
+    )
+
+    vocabulary = {}
+    row_positions = []
+    column_positions = []
+    for opportunity_id, skill_name in skill_rows:
+        row_positions.append(row_index[opportunity_id])
+        column_positions.append(
+            vocabulary.setdefault(normalize_key(skill_name), len(vocabulary))
+        )
+
+    skills = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+    skills[row_positions, column_positions] = 1.0
+
+    return OpportunityFeatures(
+        ids, skills, counties, types, min_years, vocabulary, county_codes
+    )
+
+
+def load_youth_features(opportunities, queryset=None):
+    """
+    Build YouthFeatures for ``queryset`` (all youth profiles by default),
+    keeping only the skills that appear in ``opportunities.vocabulary``.
+    """
+    if queryset is None:
+        queryset = YouthProfile.objects.all()
+
+    rows = list(
+        queryset.order_by("id").values_list(
+            "id", "county", "preferred_work_type", "years_of_experience"
+        )
+    )
+    skill_rows = YouthSkill.objects.filter(
+        youth_profile_id__in=queryset.values("id")
+    ).values_list(
+        "youth_profile_id", "skill__name", "proficiency", "years_of_experience"
+    )
+
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    row_index = {profile_id: i for i, profile_id in enumerate(ids.tolist())}
+
+    counties = np.fromiter(
+        (county_code(row[1], opportunities.county_codes, add=False) for row in rows),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    work_types = np.fromiter(
+        (
+            OPPORTUNITY_TYPE_CODES.get(WORK_TYPE_TO_OPPORTUNITY_TYPE.get(row[2]), -1)
+            for row in rows
+        ),
+        dtype=np.int32,
+        count=len(rows),
+    )
+    years = np.fromiter(
+        (row[3] or 0 for row in rows), dtype=np.float32, count=len(rows)
+    )
+
+    vocabulary = opportunities.vocabulary
+    skills = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+    for profile_id, skill_name, proficiency, skill_years in skill_rows:
+        i = row_index[profile_id]
+        # Hands-on years with any single skill count as overall experience
+        years[i] = max(years[i], skill_years or 0)
+        column = vocabulary.get(normalize_key(skill_name))
+        if column is not None:
+            # Spellings collapsing onto one column: the strongest counts, as
+            # in index.reindex_profile
+            skills[i, column] = max(
+                skills[i, column],
+                skill_credit(PROFICIENCY_RANKS.get(proficiency, 1), skill_years or 0),
+            )
+
+    return YouthFeatures(ids, skills, counties, work_types, years)
+
+
+def combine_scores(required, coverage, location, work_type, years, needed):
+    """
+    Blend the per-component arrays (broadcast to a common shape) into 0-100
+    uint8 match scores. ``coverage`` is the proficiency-weighted count of
+    required skills the youth has; ``required`` the number of required skills.
+    A youth with none of a posting's required skills scores 0 for it.
+    """
+    skills = np.where(
+        required > 0,
+        coverage / np.maximum(required, 1.0),
+        np.float32(NEUTRAL_SKILL_SCORE),
+    )
+    experience = np.where(
+        needed > 0,
+        np.minimum(years / np.maximum(needed, 1.0), 1.0),
+        np.float32(1.0),
+    )
+    total = (
+        SCORE_WEIGHTS["skills"] * skills
+        + SCORE_WEIGHTS["location"] * location
+        + SCORE_WEIGHTS["work_type"] * work_type
+        + SCORE_WEIGHTS["experience"] * experience
+    )
+    # Location, type and experience alone reach 40, which would otherwise
+    # fill top-K lists with postings the youth has no skill for
+    total = np.where((required > 0) & (coverage <= 0), np.float32(0.0), total)
+    return np.rint(total * 100).astype(np.uint8)
+
+
+def score_matrix(youth, opportunities):
+    """
+    Score every youth against every opportunity in one batched operation.
+
+    Returns an (n_youth, n_opportunities) uint8 array of 0-100 match scores,
+    0 for pairs that are not candidates (see candidate_matrix).
+    """
+    scores = combine_scores(
+        required=opportunities.skills.sum(axis=1)[None, :],
+        coverage=youth.skills @ opportunities.skills.T,
+        location=location_credit(
+            youth.counties[:, None], opportunities.counties[None, :]
+        ),
+        work_type=youth.work_types[:, None] == opportunities.types[None, :],
+        years=youth.years[:, None],
+        needed=opportunities.min_years[None, :],
+    )
+    return np.where(candidate_matrix(youth, opportunities), scores, np.uint8(0))
+
+
+def candidate_matrix(youth, opportunities):
+    """
+    (n_youth, n_opportunities) bool array of the pairs worth storing, as
+    in candidate_mask: a shared required skill, or a nearby county for
+    postings that list no skills
+    """
+    shares_skill = (youth.skills > 0).astype(np.float32) @ opportunities.skills.T
+    nearby = location_credit(youth.counties[:, None], opportunities.counties[None, :])
+    return np.where(
+        opportunities.skills.sum(axis=1)[None, :] > 0, shares_skill > 0, nearby > 0
+    )
+
+
+class BitmapCatalogue:
+    """
+    Opportunities with their required skills stacked into an
+    (n_opportunities, n_words) uint64 bitmap matrix (see bitsets), plus the
+    scalar features needed for scoring. Bits are numbered over the skills
+    the catalogue requires (``skill_positions``), so each row takes one bit
+    per distinct required skill, not one per CanonicalSkill.
+    """
+
+    def __init__(
+        self,
+        ids,
+        bitmaps,
+        skill_positions,
+        required,
+        counties,
+        types,
+        min_years,
+        county_codes,
+    ):
+        self.ids = ids
+        self.bitmaps = bitmaps
+        self.skill_positions = skill_positions
+        self.required = required
+        self.counties = counties
+        self.types = types
+        self.min_years = min_years
+        self.county_codes = county_codes
+
+    def __len__(self):
+        return len(self.ids)
+
+    def skill_row(self, skill_ids):
+        """
+        Canonical ``skill_ids`` as a row of ``bitmaps``; skills no
+        opportunity requires are dropped
+        """
+        return bitsets.as_row(
+            bitsets.pack(
+                self.skill_positions[skill_id]
+                for skill_id in skill_ids
+                if skill_id in self.skill_positions
+            ),
+            self.bitmaps.shape[1],
+        )
+
+
+def load_bitmap_catalogue(queryset=None):
+    """
+    Load the skill bitmaps of ``queryset`` (all active opportunities by
+    default) in one query, without touching the skills M2M table
+    """
+    bitmaps = OpportunitySkillBitmap.objects.all()
+    if queryset is None:
+        bitmaps = bitmaps.filter(opportunity__is_active=True)
+    else:
+        bitmaps = bitmaps.filter(opportunity__in=queryset)
+
+    rows = list(
+        bitmaps.order_by("opportunity_id").values_list(
+            "opportunity_id",
+            "bits",
+            "skill_count",
+            "opportunity__county",
+            "opportunity__opportunity_type",
+            "opportunity__experience_required",
+        )
+    )
+
+    county_codes = {}
+    matrix, positions = bitsets.stack_dense([bytes(row[1]) for row in rows])
+    return BitmapCatalogue(
+        ids=np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+        bitmaps=matrix,
+        skill_positions=positions,
+        required=np.fromiter(
+            (row[2] for row in rows), dtype=np.float32, count=len(rows)
+        ),
+        counties=np.fromiter(
+            (county_code(row[3], county_codes) for row in rows),
+            dtype=np.int32,
+            count=len(rows),
+        ),
+        types=np.fromiter(
+            (OPPORTUNITY_TYPE_CODES.get(row[4], -1) for row in rows),
+            dtype=np.int32,
+            count=len(rows),
+        ),
+        min_years=np.fromiter(
+            (EXPERIENCE_YEARS.get(row[5], 0) for row in rows),
+            dtype=np.float32,
+            count=len(rows),
+        ),
+        county_codes=county_codes,
+    )
+
+
+def score_profile(profile, skills, catalogue):
+    """
+    Score one youth profile against a whole BitmapCatalogue.
+
+    ``profile`` is a (county, preferred_work_type, years_of_experience)
+    tuple and ``skills`` maps canonical skill id -> (proficiency rank,
+    years). Returns an (n_opportunities,) uint8 array of 0-100 scores, 0
+    where the profile is not a candidate (see candidate_mask).
+    """
+    county, work_type, years = profile
+    years = years or 0
+
+    # Skills earning the same credit share one row, so weighted coverage
+    # takes one popcount per distinct credit rather than one pass per skill
+    by_weight = {}
+    for skill_id, (rank, skill_years) in skills.items():
+        years = max(years, skill_years)
+        by_weight.setdefault(skill_credit(rank, skill_years), []).append(skill_id)
+    coverage = np.zeros(len(catalogue), dtype=np.float32)
+    for weight, skill_ids in by_weight.items():
+        coverage += np.float32(weight) * bitsets.overlap(
+            catalogue.bitmaps, catalogue.skill_row(skill_ids)
+        ).astype(np.float32)
+
+    youth_county = county_code(county, catalogue.county_codes, add=False)
+    type_code = OPPORTUNITY_TYPE_CODES.get(
+        WORK_TYPE_TO_OPPORTUNITY_TYPE.get(work_type), -1
+    )
+    scores = combine_scores(
+        required=catalogue.required,
+        coverage=coverage,
+        location=location_credit(np.int32(youth_county), catalogue.counties),
+        work_type=catalogue.types == type_code,
+        years=np.float32(years),
+        needed=catalogue.min_years,
+    )
+    return np.where(candidate_mask(county, skills, catalogue), scores, np.uint8(0))
+
+
+def candidate_mask(county, skill_ids, catalogue):
+    """
+    Which opportunities of a BitmapCatalogue a profile is a candidate for,
+    as in index.candidate_profiles: those sharing one of ``skill_ids``
+    (canonical), or close to ``county`` when they require no skills
+    """
+    shared = bitsets.overlap(catalogue.bitmaps, catalogue.skill_row(skill_ids)) > 0
+    youth_county = county_code(county, catalogue.county_codes, add=False)
+    nearby = location_credit(np.int32(youth_county), catalogue.counties) > 0
+    return np.where(catalogue.required > 0, shared, nearby)
+
+
+def top_k(scores, k, min_score=0):
+    """
+    Pick the ``k`` best columns of each row of ``scores``.
+
+    Returns flat ``(rows, columns, values)`` arrays sorted by row and then by
+    descending score, dropping entries below ``min_score``.
+    """
+    n_rows, n_columns = scores.shape
+    k = min(k, n_columns)
+    if k == 0 or n_rows == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0, dtype=scores.dtype)
+
+    # Negate as a wider signed type so uint8 scores don't wrap around
+    negated = -scores.astype(np.int16)
+    if k < n_columns:
+        columns = np.argpartition(negated, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(n_columns), (n_rows, n_columns))
+    values = np.take_along_axis(scores, columns, axis=1)
+
+    order = np.argsort(-values.astype(np.int16), axis=1, kind="stable")
+    columns = np.take_along_axis(columns, order, axis=1)
+    values = np.take_along_axis(values, order, axis=1)
+
+    rows = np.repeat(np.arange(n_rows), k)
+    columns = columns.ravel()
+    values = values.ravel()
+    keep = values >= min_score
+    return rows[keep], columns[keep], values[keep]
+
+
+def iter_scores(opportunities, youth_queryset=None, chunk_size=5000):
+    """
+    Yield ``(youth_features, scores)`` for consecutive chunks of youth
+    profiles so the whole user base can be scored with bounded memory.
+    """
+    if youth_queryset is None:
+        youth_queryset = YouthProfile.objects.all()
+
+    profile_ids = list(youth_queryset.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(profile_ids), chunk_size):
+        chunk = profile_ids[start : start + chunk_size]
+        youth = load_youth_features(
+            opportunities,
+            youth_queryset.filter(id__gte=chunk[0], id__lte=chunk[-1]),
+        )
+        yield youth, score_matrix(youth, opportunities)
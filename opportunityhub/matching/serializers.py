@@ -0,0 +1,92 @@
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+from opportunities.models import Opportunity
+from youth_profiles.models import YouthProfile
+from . import bitsets
+from .models import CandidateMatch, Recommendation
+
+
+class RecommendedOpportunitySerializer(serializers.ModelSerializer):
+    """
+    Compact opportunity summary shown in recommendation lists
+    """
+
+    company_name = serializers.CharField(source="employer.company_name", read_only=True)
+
+    class Meta:
+        model = Opportunity
+        fields = [
+            "id",
+            "title",
+            "company_name",
+            "category",
+            "opportunity_type",
+            "county",
+            "city",
+            "experience_required",
+            "salary_min",
+            "salary_max",
+            "application_deadline",
+        ]
+
+
+class RecommendationSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a stored youth -> opportunity match
+    """
+
+    opportunity = RecommendedOpportunitySerializer(read_only=True)
+
+    class Meta:
+        model = Recommendation
+        fields = ["id", "score", "opportunity", "computed_at"]
+
+
+class CandidateProfileSerializer(serializers.ModelSerializer):
+    """
+    Youth profile summary shown to employers in candidate lists
+    """
+
+    first_name = serializers.CharField(source="user.first_name", read_only=True)
+    last_name = serializers.CharField(source="user.last_name", read_only=True)
+
+    class Meta:
+        model = YouthProfile
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "county",
+            "city",
+            "preferred_work_type",
+            "education_level",
+            "years_of_experience",
+        ]
+
+
+class CandidateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a stored opportunity -> youth match. Expects the
+    opportunity's skill bitmap as ``required_bits`` in the context.
+    """
+
+    youth_profile = CandidateProfileSerializer(read_only=True)
+    missing_skills = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CandidateMatch
+        fields = ["score", "missing_skills", "youth_profile", "computed_at"]
+
+    def get_missing_skills(self, obj):
+        """Required skills the candidate lacks: AND-NOT plus popcount"""
+        required = self.context.get("required_bits") or b""
+        try:
+            have = obj.youth_profile.skill_bitmap.bits
+        except ObjectDoesNotExist:
+            have = b""
+        width = len(required) // 8
+        return int(
+            bitsets.missing(
+                bitsets.as_row(required, width), bitsets.as_row(bytes(have), width)
+            )
+        )
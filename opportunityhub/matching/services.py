@@ -0,0 +1,434 @@
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from opportunities.models import Opportunity
+from youth_profiles.models import YouthProfile
+from .index import (
+    candidate_profile_ids,
+    candidate_profiles,
+    refresh_opportunity_bitmaps,
+)
+from .models import CandidateMatch, Recommendation, SkillIndexEntry
+from .scoring import (
+    iter_scores,
+    nearby_county_filter,
+    load_bitmap_catalogue,
+    load_opportunity_features,
+    load_youth_features,
+    score_matrix,
+    score_profile,
+    top_k,
+)
+
+
+class MatchingService:
+    """
+    Scores youth profiles against opportunities and keeps the materialized
+    Recommendation table up to date. Nothing here runs at request time.
+    """
+
+    @staticmethod
+    def get_top_k():
+        return getattr(settings, "MATCH_TOP_K", 50)
+
+    @staticmethod
+    def get_min_score():
+        # Pairs that are not candidates score 0 and are never stored
+        return max(getattr(settings, "MATCH_MIN_SCORE", 40), 1)
+
+    @staticmethod
+    def get_candidate_limit():
+        return getattr(settings, "MATCH_CANDIDATE_LIMIT", 500)
+
+    @staticmethod
+    def rematch_profiles(queryset=None, opportunities=None, chunk_size=5000):
+        """
+        Recompute stored recommendations for ``queryset`` (all youth profiles
+        by default) against ``opportunities`` (the active catalogue by
+        default). Returns the number of profiles processed.
+        """
+        if opportunities is None:
+            opportunities = load_opportunity_features()
+
+        processed = 0
+        for youth, scores in iter_scores(opportunities, queryset, chunk_size):
+            MatchingService.store_recommendations(youth.ids, opportunities.ids, scores)
+            processed += len(youth)
+        return processed
+
+    @staticmethod
+    def rematch_profile(profile_id):
+        """
+        Re-score one youth profile against the active catalogue and replace
+        its stored recommendations atomically. Returns the number stored.
+        """
+        profile = (
+            YouthProfile.objects.filter(pk=profile_id)
+            .annotate(skill_years=Max("youthskill__years_of_experience"))
+            .values_list(
+                "county", "preferred_work_type", "years_of_experience", "skill_years"
+            )
+            .first()
+        )
+        if profile is None:
+            return 0
+        # Years with every raw skill count as overall experience, including
+        # spellings the index dropped for a stronger one
+        county, work_type, years, skill_years = profile
+        profile = (county, work_type, max(years or 0, skill_years or 0))
+
+        skills = {
+            skill_id: (proficiency, years)
+            for skill_id, proficiency, years in SkillIndexEntry.objects.filter(
+                youth_profile_id=profile_id
+            ).values_list("skill_id", "proficiency", "years_of_experience")
+        }
+        catalogue = load_bitmap_catalogue()
+        scores = score_profile(profile, skills, catalogue)
+
+        # The profile's place in the candidate lists of the postings it is
+        # a candidate for (the others score 0)
+        keep = scores >= MatchingService.get_min_score()
+        computed_at = timezone.now()
+        candidates = [
+            CandidateMatch(
+                opportunity_id=opportunity_id,
+                youth_profile_id=profile_id,
+                score=score,
+                computed_at=computed_at,
+            )
+            for opportunity_id, score in zip(
+                catalogue.ids[keep].tolist(), scores[keep].tolist()
+            )
+        ]
+
+        with transaction.atomic():
+            stored = MatchingService.store_recommendations(
+                np.array([profile_id]), catalogue.ids, scores[None, :]
+            )
+            MatchingService.store_candidates(
+                candidates,
+                computed_at,
+                replaces=CandidateMatch.objects.filter(youth_profile_id=profile_id),
+            )
+        return stored
+
+    @staticmethod
+    def build_recommendations(youth_ids, opportunity_ids, scores, computed_at=None):
+        """
+        Turn a score matrix (rows ``youth_ids``, columns ``opportunity_ids``)
+        into unsaved Recommendation rows, keeping the top-K opportunities per
+        youth above the minimum score
+        """
+        computed_at = computed_at or timezone.now()
+        rows, columns, values = top_k(
+            scores, MatchingService.get_top_k(), MatchingService.get_min_score()
+        )
+        youth_ids = youth_ids[rows].tolist()
+        opportunity_ids = opportunity_ids[columns].tolist()
+        return [
+            Recommendation(
+                youth_profile_id=youth_id,
+                opportunity_id=opportunity_id,
+                score=score,
+                computed_at=computed_at,
+            )
+            for youth_id, opportunity_id, score in zip(
+                youth_ids, opportunity_ids, values.tolist()
+            )
+        ]
+
+    @staticmethod
+    def store_recommendations(youth_ids, opportunity_ids, scores, batch_size=2000):
+        """
+        Replace the stored recommendations of every profile in ``youth_ids``
+        with the top-K of ``scores``, atomically
+        """
+        computed_at = timezone.now()
+        recommendations = MatchingService.build_recommendations(
+            youth_ids, opportunity_ids, scores, computed_at
+        )
+        profile_ids = youth_ids.tolist()
+
+        with transaction.atomic():
+            Recommendation.objects.bulk_create(
+                recommendations,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["youth_profile", "opportunity"],
+                update_fields=["score", "computed_at"],
+            )
+            # Anything not refreshed above fell out of the top-K
+            Recommendation.objects.filter(
+                youth_profile_id__in=profile_ids, computed_at__lt=computed_at
+            ).delete()
+
+        return len(recommendations)
+
+    @staticmethod
+    def rematch_opportunity(opportunity_id, batch_size=2000):
+        """
+        Re-score a single opportunity against its candidate profiles and
+        upsert the results in place; inactive or deleted opportunities are
+        evicted. Returns the number of stored matches for the opportunity.
+        """
+        opportunity = Opportunity.objects.filter(pk=opportunity_id).first()
+        if opportunity is None or not opportunity.is_active:
+            MatchingService.evict_opportunity(opportunity_id)
+            return 0
+
+        refresh_opportunity_bitmaps([opportunity_id])
+
+        opportunities = load_opportunity_features(
+            Opportunity.objects.filter(pk=opportunity_id)
+        )
+        if opportunities.vocabulary:
+            candidates = candidate_profiles(opportunity)
+        else:
+            # Nothing to match on skill-wise; location is the best signal left
+            candidates = YouthProfile.objects.filter(
+                nearby_county_filter(opportunity.county)
+            )
+        youth = load_youth_features(opportunities, candidates)
+        scores = score_matrix(youth, opportunities)[:, 0]
+
+        min_score = MatchingService.get_min_score()
+        keep = scores >= min_score
+        computed_at = timezone.now()
+        recommendations = [
+            Recommendation(
+                youth_profile_id=youth_id,
+                opportunity_id=opportunity_id,
+                score=score,
+                computed_at=computed_at,
+            )
+            for youth_id, score in zip(youth.ids[keep].tolist(), scores[keep].tolist())
+        ]
+        _, columns, values = top_k(
+            scores[None, :], MatchingService.get_candidate_limit(), min_score
+        )
+        candidates = [
+            CandidateMatch(
+                opportunity_id=opportunity_id,
+                youth_profile_id=youth_id,
+                score=score,
+                computed_at=computed_at,
+            )
+            for youth_id, score in zip(youth.ids[columns].tolist(), values.tolist())
+        ]
+
+        with transaction.atomic():
+            Recommendation.objects.bulk_create(
+                recommendations,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["youth_profile", "opportunity"],
+                update_fields=["score", "computed_at"],
+            )
+            # Profiles that are no longer candidates or fell below the cut-off
+            Recommendation.objects.filter(
+                opportunity_id=opportunity_id, computed_at__lt=computed_at
+            ).delete()
+            MatchingService.trim_recommendations(
+                Recommendation.objects.filter(opportunity_id=opportunity_id).values(
+                    "youth_profile_id"
+                ),
+                batch_size=batch_size,
+            )
+            MatchingService.store_candidates(
+                candidates,
+                computed_at,
+                replaces=CandidateMatch.objects.filter(opportunity_id=opportunity_id),
+                batch_size=batch_size,
+            )
+
+        return len(recommendations)
+
+    @staticmethod
+    def iter_candidate_pairs(opportunity_ids, chunk_size=5000):
+        """
+        Score a batch of opportunities together, against every profile that
+        is a candidate for any of them, instead of one
+        ``rematch_opportunity`` each. Yields ``(youth ids, opportunity ids,
+        scores)`` arrays of the same pairs ``rematch_opportunity`` would
+        keep, one chunk of profiles at a time.
+        """
+        opportunities = load_opportunity_features(
+            Opportunity.objects.filter(pk__in=opportunity_ids, is_active=True)
+        )
+        if not len(opportunities):
+            return
+
+        # Profiles sharing a skill with any of them, or near one that
+        # lists no skills
+        candidates = Q(id__in=candidate_profile_ids(opportunities.vocabulary))
+        without_skills = Opportunity.objects.filter(
+            pk__in=opportunity_ids, is_active=True, required_skills=None
+        )
+        for county in set(without_skills.values_list("county", flat=True)):
+            candidates |= nearby_county_filter(county)
+
+        min_score = MatchingService.get_min_score()
+        for youth, scores in iter_scores(
+            opportunities, YouthProfile.objects.filter(candidates), chunk_size
+        ):
+            # Pairs rematch_opportunity would not have scored are 0
+            rows, columns = np.nonzero(scores >= min_score)
+            yield youth.ids[rows], opportunities.ids[columns], scores[rows, columns]
+
+    @staticmethod
+    def match_new_opportunities(opportunity_ids, chunk_size=5000, batch_size=2000):
+        """
+        Store the matches of a batch of newly created opportunities (e.g.
+        one chunk of a bulk import), scored by ``iter_candidate_pairs``.
+        Returns the number stored.
+        """
+        computed_at = timezone.now()
+        recommendations = []
+        candidates = []
+        for youth_ids, matched_ids, scores in MatchingService.iter_candidate_pairs(
+            opportunity_ids, chunk_size
+        ):
+            for youth_id, opportunity_id, score in zip(
+                youth_ids.tolist(), matched_ids.tolist(), scores.tolist()
+            ):
+                recommendations.append(
+                    Recommendation(
+                        youth_profile_id=youth_id,
+                        opportunity_id=opportunity_id,
+                        score=score,
+                        computed_at=computed_at,
+                    )
+                )
+                candidates.append(
+                    CandidateMatch(
+                        opportunity_id=opportunity_id,
+                        youth_profile_id=youth_id,
+                        score=score,
+                        computed_at=computed_at,
+                    )
+                )
+
+        with transaction.atomic():
+            Recommendation.objects.bulk_create(
+                recommendations,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["youth_profile", "opportunity"],
+                update_fields=["score", "computed_at"],
+            )
+            MatchingService.trim_recommendations(
+                sorted({row.youth_profile_id for row in recommendations}),
+                batch_size=batch_size,
+            )
+            MatchingService.store_candidates(
+                candidates, computed_at, batch_size=batch_size
+            )
+
+        return len(recommendations)
+
+    @staticmethod
+    def rematch_candidates(opportunity_ids, chunk_size=5000, batch_size=2000):
+        """
+        Recompute the stored candidate lists of a batch of opportunities
+        (e.g. after a full rematch). Returns the number of pairs scored.
+        """
+        computed_at = timezone.now()
+        candidates = [
+            CandidateMatch(
+                opportunity_id=opportunity_id,
+                youth_profile_id=youth_id,
+                score=score,
+                computed_at=computed_at,
+            )
+            for youth_ids, matched_ids, scores in MatchingService.iter_candidate_pairs(
+                opportunity_ids, chunk_size
+            )
+            for youth_id, opportunity_id, score in zip(
+                youth_ids.tolist(), matched_ids.tolist(), scores.tolist()
+            )
+        ]
+        MatchingService.store_candidates(
+            candidates,
+            computed_at,
+            replaces=CandidateMatch.objects.filter(opportunity_id__in=opportunity_ids),
+            batch_size=batch_size,
+        )
+        return len(candidates)
+
+    @staticmethod
+    def store_candidates(candidates, computed_at, replaces=None, batch_size=2000):
+        """
+        Upsert CandidateMatch rows computed at ``computed_at`` and keep the
+        best MATCH_CANDIDATE_LIMIT of each opportunity they belong to. Rows
+        of ``replaces`` (a CandidateMatch queryset) not written here are
+        deleted.
+        """
+        with transaction.atomic():
+            CandidateMatch.objects.bulk_create(
+                candidates,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=["opportunity", "youth_profile"],
+                update_fields=["score", "computed_at"],
+            )
+            if replaces is not None:
+                replaces.filter(computed_at__lt=computed_at).delete()
+            delete_ranked_overflow(
+                CandidateMatch.objects.filter(
+                    opportunity_id__in=sorted(
+                        {row.opportunity_id for row in candidates}
+                    )
+                ),
+                partition_by="opportunity_id",
+                order_by=["score", "youth_profile_id"],
+                limit=MatchingService.get_candidate_limit(),
+                batch_size=batch_size,
+            )
+
+    @staticmethod
+    def evict_opportunity(opportunity_id):
+        """
+        Drop every stored match for an opportunity
+        """
+        Recommendation.objects.filter(opportunity_id=opportunity_id).delete()
+        CandidateMatch.objects.filter(opportunity_id=opportunity_id).delete()
+
+    @staticmethod
+    def trim_recommendations(profile_ids, batch_size=2000):
+        """
+        Delete rows ranked beyond the top-K for each of ``profile_ids`` (a
+        list or an ``id`` subquery)
+        """
+        delete_ranked_overflow(
+            Recommendation.objects.filter(youth_profile_id__in=profile_ids),
+            partition_by="youth_profile_id",
+            order_by=["score", "opportunity_id"],
+            limit=MatchingService.get_top_k(),
+            batch_size=batch_size,
+        )
+
+
+def delete_ranked_overflow(queryset, partition_by, order_by, limit, batch_size):
+    """
+    Delete the rows of ``queryset`` ranked past ``limit`` within their
+    ``partition_by`` group, best first by the ``order_by`` fields descending
+    """
+    overflow = list(
+        queryset.annotate(
+            rank=Window(
+                RowNumber(),
+                partition_by=F(partition_by),
+                order_by=[F(name).desc() for name in order_by],
+            )
+        )
+        .filter(rank__gt=limit)
+        .values_list("id", flat=True)
+    )
+    model = queryset.model
+    for start in range(0, len(overflow), batch_size):
+        model.objects.filter(id__in=overflow[start : start + batch_size]).delete()
@@ -0,0 +1,97 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from opportunities.models import Opportunity, Skill as OpportunitySkill
+from youth_profiles.models import Skill, YouthProfile, YouthSkill
+from . import index
+from .tasks import schedule_opportunity_rematch, schedule_profile_rematch
+
+
+@receiver(post_save, sender=YouthSkill)
+@receiver(post_delete, sender=YouthSkill)
+def update_skill_index(sender, instance, **kwargs):
+    """
+    Keep the inverted skill index in step with a youth's skills and refresh
+    their recommendations
+    """
+    index.reindex_profile(instance.youth_profile_id)
+    schedule_profile_rematch(instance.youth_profile_id)
+
+
+@receiver(post_save, sender=Skill)
+def reindex_renamed_skill(sender, instance, created, **kwargs):
+    """
+    A renamed skill may now map to a different canonical skill
+    """
+    if not created:
+        index.reindex_skill(instance)
+
+
+@receiver(post_save, sender=OpportunitySkill)
+def rematch_renamed_opportunity_skill(sender, instance, created, **kwargs):
+    """
+    ... and so may a renamed required skill: re-score the postings that
+    require it, which also refreshes their skill bitmaps
+    """
+    if not created:
+        for opportunity_id in instance.opportunities.values_list("id", flat=True):
+            schedule_opportunity_rematch(opportunity_id)
+
+
+@receiver(post_save, sender=Opportunity)
+def create_opportunity_bitmap(sender, instance, created, **kwargs):
+    """
+    Every opportunity has a skill bitmap, so profile rematches (which only
+    read bitmaps) see it from the start
+    """
+    if created:
+        index.refresh_opportunity_bitmaps([instance.pk])
+
+
+@receiver(m2m_changed, sender=Opportunity.required_skills.through)
+def refresh_required_skill_bitmaps(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Required skills added/removed, from either side of the relation
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            index.refresh_opportunity_bitmaps([instance.pk])
+    elif action == "pre_clear":
+        # pk_set is not provided for clear(); collect the ids while they exist
+        instance._cleared_opportunity_ids = list(
+            instance.opportunities.values_list("id", flat=True)
+        )
+    elif action == "post_clear":
+        index.refresh_opportunity_bitmaps(
+            instance.__dict__.pop("_cleared_opportunity_ids", [])
+        )
+    elif action in ("post_add", "post_remove"):
+        index.refresh_opportunity_bitmaps(list(pk_set))
+
+
+@receiver(pre_delete, sender=OpportunitySkill)
+def collect_deleted_skill_opportunities(sender, instance, **kwargs):
+    instance._deleted_opportunity_ids = list(
+        instance.opportunities.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=OpportunitySkill)
+def refresh_deleted_skill_bitmaps(sender, instance, **kwargs):
+    """
+    Deleting a skill removes it from its opportunities without m2m_changed
+    """
+    index.refresh_opportunity_bitmaps(
+        instance.__dict__.pop("_deleted_opportunity_ids", [])
+    )
+
+
+@receiver(post_save, sender=YouthProfile)
+def rematch_updated_profile(sender, instance, created, **kwargs):
+    """
+    County, work type and experience all feed into match scores; saves
+    that change none of them (bio, phone, ...) leave the matches alone
+    """
+    if not created and any(
+        instance.has_changed(name) for name in YouthProfile.tracked_fields
+    ):
+        schedule_profile_rematch(instance.pk)
@@ -0,0 +1,97 @@
+"""
+Deferred matching work.
+
+Jobs are queued once the triggering transaction has committed and run on a
+small background thread pool, so re-scoring never happens on the request
+path. Set MATCH_RUN_ASYNC = False to run them inline instead (e.g. in tests).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from .services import MatchingService
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "MATCH_WORKER_THREADS", 2),
+                thread_name_prefix="matching",
+            )
+        return _executor
+
+
+def _enqueue(key, func, *args):
+    """
+    Run ``func(*args)`` after commit. Jobs with the same ``key`` that are
+    still waiting are coalesced, so a burst of edits costs one re-score.
+    """
+
+    def run():
+        # Clear the key first: edits landing while we run queue a fresh job
+        with _lock:
+            _pending.discard(key)
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Matching job {key} failed: {str(e)}")
+        finally:
+            if getattr(settings, "MATCH_RUN_ASYNC", True):
+                close_old_connections()
+
+    def submit():
+        if not getattr(settings, "MATCH_RUN_ASYNC", True):
+            run()
+            return
+        with _lock:
+            if key in _pending:
+                return
+            _pending.add(key)
+        _get_executor().submit(run)
+
+    transaction.on_commit(submit)
+
+
+def schedule_opportunity_rematch(opportunity_id):
+    """
+    Re-score one opportunity against its candidate profiles
+    """
+    _enqueue(
+        ("opportunity", opportunity_id),
+        MatchingService.rematch_opportunity,
+        opportunity_id,
+    )
+
+
+def schedule_new_opportunities_match(opportunity_ids):
+    """
+    Score a batch of new opportunities (e.g. a bulk import chunk) in one
+    background job
+    """
+    opportunity_ids = list(opportunity_ids)
+    if not opportunity_ids:
+        return
+    _enqueue(
+        ("opportunities", opportunity_ids[0], opportunity_ids[-1]),
+        MatchingService.match_new_opportunities,
+        opportunity_ids,
+    )
+
+
+def schedule_profile_rematch(profile_id):
+    """
+    Re-score one youth profile against the active catalogue
+    """
+    _enqueue(("profile", profile_id), MatchingService.rematch_profile, profile_id)
@@ -1,3 +1,879 @@
-from django.test import TestCase
+from importlib import import_module
+from io import StringIO
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from accounts.models import User
+from core.counties import county_index
+from employers.models import EmployerProfile
+from opportunities.models import Opportunity, Skill as OpportunitySkill
+from youth_profiles.models import Skill as ProfileSkill, YouthProfile, YouthSkill
+from . import bitsets, tasks
+from .benchmarks import run_matching_suite
+from .index import candidate_profile_ids, rebuild_skill_index
+from .models import (
+    CanonicalSkill,
+    OpportunitySkillBitmap,
+    Recommendation,
+    RematchRun,
+    SkillIndexEntry,
+)
+from .rematch import run_full_rematch
+from .scoring import (
+    county_code,
+    load_bitmap_catalogue,
+    load_opportunity_features,
+    load_youth_features,
+    location_credit,
+    score_matrix,
+    top_k,
+)
+from .services import MatchingService
+
+
+class MatchingFixtureMixin:
+    """
+    Helpers creating employers, postings and youth without the API
+    """
+
+    @staticmethod
+    def create_employer(username="employer"):
+        # bulk_create: no welcome email
+        (user,) = User.objects.bulk_create(
+            [User(username=username, password="!", user_type="employer")]
+        )
+        return EmployerProfile.objects.create(user=user, company_name="Acme")
+
+    @staticmethod
+    def create_opportunity(employer, skills=(), **fields):
+        fields = {
+            "title": "Role",
+            "description": "Role description",
+            "category": "Technology",
+            "opportunity_type": "Full-time",
+            "county": "Nairobi",
+            **fields,
+        }
+        opportunity = Opportunity.objects.create(employer=employer, **fields)
+        opportunity.required_skills.add(
+            *(OpportunitySkill.objects.get_or_create(name=name)[0] for name in skills)
+        )
+        return opportunity
+
+    @staticmethod
+    def create_youth(username, skills=(), **fields):
+        """
+        ``skills`` is a sequence of (name, proficiency, years) tuples
+        """
+        (user,) = User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=f"{username}@example.com",
+                    password="!",
+                    user_type="youth",
+                )
+            ]
+        )
+        profile = YouthProfile.objects.create(user=user, **fields)
+        for name, proficiency, years in skills:
+            YouthSkill.objects.create(
+                youth_profile=profile,
+                skill=ProfileSkill.objects.get_or_create(name=name)[0],
+                proficiency=proficiency,
+                years_of_experience=years,
+            )
+        return profile
+
+
+class MatchingBenchmarkSmokeTest(TestCase):
+    """
+    Runs the benchmark suite on a tiny dataset so it cannot silently rot
+    """
+
+    def test_matching_suite_reports_every_phase(self):
+        report = run_matching_suite(profiles=60, opportunities=6, samples=3)
+
+        self.assertEqual(report["dataset"]["profiles"], 60)
+        self.assertEqual(report["full_rematch"]["profiles"], 60)
+        self.assertGreater(report["index_build"]["entries"], 0)
+        self.assertEqual(report["rematch_opportunity"]["samples"], 3)
+        self.assertEqual(report["rematch_profile"]["samples"], 3)
+        self.assertTrue(Recommendation.objects.exists())
+
+
+class LocationCreditTests(SimpleTestCase):
+    def test_credit_falls_off_with_county_distance(self):
+        codes = {}
+        youth = np.int32(county_code("Nairobi", codes))
+        opportunities = np.array(
+            [
+                county_code(name, codes)
+                for name in ["NAIROBI", "Kiambu", "Nakuru", "Mombasa", "Atlantis"]
+            ],
+            dtype=np.int32,
+        )
+        np.testing.assert_array_equal(
+            location_credit(youth, opportunities), [1.0, 0.5, 0.25, 0.0, 0.0]
+        )
+
+    def test_names_outside_the_table_match_exactly(self):
+        codes = {}
+        opportunity = np.int32(county_code("Atlantis", codes))
+        self.assertIsNone(county_index("Atlantis"))
+        self.assertEqual(
+            location_credit(
+                np.int32(county_code("atlantis ", codes, add=False)), opportunity
+            ),
+            1.0,
+        )
+        self.assertEqual(
+            location_credit(
+                np.int32(county_code("Narnia", codes, add=False)), opportunity
+            ),
+            0.0,
+        )
+
+
+class ScoreMatrixTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.developer = cls.create_opportunity(
+            employer,
+            ["Python", "SQL"],
+            county="Nairobi",
+            experience_required="1-2 years",
+        )
+        cls.internship = cls.create_opportunity(
+            employer, county="Mombasa", opportunity_type="Internship"
+        )
+        cls.pythonista = cls.create_youth(
+            "pythonista",
+            [("python", "expert", 2)],
+            county="Nairobi",
+            preferred_work_type="full_time",
+        )
+        cls.intern = cls.create_youth(
+            "intern",
+            [("SQL", "advanced", 0)],
+            county="Mombasa",
+            preferred_work_type="internship",
+        )
+
+    def test_scores_blend_skills_location_type_and_experience(self):
+        opportunities = load_opportunity_features()
+        youth = load_youth_features(opportunities)
+        self.assertEqual(
+            opportunities.ids.tolist(), [self.developer.pk, self.internship.pk]
+        )
+        self.assertEqual(youth.ids.tolist(), [self.pythonista.pk, self.intern.pk])
+
+        # pythonista -> developer: half the skills at full credit (0.3),
+        # same county (0.15), matching type (0.1), enough experience (0.15).
+        # Postings without skills get a neutral skill score (0.3), but only
+        # youth nearby are candidates for them.
+        np.testing.assert_array_equal(
+            score_matrix(youth, opportunities), [[70, 0], [24, 70]]
+        )
+
+    def test_youth_skills_outside_the_vocabulary_are_ignored(self):
+        opportunities = load_opportunity_features(
+            Opportunity.objects.filter(pk=self.internship.pk)
+        )
+        youth = load_youth_features(opportunities)
+        self.assertEqual(opportunities.vocabulary, {})
+        self.assertEqual(youth.skills.shape, (2, 0))
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class DuplicateSkillScoringTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.opportunity = cls.create_opportunity(
+            employer, ["Python"], experience_required="3-5 years"
+        )
+        # Two spellings of one skill; the stronger is listed first
+        cls.youth = cls.create_youth(
+            "youth",
+            [("Python", "beginner", 10), ("python", "intermediate", 0)],
+            county="Nairobi",
+            preferred_work_type="full_time",
+        )
+
+    def test_matrix_and_bitmap_paths_keep_the_strongest_spelling(self):
+        opportunities = load_opportunity_features()
+        youth = load_youth_features(opportunities)
+        # 0.9 skill credit (0.54), same county (0.15), matching type (0.1),
+        # enough experience (0.15)
+        self.assertEqual(score_matrix(youth, opportunities).tolist(), [[94]])
+
+        MatchingService.rematch_profile(self.youth.pk)
+        self.assertEqual(
+            list(Recommendation.objects.values_list("score", flat=True)), [94]
+        )
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class NoSharedSkillTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.opportunity = cls.create_opportunity(employer, ["Python"])
+        # Same county, type and level: 40 points without any skill overlap
+        cls.youth = cls.create_youth(
+            "cook",
+            [("Cooking", "expert", 5)],
+            county="Nairobi",
+            preferred_work_type="full_time",
+        )
+
+    def test_posting_with_none_of_its_skills_scores_zero(self):
+        opportunities = load_opportunity_features()
+        youth = load_youth_features(opportunities)
+        self.assertEqual(score_matrix(youth, opportunities).tolist(), [[0]])
+
+        MatchingService.rematch_profile(self.youth.pk)
+        MatchingService.rematch_profiles()
+        self.assertFalse(Recommendation.objects.exists())
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class MatchingPathConsistencyTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.opportunities = [
+            cls.create_opportunity(employer, ["Python"], county="Nairobi"),
+            cls.create_opportunity(employer, ["Python", "Cooking"], county="Kisumu"),
+            # No skills: only youth in or near Kiambu are candidates
+            cls.create_opportunity(employer, county="Kiambu"),
+            cls.create_opportunity(employer, county="Mombasa"),
+        ]
+        cls.profiles = [
+            cls.create_youth(
+                f"youth{i}",
+                skills,
+                county=county,
+                preferred_work_type="full_time",
+            )
+            for i, (skills, county) in enumerate(
+                [
+                    ([("Python", "expert", 3)], "Nairobi"),
+                    ([("Cooking", "expert", 0)], "Nairobi"),
+                    ([("python", "beginner", 1)], "Mombasa"),
+                ]
+            )
+        ]
+
+    def stored(self):
+        return sorted(
+            Recommendation.objects.values_list(
+                "youth_profile_id", "opportunity_id", "score"
+            )
+        )
+
+    def test_every_path_stores_the_same_recommendations(self):
+        opportunity_ids = [opportunity.pk for opportunity in self.opportunities]
+        paths = {
+            "rematch_profile": lambda: [
+                MatchingService.rematch_profile(profile.pk) for profile in self.profiles
+            ],
+            "rematch_profiles": MatchingService.rematch_profiles,
+            "run_full_rematch": run_full_rematch,
+            "rematch_opportunity": lambda: [
+                MatchingService.rematch_opportunity(opportunity_id)
+                for opportunity_id in opportunity_ids
+            ],
+            "match_new_opportunities": lambda: (
+                MatchingService.match_new_opportunities(opportunity_ids)
+            ),
+        }
+        results = {}
+        for name, run in paths.items():
+            Recommendation.objects.all().delete()
+            run()
+            results[name] = self.stored()
+
+        expected = results.pop("rematch_opportunity")
+        # Nairobi Python expert: the Python postings and nearby Kiambu; the
+        # cook the Kisumu posting and Kiambu, not the Python-only one; the
+        # Mombasa beginner the Nairobi Python posting and Mombasa (Kisumu
+        # scores 39), never Kiambu
+        self.assertEqual(
+            [(youth_id, opportunity_id) for youth_id, opportunity_id, _ in expected],
+            [
+                (self.profiles[0].pk, opportunity_ids[0]),
+                (self.profiles[0].pk, opportunity_ids[1]),
+                (self.profiles[0].pk, opportunity_ids[2]),
+                (self.profiles[1].pk, opportunity_ids[1]),
+                (self.profiles[1].pk, opportunity_ids[2]),
+                (self.profiles[2].pk, opportunity_ids[0]),
+                (self.profiles[2].pk, opportunity_ids[3]),
+            ],
+        )
+        for name, stored in results.items():
+            with self.subTest(path=name):
+                self.assertEqual(stored, expected)
+
+
+class TopKTests(SimpleTestCase):
+    scores = np.array([[10, 90, 50], [70, 20, 80]], dtype=np.uint8)
+
+    def test_best_columns_per_row_in_descending_order(self):
+        rows, columns, values = top_k(self.scores, 2)
+        self.assertEqual(rows.tolist(), [0, 0, 1, 1])
+        self.assertEqual(columns.tolist(), [1, 2, 2, 0])
+        self.assertEqual(values.tolist(), [90, 50, 80, 70])
+
+    def test_min_score_and_oversized_k(self):
+        rows, columns, values = top_k(self.scores, 10, min_score=60)
+        self.assertEqual(rows.tolist(), [0, 1, 1])
+        self.assertEqual(columns.tolist(), [1, 2, 0])
+        self.assertEqual(values.tolist(), [90, 80, 70])
+
+    def test_empty_matrix(self):
+        rows, columns, values = top_k(np.zeros((3, 0), dtype=np.uint8), 5)
+        self.assertEqual(len(rows) + len(columns) + len(values), 0)
+
+
+class BitsetTests(SimpleTestCase):
+    def test_pack_round_trips_through_unpack(self):
+        bits = bitsets.pack([130, 0, 64, 0])
+        self.assertEqual(len(bits), 3 * 8)
+        self.assertEqual(bitsets.unpack(bits), [0, 64, 130])
+        self.assertEqual(bitsets.pack([]), b"")
+
+    def test_stack_pads_to_the_widest_bitmap(self):
+        matrix = bitsets.stack([bitsets.pack([1]), bitsets.pack([70]), b""])
+        self.assertEqual(matrix.shape, (3, 2))
+        self.assertEqual(matrix[:, 0].tolist(), [2, 0, 0])
+        self.assertEqual(matrix[:, 1].tolist(), [0, 1 << 6, 0])
+        self.assertEqual(bitsets.stack([bitsets.pack([70])], width=1).tolist(), [[0]])
+
+    def test_stack_dense_numbers_only_the_ids_present(self):
+        matrix, positions = bitsets.stack_dense(
+            [bitsets.pack([5000, 7]), bitsets.pack([90000]), b""]
+        )
+        self.assertEqual(positions, {7: 0, 5000: 1, 90000: 2})
+        self.assertEqual(matrix.tolist(), [[0b011], [0b100], [0]])
+
+    def test_overlap_and_missing(self):
+        matrix = bitsets.stack([bitsets.pack([1, 2, 3]), bitsets.pack([3, 100])])
+        row = bitsets.as_row(bitsets.pack([2, 3]), matrix.shape[1])
+        self.assertEqual(bitsets.overlap(matrix, row).tolist(), [2, 1])
+        self.assertEqual(bitsets.missing(matrix, row).tolist(), [1, 1])
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class SkillIndexTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = cls.create_employer()
+        cls.youth = cls.create_youth(
+            "youth",
+            [
+                ("Python", "beginner", 0),
+                (" PYTHON", "expert", 3),
+                ("SQL", "advanced", 1),
+            ],
+            county="Nairobi",
+        )
+
+    def get_postings(self, profile):
+        return sorted(
+            SkillIndexEntry.objects.filter(youth_profile=profile).values_list(
+                "skill__name", "proficiency", "years_of_experience"
+            )
+        )
+
+    def test_spellings_collapse_onto_the_strongest_posting(self):
+        self.assertEqual(
+            self.get_postings(self.youth), [("python", 4, 3), ("sql", 3, 1)]
+        )
+
+    def test_signals_follow_skill_changes(self):
+        YouthSkill.objects.filter(youth_profile=self.youth, skill__name="SQL").delete()
+        self.assertEqual(self.get_postings(self.youth), [("python", 4, 3)])
+
+        ProfileSkill.objects.filter(name=" PYTHON").delete()
+        self.assertEqual(self.get_postings(self.youth), [("python", 1, 0)])
+
+        skill = ProfileSkill.objects.get(name="Python")
+        skill.name = "Django"
+        skill.save()
+        self.assertEqual(self.get_postings(self.youth), [("django", 1, 0)])
+
+    def test_candidates_share_a_skill(self):
+        other = self.create_youth("other", [("Excel", "expert", 1)])
+        self.assertEqual(
+            list(candidate_profile_ids(["python ", "Go"])), [self.youth.pk]
+        )
+        self.assertEqual(
+            sorted(candidate_profile_ids(["sql", "EXCEL"])),
+            sorted([self.youth.pk, other.pk]),
+        )
+
+    def test_rebuild_matches_incremental_index(self):
+        self.create_youth("other", [("Excel", "expert", 1), ("sql", "beginner", 0)])
+        incremental = sorted(
+            SkillIndexEntry.objects.values_list(
+                "skill__name", "youth_profile_id", "proficiency", "years_of_experience"
+            )
+        )
+        self.assertEqual(rebuild_skill_index(), len(incremental))
+        self.assertEqual(
+            sorted(
+                SkillIndexEntry.objects.values_list(
+                    "skill__name",
+                    "youth_profile_id",
+                    "proficiency",
+                    "years_of_experience",
+                )
+            ),
+            incremental,
+        )
+
+    def test_renamed_required_skill_is_reindexed(self):
+        opportunity = self.create_opportunity(self.employer, ["Pyhton"])
+        skill = OpportunitySkill.objects.get(name="Pyhton")
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.name = "Python"
+            skill.save()
+
+        self.assertTrue(CanonicalSkill.objects.filter(name="python").exists())
+        self.assertEqual(
+            list(
+                Recommendation.objects.filter(opportunity=opportunity).values_list(
+                    "youth_profile_id", flat=True
+                )
+            ),
+            [self.youth.pk],
+        )
+
+
+class RecommendationListTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.youth = cls.create_youth("youth")
+        other = cls.create_youth("other")
+        cls.opportunities = [
+            cls.create_opportunity(employer, title=f"Role {i}") for i in range(3)
+        ]
+        Recommendation.objects.bulk_create(
+            [
+                Recommendation(
+                    youth_profile=cls.youth, opportunity=opportunity, score=score
+                )
+                for opportunity, score in zip(cls.opportunities, [55, 90, 55])
+            ]
+            + [
+                Recommendation(
+                    youth_profile=other, opportunity=cls.opportunities[0], score=99
+                )
+            ]
+        )
+
+    def get_page(self, **params):
+        response = self.client.get("/api/youth/recommendations/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_own_matches_best_first_one_page_query(self):
+        self.client.force_login(self.youth.user)
+        with self.assertNumQueries(3):  # session, user, page
+            data = self.get_page()
+        self.assertEqual(
+            [(item["opportunity"]["id"], item["score"]) for item in data["results"]],
+            [
+                (self.opportunities[1].pk, 90),
+                (self.opportunities[2].pk, 55),
+                (self.opportunities[0].pk, 55),
+            ],
+        )
+        self.assertEqual(data["results"][0]["opportunity"]["company_name"], "Acme")
+        self.assertIsNone(data["next"])
+
+    def test_cursor_pages_through_ties(self):
+        self.client.force_login(self.youth.user)
+        seen = []
+        params = {"page_size": 1}
+        while True:
+            data = self.get_page(**params)
+            seen += [item["opportunity"]["id"] for item in data["results"]]
+            if not data["next"]:
+                break
+            params["cursor"] = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+        self.assertEqual(seen, [self.opportunities[i].pk for i in (1, 2, 0)])
+
+    def test_requires_authentication(self):
+        response = self.client.get("/api/youth/recommendations/")
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class OpportunityRematchTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = cls.create_employer()
+        cls.youth = cls.create_youth(
+            "youth", [("Python", "expert", 2)], county="Nairobi"
+        )
+        cls.create_youth("unrelated", [("Welding", "expert", 2)], county="Nairobi")
+
+    def setUp(self):
+        self.client.force_login(self.employer.user)
+
+    def get_matches(self, opportunity_id):
+        return list(
+            Recommendation.objects.filter(opportunity_id=opportunity_id).values_list(
+                "youth_profile_id", "score"
+            )
+        )
+
+    def test_create_and_edits_upsert_in_place(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/opportunities/",
+                {
+                    "title": "Developer",
+                    "description": "Build things",
+                    "category": "Technology",
+                    "opportunity_type": "Full-time",
+                    "county": "Nairobi",
+                    "required_skills": ["python"],
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201)
+        opportunity_id = Opportunity.objects.get(title="Developer").pk
+        self.assertEqual(self.get_matches(opportunity_id), [(self.youth.pk, 100)])
+
+        def edit(**data):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.put(
+                    f"/api/opportunities/{opportunity_id}/",
+                    data,
+                    content_type="application/json",
+                )
+            self.assertEqual(response.status_code, 200)
+            return self.get_matches(opportunity_id)
+
+        self.assertEqual(edit(county="Mombasa"), [(self.youth.pk, 85)])
+        # No shared skill: no longer a candidate
+        self.assertEqual(edit(required_skills=["Excel"]), [])
+        self.assertEqual(edit(required_skills=["Python"]), [(self.youth.pk, 85)])
+        self.assertEqual(edit(is_active=False), [])
+
+    @override_settings(MATCH_TOP_K=1)
+    def test_youth_keep_only_their_top_k(self):
+        best = self.create_opportunity(self.employer, ["Python"])
+        weaker = self.create_opportunity(self.employer, ["Python"], county="Mombasa")
+
+        MatchingService.rematch_opportunity(weaker.pk)
+        self.assertEqual(self.get_matches(weaker.pk), [(self.youth.pk, 85)])
+
+        MatchingService.rematch_opportunity(best.pk)
+        self.assertEqual(self.get_matches(best.pk), [(self.youth.pk, 100)])
+        self.assertEqual(self.get_matches(weaker.pk), [])
+
+    def test_deactivated_by_update_is_evicted_on_rematch(self):
+        opportunity = self.create_opportunity(self.employer, ["Python"])
+        MatchingService.rematch_opportunity(opportunity.pk)
+        opportunity_id = opportunity.pk
+        Opportunity.objects.filter(pk=opportunity_id).update(is_active=False)
+
+        self.assertEqual(MatchingService.rematch_opportunity(opportunity_id), 0)
+        self.assertEqual(self.get_matches(opportunity_id), [])
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class ProfileRematchTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        cls.opportunity = cls.create_opportunity(employer, ["Python"])
+        MatchingService.rematch_opportunity(cls.opportunity.pk)
+        cls.youth = cls.create_youth("youth", county="Nairobi")
+        cls.skill = ProfileSkill.objects.create(name="Python")
+
+    def setUp(self):
+        self.client.force_login(self.youth.user)
+
+    def send(self, method, url, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, method)(
+                url, data, content_type="application/json"
+            )
+        self.assertLess(response.status_code, 300)
+        return response
+
+    def get_scores(self):
+        return list(
+            Recommendation.objects.filter(youth_profile=self.youth).values_list(
+                "opportunity_id", "score"
+            )
+        )
+
+    def test_skill_and_profile_edits_replace_recommendations(self):
+        response = self.send(
+            "post",
+            "/api/youth/skills/add/",
+            {"skill_id": self.skill.pk, "proficiency": "expert"},
+        )
+        self.assertEqual(self.get_scores(), [(self.opportunity.pk, 100)])
+
+        self.send(
+            "put",
+            f"/api/youth/skills/{response.data['id']}/",
+            {"skill_id": self.skill.pk, "proficiency": "beginner"},
+        )
+        self.assertEqual(self.get_scores(), [(self.opportunity.pk, 64)])
+
+        self.send("patch", "/api/youth/profile/", {"county": "Mombasa"})
+        self.assertEqual(self.get_scores(), [(self.opportunity.pk, 49)])
+
+
+@override_settings(MATCH_RUN_ASYNC=True)
+class MatchingTaskTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(tasks._pending.clear)
+
+    @patch("matching.tasks.close_old_connections")
+    @patch("matching.tasks.MatchingService.rematch_profile")
+    @patch("matching.tasks._get_executor")
+    @patch("matching.tasks.transaction.on_commit", lambda callback: callback())
+    def test_waiting_jobs_are_coalesced(self, get_executor, rematch_profile, _):
+        submit = get_executor.return_value.submit
+        for profile_id in [1, 1, 2, 1]:
+            tasks.schedule_profile_rematch(profile_id)
+        self.assertEqual(submit.call_count, 2)
+
+        # Once a job starts, a new edit queues a fresh one
+        submit.call_args_list[0].args[0]()
+        rematch_profile.assert_called_once_with(1)
+        tasks.schedule_profile_rematch(1)
+        tasks.schedule_profile_rematch(2)
+        self.assertEqual(submit.call_count, 3)
+
+
+class FullRematchTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = cls.create_employer()
+        for county in ["Nairobi", "Kiambu"]:
+            cls.create_opportunity(employer, ["Python"], county=county)
+        cls.profiles = [
+            cls.create_youth(f"youth{i}", [("Python", "advanced", i)], county="Nairobi")
+            for i in range(3)
+        ]
+
+    def get_recommendations(self):
+        return sorted(
+            Recommendation.objects.values_list(
+                "youth_profile_id", "opportunity_id", "score"
+            )
+        )
+
+    def test_interrupted_run_resumes_after_its_checkpoint(self):
+        MatchingService.rematch_profiles()
+        expected = self.get_recommendations()
+        Recommendation.objects.all().delete()
+
+        def interrupt(run, rate):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_full_rematch(chunk_size=2, progress=interrupt)
+        run = RematchRun.objects.get()
+        self.assertIsNone(run.finished_at)
+        self.assertEqual(run.last_profile_id, self.profiles[1].pk)
+        self.assertEqual(
+            {row[0] for row in self.get_recommendations()},
+            {self.profiles[0].pk, self.profiles[1].pk},
+        )
+
+        call_command(
+            "rematch",
+            "--resume",
+            "--workers",
+            "1",
+            "--chunk-size",
+            "2",
+            stdout=StringIO(),
+        )
+        run.refresh_from_db()
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(run.profiles_processed, 3)
+        self.assertEqual(self.get_recommendations(), expected)
+
+    def test_nothing_to_resume(self):
+        with self.assertRaises(CommandError):
+            call_command("rematch", "--resume", stdout=StringIO())
+
+
+@override_settings(MATCH_RUN_ASYNC=False, MATCH_TOP_K=1)
+class CandidateListTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = cls.create_employer()
+        cls.best = cls.create_opportunity(cls.employer, ["Python"])
+        cls.opportunity = cls.create_opportunity(
+            cls.employer, ["Python", "SQL"], county="Mombasa"
+        )
+        cls.expert = cls.create_youth(
+            "expert", [("Python", "expert", 2), ("SQL", "expert", 2)], county="Nairobi"
+        )
+        cls.beginner = cls.create_youth(
+            "beginner", [("Python", "beginner", 0)], county="Mombasa"
+        )
+        for opportunity in [cls.best, cls.opportunity]:
+            MatchingService.rematch_opportunity(opportunity.pk)
+
+    def get_candidates(self, opportunity=None, **params):
+        opportunity = opportunity or self.opportunity
+        self.client.force_login(self.employer.user)
+        response = self.client.get(
+            f"/api/opportunities/{opportunity.pk}/candidates/", params
+        )
+        self.assertEqual(response.status_code, 200)
+        return [
+            (item["youth_profile"]["id"], item["score"], item["missing_skills"])
+            for item in response.data["results"]
+        ]
+
+    def test_candidates_outside_their_own_top_k_are_listed(self):
+        # expert's single recommendation is the better-placed posting ...
+        self.assertEqual(
+            list(
+                Recommendation.objects.filter(youth_profile=self.expert).values_list(
+                    "opportunity_id", flat=True
+                )
+            ),
+            [self.best.pk],
+        )
+        # ... but they are still this posting's best candidate
+        self.assertEqual(
+            self.get_candidates(),
+            [(self.expert.pk, 85, 0), (self.beginner.pk, 52, 1)],
+        )
+
+    def test_filters(self):
+        self.assertEqual(
+            self.get_candidates(county="mombasa"), [(self.beginner.pk, 52, 1)]
+        )
+        self.assertEqual(
+            self.get_candidates(min_proficiency="advanced"), [(self.expert.pk, 85, 0)]
+        )
+
+    def test_profile_edits_update_candidate_lists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            YouthSkill.objects.create(
+                youth_profile=self.beginner,
+                skill=ProfileSkill.objects.get_or_create(name="SQL")[0],
+                proficiency="expert",
+                years_of_experience=3,
+            )
+        self.assertEqual(
+            self.get_candidates(),
+            [(self.expert.pk, 85, 0), (self.beginner.pk, 82, 0)],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            YouthSkill.objects.filter(youth_profile=self.expert).delete()
+        self.assertEqual(self.get_candidates(), [(self.beginner.pk, 82, 0)])
+
+    @override_settings(MATCH_CANDIDATE_LIMIT=1)
+    def test_each_list_keeps_the_best_candidates(self):
+        MatchingService.rematch_opportunity(self.opportunity.pk)
+        self.assertEqual(self.get_candidates(), [(self.expert.pk, 85, 0)])
+
+    def test_owner_only_and_invalid_proficiency(self):
+        other = self.create_employer("other")
+        self.client.force_login(other.user)
+        response = self.client.get(
+            f"/api/opportunities/{self.opportunity.pk}/candidates/"
+        )
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.employer.user)
+        response = self.client.get(
+            f"/api/opportunities/{self.opportunity.pk}/candidates/",
+            {"min_proficiency": "guru"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class OpportunitySkillBitmapTests(MatchingFixtureMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = cls.create_employer()
+        # Posted straight through the ORM: never rematched
+        cls.opportunity = cls.create_opportunity(cls.employer, ["Python", "SQL"])
+
+    def get_skills(self, opportunity):
+        bitmap = OpportunitySkillBitmap.objects.get(opportunity=opportunity)
+        return sorted(
+            CanonicalSkill.objects.filter(
+                id__in=bitsets.unpack(bytes(bitmap.bits))
+            ).values_list("name", flat=True)
+        )
+
+    def test_bitmap_follows_required_skills(self):
+        self.assertEqual(self.get_skills(self.opportunity), ["python", "sql"])
+
+        self.opportunity.required_skills.remove(
+            OpportunitySkill.objects.get(name="SQL")
+        )
+        self.assertEqual(self.get_skills(self.opportunity), ["python"])
+
+        OpportunitySkill.objects.get(name="Python").delete()
+        self.assertEqual(self.get_skills(self.opportunity), [])
+
+    def test_profile_rematch_sees_an_existing_opportunity(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            youth = self.create_youth(
+                "youth", [("Python", "expert", 2)], county="Nairobi"
+            )
+        self.assertEqual(
+            list(
+                Recommendation.objects.filter(youth_profile=youth).values_list(
+                    "opportunity_id", flat=True
+                )
+            ),
+            [self.opportunity.pk],
+        )
+
+    def test_catalogue_packs_only_required_skills(self):
+        CanonicalSkill.objects.bulk_create(
+            CanonicalSkill(name=f"unused {i}") for i in range(200)
+        )
+        other = self.create_opportunity(self.employer, ["Docker", "SQL"])
+        catalogue = load_bitmap_catalogue()
+
+        self.assertEqual(catalogue.bitmaps.shape, (2, 1))
+        self.assertEqual(len(catalogue.skill_positions), 3)
+        sql = CanonicalSkill.objects.get(name="sql").pk
+        self.assertEqual(
+            bitsets.overlap(
+                catalogue.bitmaps, catalogue.skill_row([sql, 10**6])
+            ).tolist(),
+            [1, 1],
+        )
+        self.assertEqual(catalogue.ids.tolist(), [self.opportunity.pk, other.pk])
+
+    def test_migration_backfills_missing_bitmaps(self):
+        OpportunitySkillBitmap.objects.all().delete()
+        migration = import_module(
+            "matching.migrations.0008_backfill_opportunity_bitmaps"
+        )
+        migration.backfill_opportunity_bitmaps(apps, None)
+        self.assertEqual(self.get_skills(self.opportunity), ["python", "sql"])
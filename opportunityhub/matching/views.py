@@ -1,3 +1,100 @@
-from django.shortcuts import render
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Exists, OuterRef
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.pagination import KeysetPagination
+from opportunities.models import Opportunity
+from .index import PROFICIENCY_RANKS, canonical_skill_ids
+from .models import CandidateMatch, Recommendation, SkillIndexEntry
+from .serializers import CandidateSerializer, RecommendationSerializer
 
-# Create your views here.
+
+class RecommendationListView(generics.ListAPIView):
+    """
+    GET /api/youth/recommendations/
+    Precomputed opportunity matches for the current youth, best first
+    """
+
+    serializer_class = RecommendationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-score", "-opportunity_id")
+
+    def get_queryset(self):
+        # One query: served straight from the (youth_profile, score) index
+        return Recommendation.objects.select_related(
+            "opportunity", "opportunity__employer"
+        ).filter(youth_profile__user=self.request.user)
+
+
+class OpportunityCandidateListView(generics.ListAPIView):
+    """
+    GET /api/opportunities/<id>/candidates/
+    Best-matching youth for an opportunity (owner only), from its
+    precomputed candidate list. Optional filters: ?county= and ?min_proficiency=
+    (beginner|intermediate|advanced|expert, on any required skill).
+    """
+
+    serializer_class = CandidateSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ("-score", "-youth_profile_id")
+
+    def get(self, request, pk):
+        self.opportunity = get_object_or_404(
+            Opportunity.objects.select_related("employer", "skill_bitmap").only(
+                "id", "employer__user_id", "skill_bitmap__bits"
+            ),
+            pk=pk,
+        )
+        if self.opportunity.employer.user_id != request.user.id:
+            return Response(
+                {"error": "You can only view candidates for your own opportunities"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        min_proficiency = request.query_params.get("min_proficiency")
+        if min_proficiency and min_proficiency.lower() not in PROFICIENCY_RANKS:
+            return Response(
+                {"error": "Invalid min_proficiency"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self.list(request)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        try:
+            context["required_bits"] = bytes(self.opportunity.skill_bitmap.bits)
+        except ObjectDoesNotExist:
+            context["required_bits"] = b""
+        return context
+
+    def get_queryset(self):
+        candidates = CandidateMatch.objects.select_related(
+            "youth_profile", "youth_profile__user", "youth_profile__skill_bitmap"
+        ).filter(opportunity_id=self.opportunity.pk)
+
+        county = self.request.query_params.get("county")
+        if county:
+            candidates = candidates.filter(youth_profile__county__iexact=county)
+
+        min_proficiency = self.request.query_params.get("min_proficiency")
+        if min_proficiency:
+            skill_ids = canonical_skill_ids(
+                self.opportunity.required_skills.values_list("name", flat=True),
+                create=False,
+            )
+            candidates = candidates.filter(
+                Exists(
+                    SkillIndexEntry.objects.filter(
+                        youth_profile_id=OuterRef("youth_profile_id"),
+                        skill_id__in=skill_ids.values(),
+                        proficiency__gte=PROFICIENCY_RANKS[min_proficiency.lower()],
+                    )
+                )
+            )
+
+        return candidates
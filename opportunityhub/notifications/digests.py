@@ -0,0 +1,153 @@
+"""
+Match digests: one email per youth listing their new matches.
+
+Every stored Recommendation above the digest threshold that has not been
+emailed yet is grouped per youth profile, rendered into a single digest and
+sent through Resend in batches. Matches are recorded as MatchNotification
+rows only once their batch is accepted, so a rerun after a failure picks up
+exactly what was not sent and never mails the same match twice. The record is
+kept per (youth, opportunity) pair, so it survives a rematch trimming and
+later re-creating the Recommendation row.
+"""
+
+from itertools import groupby
+import logging
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from matching.models import Recommendation
+from .email_service import MAX_BATCH_SIZE, EmailService
+from .models import MatchNotification
+
+logger = logging.getLogger(__name__)
+
+
+def pending_matches(min_score):
+    """
+    Un-notified matches at or above ``min_score`` on active opportunities
+    """
+    already_sent = MatchNotification.objects.filter(
+        youth_profile_id=OuterRef("youth_profile_id"),
+        opportunity_id=OuterRef("opportunity_id"),
+    )
+    return Recommendation.objects.filter(
+        ~Exists(already_sent),
+        score__gte=min_score,
+        opportunity__is_active=True,
+    )
+
+
+def iter_pending_batches(min_score, batch_size):
+    """
+    Yield the pending match rows of ``batch_size`` youth profiles at a time,
+    sorted by profile with the best match first. Each batch is read in full
+    before it is yielded, so it is safe to record matches between batches.
+    """
+    after_id = 0
+    while True:
+        profile_ids = list(
+            pending_matches(min_score)
+            .filter(youth_profile_id__gt=after_id)
+            .order_by("youth_profile_id")
+            .values_list("youth_profile_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not profile_ids:
+            return
+        after_id = profile_ids[-1]
+        yield list(
+            pending_matches(min_score)
+            .filter(youth_profile_id__in=profile_ids)
+            .order_by("youth_profile_id", "-score", "-opportunity_id")
+            .values_list(
+                "id",
+                "youth_profile_id",
+                "youth_profile__user__email",
+                "youth_profile__user__first_name",
+                "youth_profile__user__username",
+                "opportunity_id",
+                "opportunity__title",
+                "opportunity__employer__company_name",
+                "opportunity__county",
+                "score",
+            )
+        )
+
+
+def build_digests(rows, max_items):
+    """
+    Yield (recommendation ids, email params) per youth profile from rows
+    sorted by profile. All of a profile's matches are covered by its digest,
+    including those beyond ``max_items`` that are only counted.
+    """
+    for _, group in groupby(rows, key=lambda row: row[1]):
+        group = list(group)
+        ids = [row[0] for row in group]
+        email, first_name, username = group[0][2:5]
+        if not email:
+            # Nobody to send to; mark them so they are not reconsidered forever
+            yield ids, None
+            continue
+
+        matches = [
+            {
+                "title": title,
+                "company_name": company_name,
+                "county": county,
+                "score": score,
+                "link": f"{settings.SITE_URL}/api/opportunities/{opportunity_id}/",
+            }
+            for _, _, _, _, _, opportunity_id, title, company_name, county, score in (
+                group[:max_items]
+            )
+        ]
+        yield ids, EmailService.build_opportunity_digest(
+            user_email=email,
+            user_name=first_name or username,
+            matches=matches,
+            remaining=len(group) - len(matches),
+        )
+
+
+def send_match_digests(min_score=None, max_items=None, batch_size=MAX_BATCH_SIZE):
+    """
+    Send one digest per youth with pending matches. Returns a
+    (digests sent, digests failed) tuple.
+    """
+    if min_score is None:
+        min_score = getattr(settings, "MATCH_DIGEST_MIN_SCORE", 60)
+    if max_items is None:
+        max_items = getattr(settings, "MATCH_DIGEST_MAX_ITEMS", 10)
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+
+    sent = failed = 0
+    for rows in iter_pending_batches(min_score, batch_size):
+        pairs = {row[0]: (row[1], row[5]) for row in rows}
+        notified_ids, messages = [], []
+        for ids, message in build_digests(rows, max_items):
+            notified_ids.extend(ids)
+            if message is not None:
+                messages.append(message)
+
+        if messages and not EmailService.send_opportunity_digests(messages):
+            # Left un-notified so the next run retries them
+            failed += len(messages)
+            continue
+        sent += len(messages)
+        notified_at = timezone.now()
+        MatchNotification.objects.bulk_create(
+            [
+                MatchNotification(
+                    youth_profile_id=pairs[recommendation_id][0],
+                    opportunity_id=pairs[recommendation_id][1],
+                    notified_at=notified_at,
+                )
+                for recommendation_id in notified_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+    logger.info(f"Match digests: {sent} sent, {failed} failed")
+    return sent, failed
@@ -1,12 +1,16 @@
 import resend
 from django.conf import settings
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 # Initialize Resend with API key
 resend.api_key = settings.RESEND_API_KEY
 
+# Resend accepts at most 100 emails per batch call
+MAX_BATCH_SIZE = 100
+
 
 class EmailService:
     """
@@ -94,6 +98,102 @@ class EmailService:
             to_email=user_email, subject=subject, html_content=html_content
         )
 
+    @staticmethod
+    def build_opportunity_digest(user_email, user_name, matches, remaining=0):
+        """
+        Build (but do not send) one digest email listing several matches
+
+        Args:
+            user_email (str): Recipient's email address
+            user_name (str): User's first name
+            matches (list): Dicts with title, company_name, county, score, link
+            remaining (int): Further matches not listed in the digest
+
+        Returns:
+            dict: Resend email params, ready for send_opportunity_digests
+        """
+        count = len(matches) + remaining
+        subject = (
+            f"🎯 {count} New Opportunity Matches for You"
+            if count > 1
+            else f"🎯 New Opportunity Match: {matches[0]['title']}"
+        )
+
+        items = "".join(f"""
+                    <div style="background-color: #f8f9fa; border-left: 4px solid #27ae60; padding: 16px 20px; border-radius: 8px; margin: 0 0 15px 0;">
+                        <h3 style="color: #27ae60; margin: 0 0 8px 0; font-size: 18px;">
+                            <a href="{match['link']}" style="color: #27ae60; text-decoration: none;">{match['title']}</a>
+                        </h3>
+                        <p style="color: #666; font-size: 14px; margin: 0 0 10px 0;">{match['company_name']} · {match['county']}</p>
+                        <span style="background-color: #27ae60; color: white; padding: 4px 10px; border-radius: 20px; font-size: 13px; font-weight: bold;">
+                            {match['score']}% Match
+                        </span>
+                    </div>""" for match in matches)
+        more = (
+            f"""
+                    <p style="color: #555; font-size: 15px; margin: 20px 0 0 0;">
+                        ...and {remaining} more waiting in your recommendations.
+                    </p>"""
+            if remaining
+            else ""
+        )
+
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="utf-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        </head>
+        <body style="margin: 0; padding: 0; font-family: 'Segoe UI', Arial, sans-serif; background-color: #f5f5f5;">
+            <div style="max-width: 600px; margin: 0 auto; background-color: #ffffff;">
+                <div style="background: linear-gradient(135deg, #27ae60 0%, #229954 100%); padding: 30px 20px; text-align: center;">
+                    <h1 style="color: #ffffff; margin: 0; font-size: 28px;">OpportunityHub Kenya</h1>
+                    <p style="color: #e8f8f5; margin: 10px 0 0 0; font-size: 14px;">Connecting Talent with Opportunities 🇰🇪</p>
+                </div>
+                
+                <div style="padding: 40px 30px;">
+                    <h2 style="color: #2c3e50; margin: 0 0 20px 0; font-size: 24px;">Hi {user_name}! 👋</h2>
+                    <p style="color: #555; font-size: 16px; line-height: 1.6; margin: 0 0 25px 0;">
+                        Great news! These opportunities match your skills and profile.
+                    </p>
+                    {items}
+                    {more}
+                    
+                    <p style="color: #999; font-size: 14px; line-height: 1.6; margin: 30px 0 0 0; padding-top: 20px; border-top: 1px solid #eee;">
+                        <strong>Pro Tip:</strong> Apply early to increase your chances!
+                    </p>
+                </div>
+                
+                <div style="background-color: #2c3e50; padding: 25px 30px; text-align: center;">
+                    <p style="color: #bdc3c7; font-size: 14px; margin: 0;">
+                        Best regards,<br>
+                        <strong style="color: #ecf0f1;">The OpportunityHub Kenya Team</strong>
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+        return {
+            "from": settings.DEFAULT_FROM_EMAIL,
+            "to": [user_email],
+            "subject": subject,
+            "html": html_content,
+        }
+
+    @staticmethod
+    def send_opportunity_digests(messages):
+        """
+        Send digests built by build_opportunity_digest in a single API call
+        (at most 100 per call)
+
+        Returns:
+            bool: True if the whole batch was accepted, False otherwise
+        """
+        return EmailService._send_batch(messages)
+
     @staticmethod
     def send_application_status_update(
         user_email, user_name, opportunity_title, status, employer_name=None
@@ -101,6 +201,25 @@ class EmailService:
         """
         Send email when application status changes
         """
+        message = EmailService.build_application_status_update(
+            user_email, user_name, opportunity_title, status, employer_name
+        )
+        return EmailService._send_email(
+            to_email=user_email,
+            subject=message["subject"],
+            html_content=message["html"],
+        )
+
+    @staticmethod
+    def build_application_status_update(
+        user_email, user_name, opportunity_title, status, employer_name=None
+    ):
+        """
+        Build (but do not send) an application status email
+
+        Returns:
+            dict: Resend email params, ready for send_application_status_updates
+        """
         status_config = {
             "accepted": {
                 "emoji": "🎉",
@@ -168,9 +287,40 @@ class EmailService:
         </html>
         """
 
-        return EmailService._send_email(
-            to_email=user_email, subject=subject, html_content=html_content
-        )
+        return {
+            "from": settings.DEFAULT_FROM_EMAIL,
+            "to": [user_email],
+            "subject": subject,
+            "html": html_content,
+        }
+
+    @staticmethod
+    def send_application_status_updates(messages, attempts=1, retry_delay=1):
+        """
+        Send status emails built by build_application_status_update, up to
+        MAX_BATCH_SIZE per API call. A refused batch is tried up to
+        ``attempts`` times, waiting ``retry_delay`` seconds (doubling) between
+        tries.
+
+        Returns:
+            int: Number of emails in batches that were accepted
+        """
+        sent = 0
+        for start in range(0, len(messages), MAX_BATCH_SIZE):
+            batch = messages[start : start + MAX_BATCH_SIZE]
+            for attempt in range(attempts):
+                if attempt:
+                    time.sleep(retry_delay * 2 ** (attempt - 1))
+                if EmailService._send_batch(batch):
+                    sent += len(batch)
+                    break
+            else:
+                recipients = ", ".join(to for message in batch for to in message["to"])
+                logger.error(
+                    f"Gave up on {len(batch)} status emails after {attempts} "
+                    f"attempts: {recipients}"
+                )
+        return sent
 
     @staticmethod
     def send_welcome_email(user_email, user_name, user_type):
@@ -264,3 +414,24 @@ class EmailService:
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
+
+    @staticmethod
+    def _send_batch(messages):
+        """
+        Internal method to send up to MAX_BATCH_SIZE emails in one Resend
+        batch call
+        """
+        if not messages:
+            return True
+        try:
+            response = resend.Batch.send(messages)
+
+            logger.info(
+                f"Batch of {len(messages)} emails sent successfully - "
+                f"{len(response.get('data', []))} accepted"
+            )
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to send batch of {len(messages)} emails: {str(e)}")
+            return False
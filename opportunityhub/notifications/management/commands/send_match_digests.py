@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from notifications.digests import MAX_BATCH_SIZE, send_match_digests
+
+
+class Command(BaseCommand):
+    help = "Email each youth one digest of their new opportunity matches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-score",
+            type=int,
+            default=None,
+            help="Only include matches scoring at least this (default: MATCH_DIGEST_MIN_SCORE)",
+        )
+        parser.add_argument(
+            "--max-items",
+            type=int,
+            default=None,
+            help="Matches listed per digest (default: MATCH_DIGEST_MAX_ITEMS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=MAX_BATCH_SIZE,
+            help="Digests sent per Resend batch call (max 100)",
+        )
+
+    def handle(self, *args, **options):
+        sent, failed = send_match_digests(
+            min_score=options["min_score"],
+            max_items=options["max_items"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} match digests"))
+        if failed:
+            self.stdout.write(
+                self.style.WARNING(f"{failed} digests failed and will be retried")
+            )
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("matching", "0005_skill_bitmaps"),
+        ("opportunities", "0002_application"),
+        ("youth_profiles", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MatchNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "notified_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "opportunity",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="match_notifications",
+                        to="opportunities.opportunity",
+                    ),
+                ),
+                (
+                    "youth_profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="match_notifications",
+                        to="youth_profiles.youthprofile",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("youth_profile", "opportunity")},
+            },
+        ),
+    ]
@@ -1,3 +1,27 @@
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class MatchNotification(models.Model):
+    """
+    A (youth, opportunity) match that has gone out in a digest. Outlives the
+    Recommendation row, which a rematch may trim and later re-create.
+    """
+
+    youth_profile = models.ForeignKey(
+        "youth_profiles.YouthProfile",
+        on_delete=models.CASCADE,
+        related_name="match_notifications",
+    )
+    opportunity = models.ForeignKey(
+        "opportunities.Opportunity",
+        on_delete=models.CASCADE,
+        related_name="match_notifications",
+    )
+    notified_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ["youth_profile", "opportunity"]
+
+    def __str__(self):
+        return f"Profile {self.youth_profile_id} notified of {self.opportunity_id}"
@@ -0,0 +1,68 @@
+"""
+Deferred email sending.
+
+Like ``matching.tasks``: jobs are queued once the triggering transaction has
+committed and run on a small background thread pool, so Resend calls (and
+their retries) never hold up a request. Set EMAIL_RUN_ASYNC = False to send
+inline instead (e.g. in tests).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+from .email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "EMAIL_WORKER_THREADS", 1),
+                thread_name_prefix="email",
+            )
+        return _executor
+
+
+def _enqueue(name, func, *args):
+    """
+    Run ``func(*args)`` after commit, on the email thread pool
+    """
+
+    def run():
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error(f"Email job {name} failed: {str(e)}")
+
+    def submit():
+        if not getattr(settings, "EMAIL_RUN_ASYNC", True):
+            run()
+            return
+        _get_executor().submit(run)
+
+    transaction.on_commit(submit)
+
+
+def schedule_application_status_emails(messages):
+    """
+    Send status emails built by build_application_status_update once the
+    new statuses are committed, retrying batches Resend refuses
+    """
+    if not messages:
+        return
+    _enqueue(
+        "application status emails",
+        EmailService.send_application_status_updates,
+        messages,
+        getattr(settings, "EMAIL_SEND_ATTEMPTS", 3),
+    )
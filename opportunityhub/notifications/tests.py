@@ -1,3 +1,95 @@
+from unittest.mock import patch
+
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+from employers.models import EmployerProfile
+from matching.models import Recommendation
+from opportunities.models import Opportunity
+from youth_profiles.models import YouthProfile
+from .digests import send_match_digests
+from .models import MatchNotification
+
+
+@patch("notifications.digests.EmailService.send_opportunity_digests", return_value=True)
+class MatchDigestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: no welcome email
+        employer_user, *youth_users = User.objects.bulk_create(
+            [
+                User(username="employer", password="!", user_type="employer"),
+                User(username="amina", email="amina@example.com", user_type="youth"),
+                User(username="brian", email="brian@example.com", user_type="youth"),
+            ]
+        )
+        employer = EmployerProfile.objects.create(
+            user=employer_user, company_name="Acme"
+        )
+        cls.amina, cls.brian = [
+            YouthProfile.objects.create(user=user) for user in youth_users
+        ]
+        cls.opportunities = [
+            Opportunity.objects.create(
+                employer=employer,
+                title=f"Role {i}",
+                description="Role description",
+                category="Technology",
+                opportunity_type="Full-time",
+                county="Nairobi",
+                is_active=i < 3,
+            )
+            for i in range(4)
+        ]
+        Recommendation.objects.bulk_create(
+            [
+                Recommendation(
+                    youth_profile=profile, opportunity_id=opportunity.pk, score=score
+                )
+                for profile, opportunity, score in [
+                    (cls.amina, cls.opportunities[0], 90),
+                    (cls.amina, cls.opportunities[1], 70),
+                    # Below the threshold
+                    (cls.amina, cls.opportunities[2], 50),
+                    # Inactive opportunity
+                    (cls.amina, cls.opportunities[3], 95),
+                    (cls.brian, cls.opportunities[1], 80),
+                ]
+            ]
+        )
+
+    def test_one_digest_per_youth_sent_once(self, send_digests):
+        self.assertEqual(send_match_digests(min_score=60), (2, 0))
+        (messages,) = send_digests.call_args.args
+        self.assertEqual(
+            [(message["to"], message["subject"]) for message in messages],
+            [
+                (["amina@example.com"], "🎯 2 New Opportunity Matches for You"),
+                (["brian@example.com"], "🎯 New Opportunity Match: Role 1"),
+            ],
+        )
+        self.assertEqual(MatchNotification.objects.count(), 3)
+
+        send_digests.reset_mock()
+        self.assertEqual(send_match_digests(min_score=60), (0, 0))
+        send_digests.assert_not_called()
+
+    def test_failed_batch_is_retried(self, send_digests):
+        send_digests.return_value = False
+        self.assertEqual(send_match_digests(min_score=60), (0, 2))
+        self.assertFalse(MatchNotification.objects.exists())
+
+        send_digests.return_value = True
+        self.assertEqual(send_match_digests(min_score=60), (2, 0))
+
+    def test_recreated_match_is_not_sent_again(self, send_digests):
+        send_match_digests(min_score=60)
+
+        # A rematch trims the row and a later one re-creates it
+        Recommendation.objects.filter(youth_profile=self.brian).delete()
+        Recommendation.objects.create(
+            youth_profile=self.brian, opportunity=self.opportunities[1], score=85
+        )
+        send_digests.reset_mock()
+        self.assertEqual(send_match_digests(min_score=60), (0, 0))
+        send_digests.assert_not_called()
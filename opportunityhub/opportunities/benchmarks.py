@@ -0,0 +1,168 @@
+"""
+Benchmarks for the public opportunity list and its full-text search.
+
+Requests go through ``OpportunityListCreateView`` end to end (filters,
+search, keyset pagination and serialization), so the latencies are what an
+anonymous client would see minus the network and the response cache: the
+suite runs with a dummy cache, otherwise every repeated query would be timed
+as a cache hit. ``run_serialization_suite`` isolates the cost of turning a
+page of rows into JSON.
+"""
+
+import random
+import time
+from urllib.parse import parse_qs, urlparse
+
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.renderers import FastJSONRenderer
+
+from matching.benchmarks import (
+    FIELDS,
+    ROLES,
+    generate_dataset,
+    latency_summary,
+    timed,
+)
+from .fastpath import FastListPlan
+from .models import Opportunity
+from .serializers import OpportunityListSerializer, OpportunitySerializer
+from .views import OpportunityListCreateView
+
+# Rows per page in the serialization suite (the list's max_page_size)
+SERIALIZATION_PAGE_SIZE = 100
+
+# Cache settings for the search suite: nothing is stored, so each sample
+# runs the query
+NO_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+
+def run_search_suite(postings, samples=20, seed=42, trace_memory=False, **options):
+    """
+    Generate ``postings`` synthetic opportunities and time first and second
+    pages of ``?q=`` searches against the plain newest-first list. Options
+    that only apply to the matching suite are ignored.
+    """
+    dataset, seconds, memory = timed(
+        generate_dataset, 0, postings, seed, trace_memory=trace_memory
+    )
+    report = {
+        "dataset": dataset,
+        "generate": {"seconds": round(seconds, 3), **memory},
+    }
+
+    rng = random.Random(seed)
+    factory = APIRequestFactory()
+    view = OpportunityListCreateView.as_view()
+
+    def fetch(params):
+        request = factory.get("/api/opportunities/", params)
+        started = time.perf_counter()
+        response = view(request)
+        response.render()
+        return time.perf_counter() - started, response.data
+
+    queries = {
+        "list": lambda: {},
+        "search_one_term": lambda: {"q": rng.choice(ROLES)},
+        "search_two_terms": lambda: {"q": f"{rng.choice(FIELDS)} {rng.choice(ROLES)}"},
+        "search_prefix": lambda: {"q": rng.choice(ROLES)[:3]},
+        "search_with_filter": lambda: {
+            "q": rng.choice(ROLES),
+            "type": "Full-time",
+        },
+    }
+
+    def sample(make_params):
+        first_pages, next_pages = [], []
+        for _ in range(samples):
+            params = make_params()
+            elapsed, data = fetch(params)
+            first_pages.append(elapsed)
+            if data["next"]:
+                cursor = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+                elapsed, _ = fetch({**params, "cursor": cursor})
+                next_pages.append(elapsed)
+        return first_pages, next_pages
+
+    # Next-page links are absolute URLs built from the request's host
+    with override_settings(ALLOWED_HOSTS=["testserver"], CACHES=NO_CACHE):
+        for name, make_params in queries.items():
+            (first_pages, next_pages), _, memory = timed(
+                sample, make_params, trace_memory=trace_memory
+            )
+            report[name] = {
+                "first_page": latency_summary(first_pages),
+                "next_page": latency_summary(next_pages),
+                **memory,
+            }
+
+    return report
+
+
+def run_serialization_suite(
+    postings, samples=20, seed=42, trace_memory=False, **options
+):
+    """
+    Generate ``postings`` synthetic opportunities and compare rows/sec of
+    fetching and rendering a page to JSON: the full ``OpportunitySerializer``,
+    the compact ``OpportunityListSerializer`` and the values() fast path
+    """
+    dataset, seconds, memory = timed(
+        generate_dataset, 0, postings, seed, trace_memory=trace_memory
+    )
+    report = {
+        "dataset": dataset,
+        "generate": {"seconds": round(seconds, 3), **memory},
+        "page_size": SERIALIZATION_PAGE_SIZE,
+    }
+
+    rng = random.Random(seed)
+    request = Request(APIRequestFactory().get("/api/opportunities/"))
+    base = Opportunity.objects.filter(is_active=True).order_by("-created_at", "-id")
+    ids = list(base.values_list("id", flat=True))
+
+    def page():
+        start = rng.randrange(max(len(ids) - SERIALIZATION_PAGE_SIZE, 1))
+        return base.filter(id__in=ids[start : start + SERIALIZATION_PAGE_SIZE])
+
+    def full_serializer():
+        rows = page().select_related("employer", "employer__user")
+        rows = rows.prefetch_related("required_skills")
+        return JSONRenderer().render(OpportunitySerializer(rows, many=True).data)
+
+    def list_serializer():
+        rows = OpportunityListSerializer.optimize_queryset(page(), request)
+        data = OpportunityListSerializer(
+            rows, many=True, context={"request": request}
+        ).data
+        return JSONRenderer().render(data)
+
+    def fast_path():
+        plan = FastListPlan(OpportunityListSerializer(context={"request": request}))
+        return FastJSONRenderer().render(plan.build(list(plan.values(page()))))
+
+    for name, render in [
+        ("opportunity_serializer", full_serializer),
+        ("list_serializer", list_serializer),
+        ("fast_path", fast_path),
+    ]:
+        render()  # warm up
+        rng.seed(seed)  # the same pages for every renderer
+        timings = []
+        for _ in range(samples):
+            started = time.perf_counter()
+            payload = render()
+            timings.append(time.perf_counter() - started)
+        report[name] = {
+            **latency_summary(timings),
+            "rows_per_second": round(
+                SERIALIZATION_PAGE_SIZE * len(timings) / sum(timings)
+            ),
+            "payload_bytes": len(payload),
+        }
+
+    return report
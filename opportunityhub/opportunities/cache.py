@@ -0,0 +1,202 @@
+"""
+Caching for the public opportunity catalogue.
+
+Cached entries embed version numbers in their keys instead of being deleted
+on change:
+
+* the catalogue *generation*, bumped by any Opportunity or EmployerProfile
+  change, covers lists and facet counts;
+* a per-opportunity version covers that opportunity's detail response, which
+  also records the version of the employer it embeds.
+
+Bumping a version makes every entry built against the old one unreachable at
+once; stale entries simply expire. The bumps are wired up in signals.py;
+writes that bypass signals (``update()``, ``bulk_create``) must call
+``bump_generation()`` / ``bump_opportunity_version()`` themselves.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from core.utils import normalize_key
+from .filters import count_facets
+
+GENERATION_KEY = "opportunities:generation"
+HITS_KEY = "opportunities:responses:hits"
+MISSES_KEY = "opportunities:responses:misses"
+
+# Only these query parameters change facet counts
+FACET_PARAMS = (
+    "category",
+    "county",
+    "radius",
+    "skill",
+    "type",
+    "salary_min",
+    "salary_max",
+)
+
+
+def get_version(key):
+    # Seeded from the clock so an evicted counter never reuses old numbers
+    return cache.get_or_set(key, time.time_ns, timeout=None)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def opportunity_version_key(opportunity_id):
+    return f"opportunities:version:{opportunity_id}"
+
+
+def employer_version_key(employer_id):
+    return f"employers:version:{employer_id}"
+
+
+def get_generation():
+    return get_version(GENERATION_KEY)
+
+
+def bump_generation():
+    """
+    Invalidate everything cached against the current catalogue
+    """
+    bump_version(GENERATION_KEY)
+
+
+def bump_opportunity_version(opportunity_id):
+    bump_version(opportunity_version_key(opportunity_id))
+
+
+def bump_employer_version(employer_id):
+    bump_version(employer_version_key(employer_id))
+
+
+# ==================== Facet counts ====================
+
+
+def facets_cache_key(params):
+    filters = "&".join(
+        f"{name}={normalize_key(params.get(name))}"
+        for name in FACET_PARAMS
+        if params.get(name)
+    )
+    digest = hashlib.md5(filters.encode("utf-8")).hexdigest()
+    return f"opportunities:facets:{get_generation()}:{digest}"
+
+
+def get_facets(params):
+    """
+    Facet counts for ``params``, cached per filter combination. Free-text
+    searches (``q``) are too varied to be worth caching and always recount.
+    """
+    if params.get("q"):
+        return count_facets(params)
+
+    key = facets_cache_key(params)
+    facets = cache.get(key)
+    if facets is None:
+        facets = count_facets(params)
+        cache.set(key, facets, getattr(settings, "FACETS_CACHE_TIMEOUT", 300))
+    return facets
+
+
+# ==================== API responses ====================
+
+
+def list_cache_key(request):
+    """
+    Key for a list response: the catalogue generation plus the query params,
+    normalized so equivalent filters (``?county=Nairobi`` and
+    ``?county=nairobi``) share an entry. The host is included because the
+    response embeds absolute next-page links.
+    """
+    params = sorted(
+        (
+            name,
+            normalize_key(value) if name in FACET_PARAMS or name == "q" else value,
+        )
+        for name, value in request.query_params.items()
+        if value
+    )
+    raw = f"{request.get_host()}?{params}"
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    return f"opportunities:list:{get_generation()}:{digest}"
+
+
+def detail_cache_key(opportunity_id):
+    version = get_version(opportunity_version_key(opportunity_id))
+    return f"opportunities:detail:{opportunity_id}:{version}"
+
+
+def get_cached_response(key):
+    """
+    The cached response stored under ``key``, or None (counting the hit or
+    miss). An entry is also a miss if any version it depends on has moved.
+    """
+    entry = cache.get(key)
+    if entry is not None and entry["depends_on"]:
+        current = cache.get_many(list(entry["depends_on"]))
+        if current != entry["depends_on"]:
+            entry = None
+
+    record_cache_lookup(hit=entry is not None)
+    if entry is None:
+        return None
+    response = Response(entry["data"])
+    response["X-Cache"] = "HIT"
+    return response
+
+
+def cache_response(key, response, depends_on=()):
+    """
+    Store a successful response under ``key``, valid for as long as the
+    versions named in ``depends_on`` keep their current values
+    """
+    response["X-Cache"] = "MISS"
+    if response.status_code != 200:
+        return response
+    cache.set(
+        key,
+        {
+            "data": response.data,
+            "depends_on": {name: get_version(name) for name in depends_on},
+        },
+        getattr(settings, "OPPORTUNITY_CACHE_TIMEOUT", 600),
+    )
+    return response
+
+
+def record_cache_lookup(hit):
+    key = HITS_KEY if hit else MISSES_KEY
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted in between
+            cache.set(key, 1, timeout=None)
+
+
+def response_cache_stats():
+    """
+    Hits and misses of the list/detail response cache since the last reset
+    """
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def reset_response_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
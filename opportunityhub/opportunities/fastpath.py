@@ -0,0 +1,113 @@
+"""
+Serializer-free rendering of opportunity list pages.
+
+``OpportunityListSerializer`` walks every field of every row through DRF's
+attribute lookup and ``to_representation``. The fast path fetches the page
+with ``values()`` instead, gets the required skills of the whole page in one
+query, and builds the same dicts directly: values that need converting
+(decimals, dates, datetimes) still go through the serializer's own field
+objects, so the output does not change. ``?expand=`` falls back to the
+serializer.
+"""
+
+from collections import defaultdict
+
+from rest_framework import serializers
+
+from employers.serializers import EmployerSummarySerializer
+from .models import Opportunity
+
+# Field types whose representation differs from the database value
+CONVERTED_FIELDS = (
+    serializers.DecimalField,
+    serializers.DateField,
+    serializers.DateTimeField,
+)
+
+
+class FastListPlan:
+    """
+    How to build the fields selected on a ``OpportunityListSerializer``
+    from ``values()`` rows
+    """
+
+    def __init__(self, serializer):
+        self.fields = serializer.fields
+        self.columns = []
+        self.converters = {}
+        self.employer_fields = None
+        self.skill_fields = None
+
+        for name, field in self.fields.items():
+            if name == "employer":
+                self.employer_fields = list(field.fields)
+                self.columns += [f"employer__{sub}" for sub in self.employer_fields]
+            elif name == "required_skills":
+                self.skill_fields = list(field.child.fields)
+            else:
+                self.columns.append(name)
+                if isinstance(field, CONVERTED_FIELDS):
+                    self.converters[name] = field.to_representation
+
+    @classmethod
+    def for_serializer(cls, serializer):
+        """
+        A plan, or None if a selected field is not one the fast path builds
+        """
+        employer = serializer.fields.get("employer")
+        if employer is not None and type(employer) is not EmployerSummarySerializer:
+            return None
+        return cls(serializer)
+
+    def values(self, queryset, extra_fields=()):
+        """
+        ``queryset`` as ``values()`` rows holding the plan's columns, plus
+        ``extra_fields`` (e.g. the pagination sort key)
+        """
+        return queryset.values(*dict.fromkeys(["id", *self.columns, *extra_fields]))
+
+    def skills_by_opportunity(self, opportunity_ids):
+        """
+        One query for the required skills of every opportunity on the page,
+        ordered by name like a prefetch of ``required_skills``
+        """
+        through = Opportunity.required_skills.through
+        columns = [f"skill__{name}" for name in self.skill_fields]
+        rows = (
+            through.objects.filter(opportunity_id__in=opportunity_ids)
+            .order_by("skill__name")
+            .values_list("opportunity_id", *columns)
+        )
+        skills = defaultdict(list)
+        for opportunity_id, *values in rows:
+            skills[opportunity_id].append(dict(zip(self.skill_fields, values)))
+        return skills
+
+    def build(self, rows):
+        """
+        The serialized representation of ``rows``
+        """
+        skills = (
+            self.skills_by_opportunity([row["id"] for row in rows])
+            if self.skill_fields is not None
+            else None
+        )
+        converters = self.converters
+
+        data = []
+        for row in rows:
+            item = {}
+            for name in self.fields:
+                if name == "employer":
+                    item[name] = {
+                        sub: row[f"employer__{sub}"] for sub in self.employer_fields
+                    }
+                elif name == "required_skills":
+                    item[name] = skills.get(row["id"], [])
+                else:
+                    value = row[name]
+                    if value is not None and name in converters:
+                        value = converters[name](value)
+                    item[name] = value
+            data.append(item)
+        return data
@@ -0,0 +1,210 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Case, Count, IntegerField, Min, Q, Value, When
+from rest_framework.exceptions import ValidationError
+
+from core.counties import COUNTY_KEYS, counties_within, county_name
+from core.utils import normalize_key
+from .models import Opportunity
+from .search import search_opportunities
+
+# ?ordering= value -> keyset sort key of the public list (see KeysetPagination:
+# rows without a salary or deadline come last, in id order)
+ORDERINGS = {
+    "created": ("created_at", "id"),
+    "-created": ("-created_at", "-id"),
+    "salary": ("salary_min", "id"),
+    "-salary": ("-salary_min", "-id"),
+    "deadline": ("application_deadline", "id"),
+    "-deadline": ("-application_deadline", "-id"),
+}
+
+
+# Keyset sort key for ?county=&radius=: the named county first, then each
+# ring of neighbours out, newest first within a ring
+COUNTY_DISTANCE_ORDERING = ("county_distance", "-created_at", "-id")
+
+
+def get_ordering(params):
+    """
+    The sort key requested with ``?ordering=``, or None for the default
+    """
+    ordering = params.get("ordering")
+    if not ordering:
+        return None
+    if ordering not in ORDERINGS:
+        raise ValidationError(
+            {"error": f"ordering must be one of: {', '.join(ORDERINGS)}"}
+        )
+    return ORDERINGS[ordering]
+
+
+def parse_salary(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        amount = None
+    if amount is None or not amount.is_finite():
+        raise ValidationError({"error": f"{name} must be a number"})
+    return amount
+
+
+def parse_radius(params):
+    value = params.get("radius")
+    if not value:
+        return None
+    try:
+        radius = int(value)
+    except ValueError:
+        radius = -1
+    if radius < 0:
+        raise ValidationError(
+            {"error": "radius must be a whole number of county borders (0 or more)"}
+        )
+    return radius
+
+
+def nearby_county_keys(params):
+    """
+    ``{county_key: distance}`` for ``?county=X&radius=N``: every spelling of
+    every county at most N borders from X. None without a radius, or if X is
+    not a Kenyan county (it is then matched exactly).
+    """
+    county = params.get("county")
+    radius = parse_radius(params)
+    if not county or radius is None:
+        return None
+    nearby = counties_within(county, radius)
+    if not nearby:
+        return None
+    return {key: distance for index, distance in nearby for key in COUNTY_KEYS[index]}
+
+
+def annotate_county_distance(opportunities, params):
+    """
+    Annotate ``county_distance``, the distance band of each opportunity's
+    county from ``?county=``, for COUNTY_DISTANCE_ORDERING
+    """
+    bands = {}
+    for key, distance in nearby_county_keys(params).items():
+        bands.setdefault(distance, []).append(key)
+    return opportunities.annotate(
+        county_distance=Case(
+            *(
+                When(county_key__in=keys, then=Value(distance))
+                for distance, keys in sorted(bands.items())
+            ),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def filter_salary(opportunities, low, high):
+    """
+    Opportunities whose salary range overlaps [low, high]. A posting with
+    only one bound is open-ended on the other side; postings without any
+    salary never match.
+    """
+    opportunities = opportunities.filter(
+        Q(salary_min__isnull=False) | Q(salary_max__isnull=False)
+    )
+    if low is not None:
+        opportunities = opportunities.filter(
+            Q(salary_max__gte=low) | Q(salary_max__isnull=True)
+        )
+    if high is not None:
+        opportunities = opportunities.filter(
+            Q(salary_min__lte=high) | Q(salary_min__isnull=True)
+        )
+    return opportunities
+
+
+def filter_opportunities(opportunities, params):
+    """
+    Apply the public list filters in ``params`` (category, county, radius,
+    skill, type, salary_min, salary_max, q) to an Opportunity queryset
+    """
+    # Filter by category
+    category = params.get("category")
+    if category:
+        opportunities = opportunities.filter(category_key=normalize_key(category))
+
+    # Filter by county/location, widened to neighbouring counties by ?radius=
+    county = params.get("county")
+    if county:
+        nearby = nearby_county_keys(params)
+        if nearby:
+            opportunities = opportunities.filter(county_key__in=list(nearby))
+        else:
+            opportunities = opportunities.filter(county_key=normalize_key(county))
+
+    # Filter by skill
+    skill = params.get("skill")
+    if skill:
+        opportunities = opportunities.filter(required_skills__key=normalize_key(skill))
+
+    # Filter by opportunity type
+    opp_type = params.get("type")
+    if opp_type:
+        opportunities = opportunities.filter(type_key=normalize_key(opp_type))
+
+    # Filter by salary range overlap
+    salary_min = parse_salary(params, "salary_min")
+    salary_max = parse_salary(params, "salary_max")
+    if salary_min is not None or salary_max is not None:
+        opportunities = filter_salary(opportunities, salary_min, salary_max)
+
+    # Full-text search on title and description
+    query = params.get("q")
+    if query:
+        opportunities = search_opportunities(opportunities, query)
+
+    return opportunities
+
+
+# Facet name -> (column grouped on, column shown), for
+# /api/opportunities/facets/
+FACET_FIELDS = {
+    "category": ("category_key", "category"),
+    "county": ("county_key", "county"),
+    "type": ("type_key", "opportunity_type"),
+    "experience": ("experience_required", "experience_required"),
+}
+
+
+def facet_value(name, key, spelling):
+    """
+    What a facet shows for a group: the standard spelling of a known county,
+    else one of the group's stored spellings, tidied
+    """
+    if name == "county" and county_name(key):
+        return county_name(key)
+    return " ".join(spelling.split())
+
+
+def count_facets(params):
+    """
+    Counts of active opportunities per value of each facet, under the
+    filters in ``params``: one grouped aggregate query per facet
+    """
+    opportunities = filter_opportunities(
+        Opportunity.objects.filter(is_active=True), params
+    ).order_by()
+
+    facets = {
+        name: [
+            {"value": facet_value(name, key, spelling), "count": count}
+            for key, count, spelling in opportunities.values_list(field)
+            # The skill filter's join can repeat an opportunity
+            .annotate(count=Count("id", distinct=True), spelling=Min(shown))
+            .order_by("-count", field)
+            .values_list(field, "count", "spelling")
+        ]
+        for name, (field, shown) in FACET_FIELDS.items()
+    }
+    # Every opportunity has exactly one category
+    total = sum(item["count"] for item in facets["category"])
+    return {"total": total, "facets": facets}
@@ -0,0 +1,182 @@
+"""
+Bulk opportunity import from CSV or JSON Lines.
+
+Records are read one at a time from the file and handled in chunks: each
+row is validated with ``OpportunityCreateUpdateSerializer``, the valid rows
+of a chunk are written with one ``bulk_create`` and their required skills
+with one through-table insert, all in the chunk's own transaction. Memory
+stays flat however long the file is; only the per-row errors are kept.
+
+``bulk_create`` skips ``save()`` and the model signals, so what they would
+have done is done here once per chunk: normalized filter columns, skill
+bitmaps, cache invalidation and background re-matching.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from core.mixins import split_param
+from core.utils import normalize_key
+from matching.index import refresh_opportunity_bitmaps
+from matching.tasks import schedule_new_opportunities_match
+from .cache import bump_generation
+from .models import Opportunity
+from .serializers import OpportunityCreateUpdateSerializer
+from .skills import clean_skill_names, resolve_skills
+
+FORMATS = {
+    "csv": "csv",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+}
+
+
+class MalformedRecord(ValueError):
+    """
+    A record that could not be parsed; yielded in its place by the readers
+    """
+
+
+def get_format(filename, requested=None):
+    """
+    ``"csv"`` or ``"jsonl"`` from an explicit choice or the file extension,
+    or None if neither is recognised
+    """
+    name = requested or filename.rsplit(".", 1)[-1]
+    return FORMATS.get((name or "").lower())
+
+
+def read_csv(binary_file):
+    """
+    Rows of a UTF-8 CSV file with a header line. Empty cells are left out (as
+    if the column were absent) and ``required_skills`` is comma-separated.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(binary_file, encoding="utf-8-sig"))
+    try:
+        for row in reader:
+            record = {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key is not None and isinstance(value, str) and value.strip()
+            }
+            if "required_skills" in record:
+                record["required_skills"] = split_param(record["required_skills"])
+            yield record
+    except (csv.Error, UnicodeDecodeError) as e:
+        # The rest of the file cannot be read reliably
+        yield MalformedRecord(f"Unreadable CSV: {e}")
+
+
+def read_jsonl(binary_file):
+    """
+    One JSON object per line; blank lines are skipped
+    """
+    for line in binary_file:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield MalformedRecord(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield MalformedRecord("Each line must be a JSON object")
+            continue
+        yield record
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+def read_records(binary_file, file_format):
+    return READERS[file_format](binary_file)
+
+
+def import_opportunities(employer, records, chunk_size=None):
+    """
+    Create opportunities for ``employer`` from an iterable of dicts (the
+    fields ``OpportunityListCreateView.post`` accepts). Returns a report:
+    ``{"created": n, "failed": n, "errors": [{"row": n, "errors": {...}}]}``
+    with 1-based row numbers.
+    """
+    chunk_size = chunk_size or getattr(settings, "OPPORTUNITY_IMPORT_CHUNK_SIZE", 500)
+    report = {"created": 0, "failed": 0, "errors": []}
+
+    # One serializer validates every row: building its fields is the
+    # expensive part, running them is cheap
+    serializer = OpportunityCreateUpdateSerializer()
+    rows = enumerate(records, start=1)
+    while chunk := list(islice(rows, chunk_size)):
+        import_chunk(employer, serializer, chunk, report)
+    # A chunk that failed to save reports its rows after the invalid ones
+    report["errors"].sort(key=lambda error: error["row"])
+    return report
+
+
+def import_chunk(employer, serializer, chunk, report):
+    """
+    Validate (with ``serializer``) and insert one chunk of ``(row number,
+    record)`` pairs, adding to ``report``
+    """
+
+    def fail(row, errors):
+        report["failed"] += 1
+        report["errors"].append({"row": row, "errors": errors})
+
+    valid = []
+    for row, record in chunk:
+        if isinstance(record, MalformedRecord):
+            fail(row, {"error": str(record)})
+            continue
+        try:
+            valid.append((row, serializer.run_validation(record)))
+        except ValidationError as e:
+            fail(row, as_serializer_error(e))
+    if not valid:
+        return
+
+    opportunities = []
+    skill_names = []
+    for row, data in valid:
+        names = clean_skill_names(data.pop("required_skills", []))
+        opportunity = Opportunity(employer=employer, **data)
+        opportunity.set_normalized_fields()
+        opportunities.append(opportunity)
+        skill_names.append(names)
+
+    try:
+        with transaction.atomic():
+            Opportunity.objects.bulk_create(opportunities)
+
+            # Every skill the chunk names, resolved together
+            skills = resolve_skills(name for names in skill_names for name in names)
+            skill_ids = {normalize_key(skill.name): skill.pk for skill in skills}
+            through = Opportunity.required_skills.through
+            through.objects.bulk_create(
+                [
+                    through(
+                        opportunity_id=opportunity.pk,
+                        skill_id=skill_ids[normalize_key(name)],
+                    )
+                    for opportunity, names in zip(opportunities, skill_names)
+                    for name in names
+                ]
+            )
+
+            opportunity_ids = [opportunity.pk for opportunity in opportunities]
+            refresh_opportunity_bitmaps(opportunity_ids)
+            transaction.on_commit(bump_generation)
+            schedule_new_opportunities_match(opportunity_ids)
+    except DatabaseError as e:
+        for row, _ in valid:
+            fail(row, {"error": f"Could not save: {e}"})
+        return
+
+    report["created"] += len(opportunities)
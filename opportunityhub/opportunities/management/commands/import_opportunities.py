@@ -0,0 +1,61 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from employers.models import EmployerProfile
+from opportunities.imports import get_format, import_opportunities, read_records
+
+
+class Command(BaseCommand):
+    help = "Create opportunities for an employer from a CSV or JSON Lines file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with a header line) or JSONL file")
+        parser.add_argument(
+            "--employer",
+            required=True,
+            help="Username of the employer account to post as",
+        )
+        parser.add_argument(
+            "--file-format",
+            choices=["csv", "jsonl"],
+            help="Override the format implied by the file extension",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Rows validated and inserted per transaction "
+            "(default: OPPORTUNITY_IMPORT_CHUNK_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            employer = EmployerProfile.objects.get(user__username=options["employer"])
+        except EmployerProfile.DoesNotExist:
+            raise CommandError(f"No employer profile for '{options['employer']}'")
+
+        file_format = get_format(options["path"], options["file_format"])
+        if file_format is None:
+            raise CommandError("Unsupported file type; use .csv or .jsonl")
+
+        started = time.monotonic()
+        try:
+            with open(options["path"], "rb") as binary_file:
+                report = import_opportunities(
+                    employer,
+                    read_records(binary_file, file_format),
+                    chunk_size=options["chunk_size"],
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        for error in report["errors"]:
+            self.stdout.write(f"  row {error['row']}: {json.dumps(error['errors'])}")
+        style = self.style.SUCCESS if not report["failed"] else self.style.WARNING
+        self.stdout.write(
+            style(
+                f"Imported {report['created']} opportunities in {elapsed:.1f}s "
+                f"({report['failed']} rows failed)"
+            )
+        )
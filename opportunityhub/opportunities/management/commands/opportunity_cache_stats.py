@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from opportunities.cache import reset_response_cache_stats, response_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss counts of the anonymous opportunity response cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after printing them",
+        )
+
+    def handle(self, *args, **options):
+        stats = response_cache_stats()
+        hit_rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+        self.stdout.write(
+            f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit rate: {hit_rate}"
+        )
+
+        if options["reset"]:
+            reset_response_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employers", "0001_initial"),
+        ("opportunities", "0002_application"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-created_at", "-id"],
+                name="opp_active_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:16
+
+import django.db.models.deletion
+import opportunities.search
+from django.db import migrations, models
+
+FTS_TABLE = "opportunities_opportunity_fts"
+
+CREATE_FTS = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title,
+        description,
+        content='opportunities_opportunity',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF title, description
+    ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    # Rank matches by BM25 with title hits weighing more than description hits
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(5.0, 1.0)')",
+    # Index the rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+DROP_FTS = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def run_sqlite_only(statements):
+    """FTS5 is SQLite-specific; other databases search with icontains"""
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("opportunities", "0003_opportunity_created_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite_only(CREATE_FTS), run_sqlite_only(DROP_FTS)),
+        migrations.CreateModel(
+            name="OpportunitySearchIndex",
+            fields=[
+                (
+                    "opportunity",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_index",
+                        serialize=False,
+                        to="opportunities.opportunity",
+                    ),
+                ),
+                ("title", models.TextField()),
+                ("description", models.TextField()),
+                (
+                    "document",
+                    opportunities.search.SearchDocumentField(
+                        db_column="opportunities_opportunity_fts"
+                    ),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "opportunities_opportunity_fts",
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:32
+
+from django.db import migrations, models
+
+import opportunities.search
+from core.utils import normalize_key
+
+
+def backfill_filter_keys(apps, schema_editor):
+    """Populate the lower-cased filter columns of existing opportunities"""
+    Opportunity = apps.get_model("opportunities", "Opportunity")
+    fields = ["county_key", "category_key", "type_key"]
+    batch = []
+    for opportunity in Opportunity.objects.only(
+        "id", "county", "category", "opportunity_type"
+    ).iterator(chunk_size=2000):
+        opportunity.county_key = normalize_key(opportunity.county)
+        opportunity.category_key = normalize_key(opportunity.category)
+        opportunity.type_key = normalize_key(opportunity.opportunity_type)
+        batch.append(opportunity)
+        if len(batch) == 2000:
+            Opportunity.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        Opportunity.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employers", "0001_initial"),
+        ("opportunities", "0004_opportunity_fts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="opportunity",
+            name="category_key",
+            field=models.CharField(default="", editable=False, max_length=50),
+        ),
+        migrations.AddField(
+            model_name="opportunity",
+            name="county_key",
+            field=models.CharField(default="", editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="opportunity",
+            name="type_key",
+            field=models.CharField(default="", editable=False, max_length=50),
+        ),
+        migrations.RunPython(backfill_filter_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["county_key", "-created_at", "-id"],
+                name="opp_active_county_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["county_key", "category_key", "-created_at", "-id"],
+                name="opp_active_county_cat_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["category_key", "-created_at", "-id"],
+                name="opp_active_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["type_key", "-created_at", "-id"],
+                name="opp_active_type_idx",
+            ),
+        ),
+        # The AddFields above rebuilt the table on SQLite, dropping the
+        # full-text sync triggers created in 0004
+        migrations.RunPython(
+            opportunities.search.install_fts_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-17 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employers", "0001_initial"),
+        ("opportunities", "0005_opportunity_filter_keys"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("salary_min__isnull", False)),
+                fields=["salary_min", "id"],
+                name="opp_active_salary_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("salary_min__isnull", True)),
+                fields=["id"],
+                name="opp_active_no_salary_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(
+                    ("application_deadline__isnull", False), ("is_active", True)
+                ),
+                fields=["application_deadline", "id"],
+                name="opp_active_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="opportunity",
+            index=models.Index(
+                condition=models.Q(
+                    ("application_deadline__isnull", True), ("is_active", True)
+                ),
+                fields=["id"],
+                name="opp_active_no_deadline_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.5 on 2026-10-17 20:43
+
+from django.db import migrations, models
+
+from core.utils import normalize_key
+
+
+def backfill_skill_keys(apps, schema_editor):
+    """Populate the lookup key of existing skills"""
+    Skill = apps.get_model("opportunities", "Skill")
+    batch = []
+    for skill in Skill.objects.only("id", "name").iterator(chunk_size=2000):
+        skill.key = normalize_key(skill.name)
+        batch.append(skill)
+        if len(batch) == 2000:
+            Skill.objects.bulk_update(batch, ["key"])
+            batch = []
+    if batch:
+        Skill.objects.bulk_update(batch, ["key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("opportunities", "0007_opportunity_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="skill",
+            name="key",
+            field=models.CharField(default="", editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_skill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(fields=["key"], name="opp_skill_key_idx"),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from core.tracking import LoadedValuesMixin
+from core.utils import normalize_key
 from employers.models import EmployerProfile
+from .search import FTS_TABLE, SearchDocumentField
 
 
 class Skill(models.Model):
@@ -8,14 +11,25 @@ class Skill(models.Model):
     """
 
     name = models.CharField(max_length=100, unique=True)
+    # normalize_key(name), kept by save(): skills are looked up by it so
+    # that case and spacing variants resolve to one skill
+    key = models.CharField(max_length=100, editable=False, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["key"], name="opp_skill_key_idx")]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        self.key = normalize_key(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = set(update_fields) | {"key"}
+        super().save(*args, **kwargs)
+
 
 class Opportunity(models.Model):
     """
@@ -85,24 +99,144 @@ class Opportunity(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Lower-cased copies of the filterable columns, kept in sync on save, so
+    # list filters are plain equality lookups the indexes below can answer
+    # (``__iexact`` wraps the column in UPPER()/LIKE and defeats any index)
+    county_key = models.CharField(max_length=100, editable=False, default="")
+    category_key = models.CharField(max_length=50, editable=False, default="")
+    type_key = models.CharField(max_length=50, editable=False, default="")
+
+    NORMALIZED_FIELDS = {
+        "county": "county_key",
+        "category": "category_key",
+        "opportunity_type": "type_key",
+    }
+
     class Meta:
         ordering = ["-created_at"]
+        # All partial on is_active: the public list only ever shows active
+        # postings, and SQLite renders the boolean filter as a bare column
+        # it cannot seek on
+        indexes = [
+            # Keyset pagination: ORDER BY created_at DESC, id DESC
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="opp_active_created_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?county=
+            models.Index(
+                fields=["county_key", "-created_at", "-id"],
+                name="opp_active_county_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?county=&category=
+            models.Index(
+                fields=["county_key", "category_key", "-created_at", "-id"],
+                name="opp_active_county_cat_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?category=
+            models.Index(
+                fields=["category_key", "-created_at", "-id"],
+                name="opp_active_category_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?type=
+            models.Index(
+                fields=["type_key", "-created_at", "-id"],
+                name="opp_active_type_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # ?ordering=salary / -salary (scanned in either direction);
+            # rows without the value follow, read through the next index
+            models.Index(
+                fields=["salary_min", "id"],
+                name="opp_active_salary_idx",
+                condition=models.Q(is_active=True, salary_min__isnull=False),
+            ),
+            models.Index(
+                fields=["id"],
+                name="opp_active_no_salary_idx",
+                condition=models.Q(is_active=True, salary_min__isnull=True),
+            ),
+            # ?ordering=deadline / -deadline
+            models.Index(
+                fields=["application_deadline", "id"],
+                name="opp_active_deadline_idx",
+                condition=models.Q(is_active=True, application_deadline__isnull=False),
+            ),
+            models.Index(
+                fields=["id"],
+                name="opp_active_no_deadline_idx",
+                condition=models.Q(is_active=True, application_deadline__isnull=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.employer.company_name}"
 
+    def set_normalized_fields(self):
+        """
+        Refresh the lower-cased filter columns; call before bulk_create,
+        which bypasses save()
+        """
+        for source, target in self.NORMALIZED_FIELDS.items():
+            setattr(self, target, normalize_key(getattr(self, source)))
+
+    def save(self, *args, **kwargs):
+        self.set_normalized_fields()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = set(update_fields) | {
+                self.NORMALIZED_FIELDS[name]
+                for name in update_fields
+                if name in self.NORMALIZED_FIELDS
+            }
+        super().save(*args, **kwargs)
 
-class Application(models.Model):
+
+class OpportunitySearchIndex(models.Model):
+    """
+    Read-only view of the SQLite FTS5 index over opportunity titles and
+    descriptions (created and kept in sync by triggers in migration 0004)
+    """
+
+    opportunity = models.OneToOneField(
+        Opportunity,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_index",
+    )
+    title = models.TextField()
+    description = models.TextField()
+    # FTS5's hidden columns: the table-named one takes MATCH queries, rank
+    # holds the BM25 score of the current match (lower is better)
+    document = SearchDocumentField(db_column=FTS_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
+class Application(LoadedValuesMixin, models.Model):
     """
     Job applications submitted by youth for opportunities
     """
 
+    # Status changes trigger the status email (see signals)
+    tracked_fields = ["status"]
+
     STATUS_CHOICES = [
         ("pending", "Pending"),
         ("reviewing", "Reviewing"),
         ("accepted", "Accepted"),
         ("rejected", "Rejected"),
     ]
+    # Changing to one of these emails the applicant
+    NOTIFIED_STATUSES = ["accepted", "rejected"]
 
     opportunity = models.ForeignKey(
         Opportunity, on_delete=models.CASCADE, related_name="applications"
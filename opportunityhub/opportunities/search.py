@@ -0,0 +1,122 @@
+"""
+Full-text search over opportunity titles and descriptions.
+
+On SQLite, ``opportunities_opportunity_fts`` is an external-content FTS5
+index over ``Opportunity.title`` and ``description``, kept in sync by
+triggers, so bulk writes and ``update()`` are covered too.
+Searches join it through ``OpportunitySearchIndex`` and rank by BM25, title
+hits weighing more than description hits. Other databases fall back to
+``icontains`` with the default ordering.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import F, Lookup, Q, TextField
+
+FTS_TABLE = "opportunities_opportunity_fts"
+
+# BM25 column weights (title, description), stored as the index's rank
+# function by migration 0004
+TITLE_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Keep the index in sync with the content table. SQLite drops a table's
+# triggers whenever Django rebuilds it (AddField with a default, AlterField,
+# ...), so every such migration on Opportunity must end by running
+# install_fts_triggers() again.
+FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai
+    AFTER INSERT ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad
+    AFTER DELETE ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, description ON opportunities_opportunity BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+def install_fts_triggers(apps, schema_editor):
+    """
+    Migration operation: (re)create the sync triggers and rebuild the index
+    from the content table, catching up on writes made while they were gone
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in FTS_TRIGGERS:
+        schema_editor.execute(statement)
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+# Keyset ordering of search results: best BM25 score first (FTS5 scores are
+# negative, lower is better), newest id breaking ties
+SEARCH_ORDERING = ("search_rank", "-id")
+
+
+class SearchDocumentField(TextField):
+    """
+    FTS5's hidden table-named column, which only supports ``__match``
+    """
+
+
+@SearchDocumentField.register_lookup
+class Match(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", lhs_params + rhs_params
+
+
+def fts_available():
+    return connection.vendor == "sqlite"
+
+
+def fts_query(text):
+    """
+    Turn free text into a safe FTS5 query: every word must match, the last
+    one as a prefix so search-as-you-type works. None if there are no words.
+    """
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_opportunities(queryset, text):
+    """
+    Restrict ``queryset`` to opportunities matching ``text`` and, where FTS
+    is available, annotate each with its ``search_rank``
+    """
+    if not fts_available():
+        return queryset.filter(
+            Q(title__icontains=text) | Q(description__icontains=text)
+        )
+
+    query = fts_query(text)
+    if query is None:
+        return queryset.annotate(search_rank=F("search_index__rank")).none()
+
+    # A single join: FTS5 produces the matches and their scores together
+    return queryset.filter(search_index__document__match=query).annotate(
+        search_rank=F("search_index__rank")
+    )
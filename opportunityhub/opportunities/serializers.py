@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from .models import Opportunity, Skill, Application
-from employers.serializers import EmployerProfileSerializer
+from core.mixins import DynamicFieldsMixin
+from employers.serializers import EmployerProfileSerializer, EmployerSummarySerializer
 from accounts.serializers import UserSerializer
+from matching.tasks import schedule_opportunity_rematch
+from .skills import resolve_skills
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -41,6 +44,39 @@ class OpportunitySerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "updated_at"]
 
 
+class OpportunityListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Compact serializer for opportunity lists: an employer summary instead of
+    the full profile, and no description unless asked for. Supports
+    ``?fields=`` and ``?expand=employer``.
+    """
+
+    employer = EmployerSummarySerializer(read_only=True)
+    required_skills = SkillSerializer(many=True, read_only=True)
+
+    default_fields = [
+        "id",
+        "employer",
+        "title",
+        "category",
+        "opportunity_type",
+        "county",
+        "city",
+        "required_skills",
+        "experience_required",
+        "salary_min",
+        "salary_max",
+        "application_deadline",
+        "created_at",
+    ]
+    expandable_fields = {"employer": EmployerProfileSerializer}
+
+    class Meta:
+        model = Opportunity
+        fields = OpportunitySerializer.Meta.fields
+        read_only_fields = fields
+
+
 class OpportunityCreateUpdateSerializer(serializers.ModelSerializer):
     """
     Serializer for creating/updating opportunities
@@ -72,10 +108,10 @@ class OpportunityCreateUpdateSerializer(serializers.ModelSerializer):
         opportunity = Opportunity.objects.create(**validated_data)
 
         # Add skills
-        for skill_name in skills_data:
-            skill, created = Skill.objects.get_or_create(name=skill_name.strip())
-            opportunity.required_skills.add(skill)
+        if skills_data:
+            opportunity.required_skills.add(*resolve_skills(skills_data))
 
+        schedule_opportunity_rematch(opportunity.pk)
         return opportunity
 
     def update(self, instance, validated_data):
@@ -86,13 +122,12 @@ class OpportunityCreateUpdateSerializer(serializers.ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
 
-        # Update skills if provided
+        # Update skills if provided: set() only inserts/deletes the difference
         if skills_data is not None:
-            instance.required_skills.clear()
-            for skill_name in skills_data:
-                skill, created = Skill.objects.get_or_create(name=skill_name.strip())
-                instance.required_skills.add(skill)
+            instance.required_skills.set(resolve_skills(skills_data))
 
+        # Only this posting's matches change; re-score it alone
+        schedule_opportunity_rematch(instance.pk)
         return instance
 
 
@@ -159,3 +194,20 @@ class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
         if value not in ["pending", "reviewing", "accepted", "rejected"]:
             raise serializers.ValidationError("Invalid status")
         return value
+
+
+class ApplicationBulkStatusSerializer(serializers.Serializer):
+    """
+    Serializer for employers setting one status on many applications
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+    def validate_ids(self, value):
+        # Repeats would make the ownership count check miscount
+        return list(dict.fromkeys(value))
@@ -1,38 +1,34 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.db import transaction
 from django.dispatch import receiver
-from .models import Application
+from django.utils import timezone
+from accounts.models import User
+from employers.models import EmployerProfile
+from .cache import bump_employer_version, bump_generation, bump_opportunity_version
+from .models import Application, Opportunity, Skill
 from notifications.email_service import EmailService
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-@receiver(pre_save, sender=Application)
-def track_application_status_change(sender, instance, **kwargs):
-    """
-    Track the old status before saving to detect changes
-    """
-    if instance.pk:  # Only for existing applications (updates)
-        try:
-            old_instance = Application.objects.get(pk=instance.pk)
-            instance._old_status = old_instance.status
-        except Application.DoesNotExist:
-            instance._old_status = None
-    else:
-        instance._old_status = None  # New application
-
-
 @receiver(post_save, sender=Application)
 def send_status_change_email(sender, instance, created, **kwargs):
     """
     Send email when application status changes to accepted or rejected
     """
     if not created:  # Only for updates, not new applications
-        old_status = getattr(instance, "_old_status", None)
+        # Still the value before this save (see core.tracking)
+        old_status = instance.get_loaded_value("status")
         new_status = instance.status
 
         # Only send email if status changed to accepted or rejected
-        if old_status != new_status and new_status in ["accepted", "rejected"]:
+        if old_status != new_status and new_status in Application.NOTIFIED_STATUSES:
             try:
                 youth = instance.youth
                 opportunity = instance.opportunity
@@ -49,3 +45,98 @@ def send_status_change_email(sender, instance, created, **kwargs):
 
             except Exception as e:
                 logger.error(f"Failed to send status email: {str(e)}")
+
+
+@receiver(post_save, sender=Opportunity)
+@receiver(post_delete, sender=Opportunity)
+def invalidate_opportunity_cache(sender, instance, **kwargs):
+    """
+    Drop cached responses and facet counts whenever an opportunity changes.
+    Deferred to commit, so a concurrent reader cannot cache pre-commit data
+    under the new version.
+    """
+    # post_delete leaves instance.pk None by the time the callback runs
+    opportunity_id = instance.pk
+    transaction.on_commit(lambda: bump_opportunity_version(opportunity_id))
+    transaction.on_commit(bump_generation)
+
+
+def touch_opportunities(opportunity_ids):
+    """
+    Bump updated_at without save() (no signals, no FTS reindex), so the
+    detail ETag / Last-Modified follow changes to embedded skills
+    """
+    Opportunity.objects.filter(pk__in=opportunity_ids).update(updated_at=timezone.now())
+
+
+def bump_opportunity_versions(opportunity_ids):
+    for opportunity_id in opportunity_ids:
+        transaction.on_commit(
+            lambda opportunity_id=opportunity_id: bump_opportunity_version(
+                opportunity_id
+            )
+        )
+    transaction.on_commit(bump_generation)
+
+
+@receiver(m2m_changed, sender=Opportunity.required_skills.through)
+def invalidate_required_skills_cache(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Required skills added/removed, from either side of the relation
+    """
+    if not reverse:
+        if not action.startswith("post_"):
+            return
+        opportunity_ids = [instance.pk]
+    elif action == "pre_clear":
+        # pk_set is not provided for clear(); collect the ids while they exist
+        opportunity_ids = list(instance.opportunities.values_list("id", flat=True))
+    elif action in ("post_add", "post_remove"):
+        opportunity_ids = list(pk_set)
+    else:
+        return
+    touch_opportunities(opportunity_ids)
+    bump_opportunity_versions(opportunity_ids)
+
+
+@receiver(post_save, sender=Skill)
+@receiver(pre_delete, sender=Skill)
+def invalidate_skill_cache(sender, instance, **kwargs):
+    """
+    Renamed or deleted skills show up in every opportunity requiring them
+    """
+    if kwargs.get("created"):
+        return
+    opportunity_ids = list(instance.opportunities.values_list("id", flat=True))
+    touch_opportunities(opportunity_ids)
+    bump_opportunity_versions(opportunity_ids)
+
+
+@receiver(post_save, sender=EmployerProfile)
+@receiver(post_delete, sender=EmployerProfile)
+def invalidate_employer_cache(sender, instance, **kwargs):
+    """
+    Opportunity responses embed their employer's profile
+    """
+    employer_id = instance.pk
+    transaction.on_commit(lambda: bump_employer_version(employer_id))
+    transaction.on_commit(bump_generation)
+
+
+@receiver(post_save, sender=User)
+def invalidate_employer_user_cache(sender, instance, created, update_fields, **kwargs):
+    """
+    ... and the employer's user account. Logins only touch last_login, which
+    is not shown, so they are skipped.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    for employer_id in EmployerProfile.objects.filter(user=instance).values_list(
+        "id", flat=True
+    ):
+        transaction.on_commit(
+            lambda employer_id=employer_id: bump_employer_version(employer_id)
+        )
+        transaction.on_commit(bump_generation)
@@ -0,0 +1,45 @@
+from core.utils import normalize_key
+from .models import Skill
+
+
+def clean_skill_names(names):
+    """
+    Skill names as entered, tidied: whitespace collapsed, blanks dropped and
+    repeats (ignoring case) dropped, keeping the first spelling
+    """
+    cleaned = {}
+    for name in names:
+        name = " ".join(str(name).split())
+        if name:
+            cleaned.setdefault(normalize_key(name), name)
+    return list(cleaned.values())
+
+
+def resolve_skills(names):
+    """
+    Skills for ``names`` (in order), creating any that do not exist yet, in
+    at most three queries however many names there are. An existing skill
+    matches whatever the case and spacing (see Skill.key) and keeps its
+    stored spelling.
+    """
+    names = clean_skill_names(names)
+    if not names:
+        return []
+
+    def find(keys):
+        # Variants stored by concurrent requests: the oldest wins
+        for skill in Skill.objects.filter(key__in=keys).order_by("pk"):
+            skills.setdefault(skill.key, skill)
+
+    skills = {}
+    find([normalize_key(name) for name in names])
+    missing = [name for name in names if normalize_key(name) not in skills]
+    if missing:
+        # A concurrent request may create the same skill first
+        Skill.objects.bulk_create(
+            [Skill(name=name, key=normalize_key(name)) for name in missing],
+            ignore_conflicts=True,
+        )
+        # ignore_conflicts leaves the new objects without primary keys
+        find([normalize_key(name) for name in missing])
+    return [skills[normalize_key(name)] for name in names]
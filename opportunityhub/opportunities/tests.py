@@ -1,3 +1,1172 @@
-from django.test import TestCase
+import json
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import skipUnless
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import User
+from core.idempotency import get_expiry_cutoff
+from core.models import IdempotencyKey
+from employers.models import EmployerProfile
+from .benchmarks import run_search_suite
+from .cache import (
+    GENERATION_KEY,
+    bump_generation,
+    employer_version_key,
+    get_cached_response,
+    get_version,
+    opportunity_version_key,
+    response_cache_stats,
+)
+from .filters import filter_opportunities
+from .models import Application, Opportunity, Skill
+from .search import search_opportunities
+from .serializers import OpportunityListSerializer
+
+
+class EmployerTestMixin:
+    """
+    An employer account and nothing else
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: no welcome email
+        (user,) = User.objects.bulk_create(
+            [User(username="employer", password="!", user_type="employer")]
+        )
+        cls.employer = EmployerProfile.objects.create(user=user, company_name="Acme")
+
+    @classmethod
+    def create_opportunity(cls, **fields):
+        category = fields.setdefault("category", "Technology")
+        return Opportunity.objects.create(
+            **{
+                "employer": cls.employer,
+                "title": f"{category} role",
+                "description": "Role description",
+                "opportunity_type": "Full-time",
+                "county": "Nairobi",
+                **fields,
+            }
+        )
+
+    def setUp(self):
+        # Anonymous list responses are cached across requests
+        cache.clear()
+
+
+class OpportunityFilterTestMixin(EmployerTestMixin):
+    """
+    Three postings differing in county, category and type
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for county, category, opportunity_type in [
+            ("Nairobi", "Technology", "Full-time"),
+            ("  nairobi ", "Finance", "Gig"),
+            ("Mombasa", "Technology", "Internship"),
+        ]:
+            cls.create_opportunity(
+                category=category, opportunity_type=opportunity_type, county=county
+            )
+
+
+class OpportunityFilterKeyTests(OpportunityFilterTestMixin, TestCase):
+    def test_save_maintains_normalized_keys(self):
+        opportunity = Opportunity.objects.get(county="  nairobi ")
+        self.assertEqual(opportunity.county_key, "nairobi")
+        self.assertEqual(opportunity.category_key, "finance")
+        self.assertEqual(opportunity.type_key, "gig")
+
+        opportunity.county = "Uasin  Gishu"
+        opportunity.save(update_fields=["county"])
+        opportunity.refresh_from_db()
+        self.assertEqual(opportunity.county_key, "uasin gishu")
+
+    def test_filters_are_case_insensitive(self):
+        response = self.client.get("/api/opportunities/", {"county": "NAIROBI"})
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(
+            "/api/opportunities/", {"county": "nairobi", "category": "technology"}
+        )
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class OpportunityListPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (user,) = User.objects.bulk_create(
+            [User(username="employer", password="!", user_type="employer")]
+        )
+        cls.employer = EmployerProfile.objects.create(user=user, company_name="Acme")
+        cls.opportunities = [cls.create_opportunity(f"Role {i}") for i in range(5)]
+        # Two postings created in the same instant: the id breaks the tie
+        Opportunity.objects.filter(pk=cls.opportunities[2].pk).update(
+            created_at=cls.opportunities[1].created_at
+        )
+
+    @classmethod
+    def create_opportunity(cls, title):
+        return Opportunity.objects.create(
+            employer=cls.employer,
+            title=title,
+            description="Role description",
+            category="Technology",
+            opportunity_type="Full-time",
+            county="Nairobi",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_page(self, cursor=None):
+        params = {"page_size": 2}
+        if cursor:
+            params["cursor"] = cursor
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/opportunities/", params)
+        self.assertEqual(response.status_code, 200)
+        for query in queries.captured_queries:
+            self.assertNotIn("COUNT(", query["sql"])
+            self.assertNotIn("OFFSET", query["sql"])
+        cursor = None
+        if response.data["next"]:
+            cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        return [item["title"] for item in response.data["results"]], cursor
+
+    def test_pages_newest_first_without_count_or_offset(self):
+        titles, cursor = self.get_page()
+        self.assertEqual(titles, ["Role 4", "Role 3"])
+        titles, cursor = self.get_page(cursor)
+        self.assertEqual(titles, ["Role 2", "Role 1"])
+        titles, cursor = self.get_page(cursor)
+        self.assertEqual(titles, ["Role 0"])
+        self.assertIsNone(cursor)
+
+    def test_new_postings_do_not_shift_later_pages(self):
+        _, cursor = self.get_page()
+        self.create_opportunity("Role 5")
+        cache.clear()
+        titles, _ = self.get_page(cursor)
+        self.assertEqual(titles, ["Role 2", "Role 1"])
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get("/api/opportunities/", {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 search is SQLite-specific")
+class OpportunityFilterKeyMigrationTests(TransactionTestCase):
+    def migrate(self, *targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(list(targets))
+
+    def tearDown(self):
+        self.migrate(*MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_search_stays_in_sync_after_the_table_rebuild(self):
+        self.migrate(("opportunities", "0004_opportunity_fts"))
+        self.migrate(("opportunities", "0005_opportunity_filter_keys"))
+
+        (user,) = User.objects.bulk_create(
+            [User(username="employer", password="!", user_type="employer")]
+        )
+        Opportunity.objects.create(
+            employer=EmployerProfile.objects.create(user=user, company_name="Acme"),
+            title="Zebra keeper",
+            description="Animal care",
+            category="Other",
+            opportunity_type="Gig",
+            county="Nakuru",
+        )
+        self.assertEqual(
+            list(
+                search_opportunities(Opportunity.objects.all(), "zebra").values_list(
+                    "title", flat=True
+                )
+            ),
+            ["Zebra keeper"],
+        )
+
+
+@skipUnless(connection.vendor == "sqlite", "query plans are SQLite-specific")
+class OpportunityFilterQueryPlanTests(OpportunityFilterTestMixin, TestCase):
+    def get_query_plan(self, params):
+        """
+        EXPLAIN QUERY PLAN of the page query the list view runs for ``params``
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/opportunities/", params)
+        self.assertEqual(response.status_code, 200)
+
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + queries.captured_queries[0]["sql"])
+            return " | ".join(row[-1] for row in cursor.fetchall())
+
+    def assertUsesIndex(self, params, index_name):
+        plan = self.get_query_plan(params)
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        # The index also yields the (created_at, id) order: no sort step
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_unfiltered_list_uses_created_index(self):
+        self.assertUsesIndex({}, "opp_active_created_idx")
+
+    def test_county_filter_uses_county_index(self):
+        self.assertUsesIndex({"county": "Nairobi"}, "opp_active_county_idx")
+
+    def test_county_and_category_filter_uses_county_index(self):
+        self.assertUsesIndex(
+            {"county": "Nairobi", "category": "Technology"},
+            "opp_active_county_cat_idx",
+        )
+
+    def test_category_filter_uses_category_index(self):
+        self.assertUsesIndex({"category": "Technology"}, "opp_active_category_idx")
+
+    def test_type_filter_uses_type_index(self):
+        self.assertUsesIndex({"type": "Gig"}, "opp_active_type_idx")
+
+    def test_orderings_use_sort_indexes(self):
+        for ordering, index_name in [
+            ("created", "opp_active_created_idx"),
+            ("salary", "opp_active_salary_idx"),
+            ("-salary", "opp_active_salary_idx"),
+            ("deadline", "opp_active_deadline_idx"),
+            ("-deadline", "opp_active_deadline_idx"),
+        ]:
+            with self.subTest(ordering=ordering):
+                self.assertUsesIndex({"ordering": ordering}, index_name)
+
+    def test_county_radius_uses_county_index(self):
+        plan = self.get_query_plan({"county": "Nairobi", "radius": 1})
+        self.assertIn("USING INDEX opp_active_county_idx", plan)
+
+    def test_next_page_uses_index_range_scan(self):
+        response = self.client.get(
+            "/api/opportunities/", {"county": "Nairobi", "page_size": 1}
+        )
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        self.assertUsesIndex(
+            {"county": "Nairobi", "page_size": 1, "cursor": cursor},
+            "opp_active_county_idx",
+        )
+
+    def test_rows_without_a_sort_value_use_their_own_index(self):
+        for ordering, index_name in [
+            ("salary", "opp_active_no_salary_idx"),
+            ("-deadline", "opp_active_no_deadline_idx"),
+        ]:
+            with self.subTest(ordering=ordering):
+                # No posting here states one: the first page ends among them
+                response = self.client.get(
+                    "/api/opportunities/", {"ordering": ordering, "page_size": 1}
+                )
+                query = parse_qs(urlparse(response.data["next"]).query)
+                self.assertUsesIndex(
+                    {"ordering": ordering, "page_size": 1, "cursor": query["cursor"]},
+                    index_name,
+                )
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 search is SQLite-specific")
+class OpportunitySearchTests(OpportunityFilterTestMixin, TestCase):
+    def search(self, text):
+        response = self.client.get("/api/opportunities/", {"q": text})
+        return [item["title"] for item in response.data["results"]]
+
+    def test_index_follows_inserts_updates_and_deletes(self):
+        self.assertEqual(self.search("technology"), ["Technology role"] * 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            opportunity = Opportunity.objects.create(
+                employer=self.employer,
+                title="Zebra keeper",
+                description="Animal care",
+                category="Other",
+                opportunity_type="Gig",
+                county="Nakuru",
+            )
+        self.assertEqual(self.search("zebra"), ["Zebra keeper"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            opportunity.title = "Lion keeper"
+            opportunity.save()
+        self.assertEqual(self.search("zebra"), [])
+        self.assertEqual(self.search("lio"), ["Lion keeper"])
+
+        # update() bypasses signals, so the cache is invalidated by hand
+        Opportunity.objects.filter(pk=opportunity.pk).update(description="Savannah")
+        bump_generation()
+        self.assertEqual(self.search("savannah"), ["Lion keeper"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            opportunity.delete()
+        self.assertEqual(self.search("lion"), [])
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 search is SQLite-specific")
+class OpportunitySearchBenchmarkTests(TestCase):
+    def test_samples_are_never_served_from_cache(self):
+        served = []
+
+        def lookup(key):
+            response = get_cached_response(key)
+            served.append(response)
+            return response
+
+        with patch("opportunities.views.get_cached_response", side_effect=lookup):
+            report = run_search_suite(postings=30, samples=3)
+        self.assertEqual(report["list"]["first_page"]["samples"], 3)
+        self.assertTrue(served)
+        self.assertEqual(set(map(type, served)), {type(None)})
+
+
+class OpportunitySearchRankingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (user,) = User.objects.bulk_create(
+            [User(username="employer", password="!", user_type="employer")]
+        )
+        employer = EmployerProfile.objects.create(user=user, company_name="Acme")
+        for title, description, county in [
+            ("Accountant", "Keep the books for our Python team", "Nairobi"),
+            ("Python developer", "Build APIs", "Nairobi"),
+            ("Python trainer", "Teach Python and Django", "Mombasa"),
+            ("Driver", "Deliveries around town", "Nairobi"),
+        ]:
+            Opportunity.objects.create(
+                employer=employer,
+                title=title,
+                description=description,
+                category="Technology",
+                opportunity_type="Full-time",
+                county=county,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, **params):
+        response = self.client.get("/api/opportunities/", params)
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.data["results"]], response.data
+
+    def test_title_hits_rank_above_description_hits(self):
+        titles, _ = self.search(q="python")
+        self.assertEqual(titles[-1], "Accountant")
+        self.assertCountEqual(
+            titles, ["Python trainer", "Python developer", "Accountant"]
+        )
+
+    def test_combines_with_filters_and_prefixes(self):
+        titles, _ = self.search(q="pyth", county="nairobi")
+        self.assertEqual(titles, ["Python developer", "Accountant"])
+        titles, _ = self.search(q="python django")
+        self.assertEqual(titles, ["Python trainer"])
+        titles, _ = self.search(q="?!")
+        self.assertEqual(titles, [])
+
+    def test_cursor_pages_through_ranked_results(self):
+        first, data = self.search(q="python")
+        seen = []
+        params = {"q": "python", "page_size": 1}
+        while True:
+            titles, data = self.search(**params)
+            seen += titles
+            if not data["next"]:
+                break
+            params["cursor"] = parse_qs(urlparse(data["next"]).query)["cursor"][0]
+        self.assertEqual(seen, first)
+
+
+class OpportunityFacetsTests(OpportunityFilterTestMixin, TestCase):
+    def get_facets(self, params=None):
+        response = self.client.get("/api/opportunities/facets/", params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counts_follow_filters(self):
+        data = self.get_facets()
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(
+            data["facets"]["county"],
+            [{"value": "Nairobi", "count": 2}, {"value": "Mombasa", "count": 1}],
+        )
+
+        data = self.get_facets({"county": "NAIROBI"})
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(
+            data["facets"]["category"],
+            [{"value": "Finance", "count": 1}, {"value": "Technology", "count": 1}],
+        )
+
+    def test_values_are_display_spellings(self):
+        Opportunity.objects.create(
+            employer=self.employer,
+            title="Clerk",
+            description="Role description",
+            category="Finance",
+            opportunity_type="Gig",
+            county="NAIROBI CITY",
+            experience_required="Entry Level",
+        )
+        facets = self.get_facets({"county": "nairobi city"})["facets"]
+        self.assertEqual(facets["county"], [{"value": "Nairobi City", "count": 1}])
+        self.assertEqual(facets["category"], [{"value": "Finance", "count": 1}])
+        self.assertEqual(facets["type"], [{"value": "Gig", "count": 1}])
+        self.assertEqual(facets["experience"], [{"value": "Entry Level", "count": 1}])
+
+    def test_skill_join_counts_each_opportunity_once(self):
+        opportunity = Opportunity.objects.get(county="Mombasa")
+        # Two spellings of one skill, as stored before names were matched
+        # case-insensitively
+        opportunity.required_skills.add(
+            Skill.objects.create(name="Python"), Skill.objects.create(name="python")
+        )
+        data = self.get_facets({"skill": "python"})
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["facets"]["county"], [{"value": "Mombasa", "count": 1}])
+
+    def test_cached_until_an_opportunity_changes(self):
+        self.get_facets()
+        with self.assertNumQueries(0):
+            self.get_facets()
+
+        opportunity = Opportunity.objects.get(county="Mombasa")
+        with self.captureOnCommitCallbacks(execute=True):
+            opportunity.county = "Nairobi"
+            opportunity.save()
+
+        data = self.get_facets()
+        self.assertEqual(data["facets"]["county"], [{"value": "Nairobi", "count": 3}])
+
+
+class OpportunityResponseCacheTests(OpportunityFilterTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.opportunity = Opportunity.objects.get(county="Mombasa")
+        self.detail_url = f"/api/opportunities/{self.opportunity.pk}/"
+
+    def test_anonymous_list_served_from_cache(self):
+        response = self.client.get("/api/opportunities/", {"county": "Nairobi"})
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        # Equivalent filters share the entry
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/opportunities/", {"county": "NAIROBI"})
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_list_invalidated_when_an_opportunity_changes(self):
+        self.client.get("/api/opportunities/", {"county": "Nairobi"})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.opportunity.county = "Nairobi"
+            self.opportunity.save()
+
+        response = self.client.get("/api/opportunities/", {"county": "Nairobi"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_detail_invalidated_when_its_opportunity_changes(self):
+        self.client.get(self.detail_url)
+        # Only the ETag lookup
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.detail_url)["X-Cache"], "HIT")
+
+        other = Opportunity.objects.get(county="Nairobi")
+        with self.captureOnCommitCallbacks(execute=True):
+            other.save()
+        # Another opportunity changing leaves this entry alone
+        self.assertEqual(self.client.get(self.detail_url)["X-Cache"], "HIT")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.opportunity.title = "Renamed role"
+            self.opportunity.save()
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "Renamed role")
+
+    def test_detail_invalidated_when_its_employer_changes(self):
+        self.client.get(self.detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employer.company_name = "Acme Ltd"
+            self.employer.save()
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["employer"]["company_name"], "Acme Ltd")
+
+    def test_deleting_an_opportunity_bumps_its_version(self):
+        version_key = opportunity_version_key(self.opportunity.pk)
+        version = get_version(version_key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.opportunity.delete()
+        self.assertNotEqual(get_version(version_key), version)
+
+    def test_deleting_an_employer_bumps_its_version(self):
+        version_key = employer_version_key(self.employer.pk)
+        version = get_version(version_key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.employer.delete()
+        self.assertNotEqual(get_version(version_key), version)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_login(self.employer.user)
+        response = self.client.get("/api/opportunities/")
+        self.assertFalse(response.has_header("X-Cache"))
+
+    def test_hit_and_miss_counters(self):
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.client.get(self.detail_url)
+        self.assertEqual(
+            response_cache_stats(), {"hits": 2, "misses": 1, "hit_rate": 0.6667}
+        )
+
+
+class OpportunityConditionalGetTests(OpportunityFilterTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.opportunity = Opportunity.objects.get(county="Mombasa")
+        self.detail_url = f"/api/opportunities/{self.opportunity.pk}/"
+
+    def get_etag(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_matching_etag_returns_304_after_one_lookup(self):
+        response = self.client.get(self.detail_url)
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"]
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_etag_follows_embedded_rows(self):
+        etag = self.get_etag()
+
+        self.employer.company_name = "Acme Ltd"
+        self.employer.save()
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        skill = Skill.objects.create(name="Welding")
+        self.opportunity.required_skills.add(skill)
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        skill.name = "Arc welding"
+        skill.save()
+        self.assertNotEqual(self.get_etag(), etag)
+
+    def test_missing_opportunity_is_404(self):
+        response = self.client.get("/api/opportunities/999999/")
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header("ETag"))
+
+
+class OpportunityListFieldsTests(OpportunityFilterTestMixin, TestCase):
+    def get_first(self, params=None):
+        response = self.client.get("/api/opportunities/", params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"][0]
+
+    def test_default_list_embeds_employer_summary(self):
+        item = self.get_first()
+        self.assertEqual(
+            item["employer"],
+            {"id": self.employer.id, "company_name": "Acme", "verified": False},
+        )
+        self.assertNotIn("description", item)
+
+    def test_expand_employer(self):
+        item = self.get_first({"expand": "employer"})
+        self.assertEqual(item["employer"]["user"]["username"], "employer")
+
+    def test_sparse_fields_skip_unrequested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            item = self.get_first({"fields": "id,title,description"})
+        self.assertEqual(set(item), {"id", "title", "description"})
+        # No join, no skills prefetch, and only the requested columns
+        self.assertEqual(len(queries), 1)
+        sql = queries.captured_queries[0]["sql"]
+        self.assertNotIn("employer", sql)
+        self.assertNotIn('"county"', sql)
+
+
+class OpportunityListFastPathTests(OpportunityFilterTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        opportunity = Opportunity.objects.create(
+            employer=cls.employer,
+            title="Café barista night shift",
+            description="Espresso été \U0001f600\u2028second line",
+            category="Hospitality",
+            opportunity_type="Part-time",
+            county="Kisumu",
+            salary_min=Decimal("15000"),
+            salary_max=Decimal("22500.5"),
+            application_deadline=date(2026, 12, 31),
+        )
+        opportunity.required_skills.add(
+            Skill.objects.create(name="Latte art"),
+            Skill.objects.create(name="Customer service"),
+        )
+
+    def serializer_output(self, params):
+        """
+        The list response as OpportunityListSerializer and DRF's stock
+        JSONRenderer produce it
+        """
+        request = Request(APIRequestFactory().get("/api/opportunities/", params))
+        page = filter_opportunities(
+            Opportunity.objects.filter(is_active=True), params
+        ).order_by("-created_at", "-id")
+        data = OpportunityListSerializer(
+            page, many=True, context={"request": request}
+        ).data
+        return JSONRenderer().render({"next": None, "results": data})
+
+    def assertMatchesSerializer(self, params):
+        response = self.client.get("/api/opportunities/", params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.serializer_output(params))
+
+    def test_default_fields_match_serializer_byte_for_byte(self):
+        self.assertMatchesSerializer({})
+
+    def test_sparse_fields_match_serializer_byte_for_byte(self):
+        self.assertMatchesSerializer(
+            {"fields": "id,title,description,salary_max,required_skills"}
+        )
+        self.assertMatchesSerializer({"fields": "employer,application_deadline"})
+
+    def test_filtered_page_runs_two_queries(self):
+        with self.assertNumQueries(2):  # page + grouped skills
+            self.client.get("/api/opportunities/", {"county": "Kisumu"})
+
+
+class OpportunitySalaryTests(OpportunityFilterTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for title, salary_min, salary_max in [
+            ("Junior", 20000, 30000),
+            ("Mid", 40000, 60000),
+            ("Senior", 80000, None),
+            ("Capped", None, 25000),
+        ]:
+            Opportunity.objects.create(
+                employer=cls.employer,
+                title=title,
+                description="Salaried role",
+                category="Finance",
+                opportunity_type="Full-time",
+                county="Nakuru",
+                salary_min=salary_min,
+                salary_max=salary_max,
+            )
+
+    def titles(self, params):
+        response = self.client.get("/api/opportunities/", params)
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.data["results"]]
+
+    def test_salary_filters_match_overlapping_ranges(self):
+        self.assertEqual(sorted(self.titles({"salary_min": 50000})), ["Mid", "Senior"])
+        self.assertEqual(
+            sorted(self.titles({"salary_max": 24000})), ["Capped", "Junior"]
+        )
+        self.assertEqual(
+            sorted(self.titles({"salary_min": 26000, "salary_max": 45000})),
+            ["Junior", "Mid"],
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in [{"salary_min": "lots"}, {"ordering": "title"}]:
+            response = self.client.get("/api/opportunities/", params)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.data)
+
+    def page_through(self, ordering, page_size):
+        titles, params = [], {"ordering": ordering, "page_size": page_size}
+        while True:
+            response = self.client.get("/api/opportunities/", params)
+            titles += [item["title"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return titles
+            query = parse_qs(urlparse(response.data["next"]).query)
+            params["cursor"] = query["cursor"][0]
+
+    def test_salary_ordering_lists_postings_without_a_salary_last(self):
+        # In id order among those without one, following the direction
+        without_salary = [
+            "Technology role",
+            "Finance role",
+            "Technology role",
+            "Capped",
+        ]
+        for page_size in [1, 2, 10]:
+            with self.subTest(page_size=page_size):
+                self.assertEqual(
+                    self.page_through("salary", page_size),
+                    ["Junior", "Mid", "Senior"] + without_salary,
+                )
+                self.assertEqual(
+                    self.page_through("-salary", page_size),
+                    ["Senior", "Mid", "Junior"] + without_salary[::-1],
+                )
+
+
+class OpportunityCountyRadiusTests(OpportunityFilterTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # Kiambu borders Nairobi; Nakuru borders Kiambu
+        for county in ["Kiambu", "Nakuru"]:
+            Opportunity.objects.create(
+                employer=cls.employer,
+                title=f"{county} role",
+                description="Role description",
+                category="Technology",
+                opportunity_type="Full-time",
+                county=county,
+            )
+
+    def counties(self, params):
+        counties, params = [], {**params, "page_size": 1}
+        while True:
+            response = self.client.get("/api/opportunities/", params)
+            self.assertEqual(response.status_code, 200)
+            counties += [item["county"] for item in response.data["results"]]
+            if not response.data["next"]:
+                return counties
+            query = parse_qs(urlparse(response.data["next"]).query)
+            params["cursor"] = query["cursor"][0]
+
+    def test_radius_adds_neighbours_nearest_first(self):
+        self.assertEqual(
+            self.counties({"county": "nairobi", "radius": 1}),
+            ["  nairobi ", "Nairobi", "Kiambu"],
+        )
+        self.assertEqual(
+            self.counties({"county": "Nairobi", "radius": 2}),
+            ["  nairobi ", "Nairobi", "Kiambu", "Nakuru"],
+        )
+
+    def test_radius_zero_or_unknown_county_matches_exactly(self):
+        self.assertEqual(len(self.counties({"county": "Nairobi", "radius": 0})), 2)
+        self.assertEqual(self.counties({"county": "Atlantis", "radius": 3}), [])
+
+    def test_invalid_radius_is_rejected(self):
+        response = self.client.get(
+            "/api/opportunities/", {"county": "Nairobi", "radius": "far"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class OpportunitySkillResolutionTests(OpportunityFilterTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.employer.user)
+        Skill.objects.create(name="Python")
+
+    def post_opportunity(self, skills):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/opportunities/",
+                {
+                    "title": "Developer",
+                    "description": "Build things",
+                    "category": "Technology",
+                    "opportunity_type": "Full-time",
+                    "county": "Nairobi",
+                    "required_skills": skills,
+                },
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 201)
+        return response.data["opportunity"], len(queries)
+
+    def test_query_count_does_not_grow_with_skills(self):
+        _, few = self.post_opportunity(["Python", "SQL"])
+        _, many = self.post_opportunity(
+            ["Python"] + [f"Skill {number}" for number in range(14)]
+        )
+        self.assertEqual(many, few)
+
+    def test_names_are_normalized_and_deduplicated(self):
+        opportunity, _ = self.post_opportunity(["  Python ", "python", "Data   entry"])
+        self.assertEqual(
+            [skill["name"] for skill in opportunity["required_skills"]],
+            ["Data entry", "Python"],
+        )
+        self.assertEqual(Skill.objects.filter(name__iexact="python").count(), 1)
+
+    def test_existing_skill_matches_whatever_the_case(self):
+        opportunity, _ = self.post_opportunity(["PYTHON", "sql"])
+        opportunity, _ = self.post_opportunity(["python", "SQL"])
+        self.assertEqual(
+            [skill["name"] for skill in opportunity["required_skills"]],
+            ["Python", "sql"],
+        )
+        self.assertEqual(
+            sorted(Skill.objects.values_list("name", flat=True)), ["Python", "sql"]
+        )
+
+    def test_spacing_variants_resolve_to_one_skill(self):
+        self.post_opportunity(["Machine learning"])
+        opportunity, _ = self.post_opportunity(["machine  LEARNING"])
+        self.assertEqual(
+            [skill["name"] for skill in opportunity["required_skills"]],
+            ["Machine learning"],
+        )
+        self.assertEqual(Skill.objects.filter(key="machine learning").count(), 1)
+
+    def test_key_follows_renames(self):
+        skill = Skill.objects.get(name="Python")
+        skill.name = "Python  3"
+        skill.save(update_fields=["name"])
+        skill.refresh_from_db()
+        self.assertEqual(skill.key, "python 3")
+
+    def test_update_only_changes_the_difference(self):
+        opportunity, _ = self.post_opportunity(["Python", "SQL"])
+        through = Opportunity.required_skills.through
+        kept = through.objects.get(opportunity_id=opportunity["id"], skill__name="SQL")
+
+        response = self.client.put(
+            f"/api/opportunities/{opportunity['id']}/",
+            {"required_skills": ["SQL", "Django"]},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        rows = through.objects.filter(opportunity_id=opportunity["id"])
+        self.assertEqual(
+            sorted(rows.values_list("skill__name", flat=True)), ["Django", "SQL"]
+        )
+        self.assertTrue(rows.filter(pk=kept.pk).exists())
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class OpportunityImportTests(EmployerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.employer.user)
+
+    def upload(self, name, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/opportunities/import/",
+                {"file": SimpleUploadedFile(name, content.encode("utf-8"))},
+            )
+
+    def jsonl_rows(self, count):
+        return "\n".join(
+            json.dumps(
+                {
+                    "title": f"Imported {number}",
+                    "description": "Bulk posting",
+                    "category": "Agriculture",
+                    "opportunity_type": "Contract",
+                    "county": "Kisumu",
+                    "required_skills": ["Farming", f"Skill {number}"],
+                }
+            )
+            for number in range(count)
+        )
+
+    def test_csv_rows_are_created_with_an_error_report(self):
+        generation = cache.get(GENERATION_KEY)
+        response = self.upload(
+            "roles.csv",
+            "title,description,category,opportunity_type,county,required_skills,"
+            "salary_min\n"
+            'Picker,Tea picking,Agriculture,Gig,Kericho,"Farming, Driving",\n'
+            "Broken,No category,Nonsense,Gig,Kericho,,\n"
+            "Driver,Deliveries,Other,Contract, Kericho ,Driving,15000\n",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["failed"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertIn("category", response.data["errors"][0]["errors"])
+
+        picker = Opportunity.objects.get(title="Picker")
+        self.assertEqual(picker.employer, self.employer)
+        self.assertEqual(picker.salary_min, None)
+        self.assertEqual(
+            sorted(picker.required_skills.values_list("name", flat=True)),
+            ["Driving", "Farming"],
+        )
+        # bulk_create skips save(): the filter columns are set by the import
+        self.assertEqual(Opportunity.objects.filter(county_key="kericho").count(), 2)
+        self.assertNotEqual(cache.get(GENERATION_KEY), generation)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        with CaptureQueriesContext(connection) as few:
+            self.upload("few.jsonl", self.jsonl_rows(3))
+        with CaptureQueriesContext(connection) as many:
+            self.upload("many.jsonl", self.jsonl_rows(30))
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(Opportunity.objects.filter(county_key="kisumu").count(), 33)
+
+    def test_malformed_lines_are_reported(self):
+        response = self.upload(
+            "roles.jsonl", self.jsonl_rows(1) + "\n\n{not json\n[1, 2]\n"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3])
+
+    def test_rejects_unknown_formats_and_non_employers(self):
+        response = self.upload("roles.xlsx", "")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.data)
+
+        (youth,) = User.objects.bulk_create(
+            [User(username="youth", password="!", user_type="youth")]
+        )
+        self.client.force_login(youth)
+        response = self.upload("roles.jsonl", self.jsonl_rows(1))
+        self.assertEqual(response.status_code, 403)
+
+
+class OpportunityApplyTests(EmployerTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.opportunity = cls.create_opportunity()
+
+    def setUp(self):
+        super().setUp()
+        (self.youth,) = User.objects.bulk_create(
+            [User(username="youth", password="!", user_type="youth")]
+        )
+        self.client.force_login(self.youth)
+        self.url = f"/api/opportunities/{self.opportunity.pk}/apply/"
+
+    def apply(self, key=None, cover_letter="Hello"):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        return self.client.post(
+            self.url,
+            {"cover_letter": cover_letter},
+            content_type="application/json",
+            **headers,
+        )
+
+    def test_duplicate_apply_is_rejected_by_the_constraint(self):
+        self.assertEqual(self.apply().status_code, 201)
+        # A concurrent request would skip any pre-check; only the insert fails
+        response = self.apply()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.data)
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_idempotency_key_replays_the_stored_response(self):
+        first = self.apply(key="tap-1")
+        second = self.apply(key="tap-1")
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_idempotency_key_reused_for_another_request(self):
+        self.apply(key="tap-1")
+        response = self.apply(key="tap-1", cover_letter="Something else")
+        self.assertEqual(response.status_code, 422)
+
+    def test_idempotency_key_still_in_progress(self):
+        IdempotencyKey.objects.create(
+            user=self.youth, key="tap-1", request_hash="pending"
+        )
+        response = self.apply(key="tap-1")
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Application.objects.exists())
+
+    def test_expired_idempotency_key_runs_again(self):
+        record = IdempotencyKey.objects.create(
+            user=self.youth, key="tap-1", request_hash="old", status_code=400
+        )
+        IdempotencyKey.objects.filter(pk=record.pk).update(
+            created_at=get_expiry_cutoff() - timedelta(seconds=1)
+        )
+        self.assertEqual(self.apply(key="tap-1").status_code, 201)
+        self.assertEqual(IdempotencyKey.objects.get().status_code, 201)
+
+
+@patch("opportunities.signals.EmailService.send_application_status_update")
+class ApplicationStatusTrackingTests(OpportunityFilterTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        (youth,) = User.objects.bulk_create(
+            [User(username="youth", password="!", user_type="youth")]
+        )
+        self.application = Application.objects.create(
+            opportunity=Opportunity.objects.first(), youth=youth
+        )
+
+    def test_status_update_needs_no_extra_select(self, send_email):
+        application = Application.objects.get(pk=self.application.pk)
+        application.status = "reviewing"
+        with self.assertNumQueries(1):  # the UPDATE; no re-read of the old row
+            application.save()
+        send_email.assert_not_called()
+
+    def test_email_sent_once_per_change(self, send_email):
+        application = Application.objects.get(pk=self.application.pk)
+        application.status = "accepted"
+        application.save()
+        self.assertEqual(send_email.call_args.kwargs["status"], "accepted")
+
+        # The saved status is the new baseline
+        application.cover_letter = "Updated"
+        application.save()
+        self.assertEqual(send_email.call_count, 1)
+
+    def test_hand_built_instance_reads_the_old_status(self, send_email):
+        application = Application.objects.get(pk=self.application.pk)
+        copy = Application(
+            pk=application.pk,
+            opportunity_id=application.opportunity_id,
+            youth_id=application.youth_id,
+            applied_at=application.applied_at,
+            status="rejected",
+        )
+        copy.save()
+        send_email.assert_called_once()
+
+
+@override_settings(EMAIL_RUN_ASYNC=False)
+class ApplicationBulkStatusTests(EmployerTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        youth = User.objects.bulk_create(
+            [
+                User(
+                    username=f"youth{number}",
+                    email=f"youth{number}@example.com",
+                    password="!",
+                    user_type="youth",
+                )
+                for number in range(3)
+            ]
+        )
+        opportunity = self.create_opportunity()
+        self.applications = [
+            Application.objects.create(opportunity=opportunity, youth=user)
+            for user in youth
+        ]
+        Application.objects.filter(pk=self.applications[0].pk).update(status="accepted")
+        self.ids = [application.pk for application in self.applications]
+        self.client.force_login(self.employer.user)
+
+    def bulk_update(self, ids, new_status):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/opportunities/applications/bulk-status/",
+                {"ids": ids, "status": new_status},
+                content_type="application/json",
+            )
+
+    @patch("notifications.tasks.EmailService.send_application_status_updates")
+    def test_one_select_one_update_one_email_batch(self, send_emails):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk_update(self.ids, "accepted")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.data["updated"]), self.ids[1:])
+        self.assertEqual(response.data["unchanged"], self.ids[:1])
+
+        statements = [
+            query["sql"].split()[0]
+            for query in queries.captured_queries
+            if "opportunities_application" in query["sql"]
+        ]
+        self.assertEqual(statements, ["SELECT", "UPDATE"])
+        self.assertEqual(
+            set(Application.objects.values_list("status", flat=True)), {"accepted"}
+        )
+
+        # Only the two applications that changed are emailed, in one call
+        send_emails.assert_called_once()
+        messages, attempts = send_emails.call_args.args
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(attempts, 3)
+
+    @override_settings(EMAIL_RUN_ASYNC=True)
+    @patch("notifications.tasks.EmailService.send_application_status_updates")
+    @patch("notifications.tasks._get_executor")
+    def test_emails_are_sent_in_the_background(self, get_executor, send_emails):
+        response = self.bulk_update(self.ids, "rejected")
+        self.assertEqual(response.status_code, 200)
+        send_emails.assert_not_called()
+
+        submit = get_executor.return_value.submit
+        submit.assert_called_once()
+        submit.call_args.args[0]()
+        send_emails.assert_called_once()
+
+    @patch("notifications.email_service.time.sleep")
+    @patch(
+        "notifications.email_service.EmailService._send_batch",
+        side_effect=[False, True],
+    )
+    def test_refused_batch_is_retried(self, send_batch, sleep):
+        response = self.bulk_update(self.ids, "rejected")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(send_batch.call_count, 2)
+        self.assertEqual(send_batch.call_args_list[0], send_batch.call_args_list[1])
+        sleep.assert_called_once_with(1)
+
+    @patch("notifications.tasks.EmailService.send_application_status_updates")
+    def test_statuses_without_email(self, send_emails):
+        response = self.bulk_update(self.ids, "reviewing")
+        self.assertEqual(response.status_code, 200)
+        send_emails.assert_not_called()
+
+    def test_other_employers_applications_are_refused(self):
+        (user,) = User.objects.bulk_create(
+            [User(username="other", password="!", user_type="employer")]
+        )
+        other = EmployerProfile.objects.create(user=user, company_name="Other")
+        opportunity = Opportunity.objects.create(
+            employer=other,
+            title="Other role",
+            description="Role description",
+            category="Other",
+            opportunity_type="Gig",
+            county="Nakuru",
+        )
+        foreign = Application.objects.create(
+            opportunity=opportunity, youth=self.applications[0].youth
+        )
+
+        response = self.bulk_update(self.ids + [foreign.pk, 999999], "rejected")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data["ids"], [foreign.pk, 999999])
+        self.assertFalse(Application.objects.filter(status="rejected").exists())
+
+    def test_invalid_status(self):
+        response = self.bulk_update(self.ids, "hired")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
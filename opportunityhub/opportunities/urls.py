@@ -1,17 +1,28 @@
 from django.urls import path
 from .views import (
     OpportunityListCreateView,
+    OpportunityFacetsView,
+    OpportunityImportView,
     OpportunityDetailView,
     ApplyOpportunityView,
     MyApplicationsView,
     EmployerApplicationsView,
     ApplicationDetailView,
+    ApplicationBulkStatusView,
 )
+from matching.views import OpportunityCandidateListView
 
 urlpatterns = [
     # Opportunities
     path("", OpportunityListCreateView.as_view(), name="opportunity-list-create"),
+    path("import/", OpportunityImportView.as_view(), name="opportunity-import"),
+    path("facets/", OpportunityFacetsView.as_view(), name="opportunity-facets"),
     path("<int:pk>/", OpportunityDetailView.as_view(), name="opportunity-detail"),
+    path(
+        "<int:pk>/candidates/",
+        OpportunityCandidateListView.as_view(),
+        name="opportunity-candidates",
+    ),
     # Applications
     path("<int:pk>/apply/", ApplyOpportunityView.as_view(), name="apply-opportunity"),
     path("applications/my/", MyApplicationsView.as_view(), name="my-applications"),
@@ -20,6 +31,11 @@ urlpatterns = [
         EmployerApplicationsView.as_view(),
         name="employer-applications",
     ),
+    path(
+        "applications/bulk-status/",
+        ApplicationBulkStatusView.as_view(),
+        name="application-bulk-status",
+    ),
     path(
         "applications/<int:pk>/",
         ApplicationDetailView.as_view(),
@@ -2,54 +2,112 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from core.conditional import conditional_get
+from core.idempotency import idempotent
+from core.pagination import KeysetPagination
+from core.renderers import FastJSONRenderer
+from .cache import (
+    cache_response,
+    detail_cache_key,
+    employer_version_key,
+    get_cached_response,
+    get_facets,
+    list_cache_key,
+)
+from .fastpath import FastListPlan
+from .imports import get_format, import_opportunities, read_records
+from .filters import (
+    COUNTY_DISTANCE_ORDERING,
+    annotate_county_distance,
+    filter_opportunities,
+    get_ordering,
+    nearby_county_keys,
+)
 from .models import Opportunity
+from .search import SEARCH_ORDERING, fts_available
 from employers.models import EmployerProfile
-from .serializers import OpportunitySerializer, OpportunityCreateUpdateSerializer
+from .serializers import (
+    OpportunitySerializer,
+    OpportunityCreateUpdateSerializer,
+    OpportunityListSerializer,
+)
 
 
 class OpportunityListCreateView(APIView):
     """
-    GET: List all opportunities (with filtering)
+    GET: List all opportunities (with filtering), newest first, cursor paginated
     POST: Create new opportunity (employers only)
     """
 
+    keyset_ordering = ("-created_at", "-id")
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
     def get_permissions(self):
         # Anyone can view opportunities, only authenticated users can create
         if self.request.method == "GET":
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_keyset_ordering(self, request):
+        ordering = get_ordering(request.query_params)
+        if ordering is not None:
+            return ordering
+        # Full-text results come best match first
+        if request.query_params.get("q") and fts_available():
+            return SEARCH_ORDERING
+        # ?radius= lists the named county, then its neighbours
+        if nearby_county_keys(request.query_params):
+            return COUNTY_DISTANCE_ORDERING
+        return self.keyset_ordering
+
     def get(self, request):
         """List opportunities with optional filtering"""
-        opportunities = (
-            Opportunity.objects.select_related("employer", "employer__user")
-            .prefetch_related("required_skills")
-            .filter(is_active=True)
+        # Anonymous responses are identical for everyone: serve from cache
+        cache_key = None
+        if not request.user.is_authenticated:
+            cache_key = list_cache_key(request)
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        opportunities = filter_opportunities(
+            Opportunity.objects.filter(is_active=True), request.query_params
         )
+        sort_fields = [name.lstrip("-") for name in self.get_keyset_ordering(request)]
+        if "county_distance" in sort_fields:
+            opportunities = annotate_county_distance(
+                opportunities, request.query_params
+            )
+        paginator = KeysetPagination()
 
-        # Filter by category
-        category = request.query_params.get("category")
-        if category:
-            opportunities = opportunities.filter(category__iexact=category)
-
-        # Filter by county/location
-        county = request.query_params.get("county")
-        if county:
-            opportunities = opportunities.filter(county__iexact=county)
-
-        # Filter by skill
-        skill = request.query_params.get("skill")
-        if skill:
-            opportunities = opportunities.filter(required_skills__name__iexact=skill)
-
-        # Filter by opportunity type
-        opp_type = request.query_params.get("type")
-        if opp_type:
-            opportunities = opportunities.filter(opportunity_type__iexact=opp_type)
+        plan = FastListPlan.for_serializer(
+            OpportunityListSerializer(context={"request": request})
+        )
+        if plan is not None:
+            # Plain values() rows, no serializer per row
+            rows = paginator.paginate_queryset(
+                plan.values(opportunities, sort_fields), request, view=self
+            )
+            data = plan.build(rows)
+        else:
+            # Only fetch what the requested fields show, plus the sort key
+            opportunities = OpportunityListSerializer.optimize_queryset(
+                opportunities, request, extra_fields=sort_fields
+            )
+            page = paginator.paginate_queryset(opportunities, request, view=self)
+            data = OpportunityListSerializer(
+                page, many=True, context={"request": request}
+            ).data
 
-        serializer = OpportunitySerializer(opportunities, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = paginator.get_paginated_response(data)
+        if cache_key is not None:
+            cache_response(cache_key, response)
+        return response
 
     def post(self, request):
         """Create new opportunity (employers only)"""
@@ -77,6 +135,79 @@ class OpportunityListCreateView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class OpportunityImportView(APIView):
+    """
+    POST: Create many opportunities from an uploaded CSV or JSON Lines file
+    (employers only); responds with a per-row error report
+    """
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        """Import opportunities from the ``file`` upload"""
+        try:
+            employer_profile = EmployerProfile.objects.get(user=request.user)
+        except EmployerProfile.DoesNotExist:
+            return Response(
+                {"error": "Only employers can import opportunities"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Upload a CSV or JSON Lines file as 'file'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        file_format = get_format(upload.name, request.data.get("file_format"))
+        if file_format is None:
+            return Response(
+                {"error": "Unsupported file type; use .csv or .jsonl"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report = import_opportunities(
+            employer_profile, read_records(upload, file_format)
+        )
+        return Response(
+            {
+                "message": f"Imported {report['created']} opportunities",
+                **report,
+            },
+            status=(
+                status.HTTP_201_CREATED
+                if report["created"]
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+
+class OpportunityFacetsView(APIView):
+    """
+    GET: Counts of active opportunities per category, county, type and
+    experience level, for the same filters the list accepts
+    """
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        """Facet counts for the current filter set"""
+        return Response(get_facets(request.query_params), status=status.HTTP_200_OK)
+
+
+def opportunity_timestamps(request, pk):
+    """
+    The response embeds the employer profile, so both rows' updated_at
+    """
+    rows = (
+        Opportunity.objects.filter(pk=pk)
+        .order_by()
+        .values_list("updated_at", "employer__updated_at")[:1]
+    )
+    return rows[0] if rows else None
+
+
 class OpportunityDetailView(APIView):
     """
     GET: Retrieve single opportunity
@@ -90,8 +221,16 @@ class OpportunityDetailView(APIView):
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    @conditional_get(opportunity_timestamps)
     def get(self, request, pk):
         """Get single opportunity details"""
+        cache_key = None
+        if not request.user.is_authenticated:
+            cache_key = detail_cache_key(pk)
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
         opportunity = get_object_or_404(
             Opportunity.objects.select_related(
                 "employer", "employer__user"
@@ -99,7 +238,15 @@ class OpportunityDetailView(APIView):
             pk=pk,
         )
         serializer = OpportunitySerializer(opportunity)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        if cache_key is not None:
+            # The embedded employer can change without the opportunity doing so
+            cache_response(
+                cache_key,
+                response,
+                depends_on=[employer_version_key(opportunity.employer_id)],
+            )
+        return response
 
     def put(self, request, pk):
         """Update opportunity (owner only)"""
@@ -165,7 +312,10 @@ from .serializers import (
     ApplicationSerializer,
     ApplicationCreateSerializer,
     ApplicationStatusUpdateSerializer,
+    ApplicationBulkStatusSerializer,
 )
+from notifications.email_service import EmailService
+from notifications.tasks import schedule_application_status_emails
 
 
 class ApplyOpportunityView(APIView):
@@ -175,8 +325,9 @@ class ApplyOpportunityView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @idempotent
     def post(self, request, pk):
-        """Apply for an opportunity"""
+        """Apply for an opportunity (supports an ``Idempotency-Key`` header)"""
         # Check if user is youth
         if request.user.user_type != "youth":
             return Response(
@@ -184,35 +335,42 @@ class ApplyOpportunityView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Get the opportunity
-        opportunity = get_object_or_404(Opportunity, pk=pk, is_active=True)
-
-        # Check if already applied
-        if Application.objects.filter(
-            opportunity=opportunity, youth=request.user
-        ).exists():
-            return Response(
-                {"error": "You have already applied for this opportunity"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        # The opportunity, with the employer the response embeds
+        opportunity = get_object_or_404(
+            Opportunity.objects.select_related("employer", "employer__user"),
+            pk=pk,
+            is_active=True,
+        )
 
         # Validate and create application
         serializer = ApplicationCreateSerializer(
             data=request.data, context={"opportunity": opportunity}
         )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        if serializer.is_valid():
-            application = serializer.save(opportunity=opportunity, youth=request.user)
-            # Return full application data
-            full_serializer = ApplicationSerializer(application)
+        # No exists() pre-check: the unique (opportunity, youth) constraint
+        # also settles two concurrent requests
+        try:
+            with transaction.atomic():
+                application = serializer.save(
+                    opportunity=opportunity, youth=request.user
+                )
+        except IntegrityError:
             return Response(
-                {
-                    "message": "Application submitted successfully",
-                    "application": full_serializer.data,
-                },
-                status=status.HTTP_201_CREATED,
+                {"error": "You have already applied for this opportunity"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Return full application data
+        full_serializer = ApplicationSerializer(application)
+        return Response(
+            {
+                "message": "Application submitted successfully",
+                "application": full_serializer.data,
+            },
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class MyApplicationsView(APIView):
@@ -362,3 +520,80 @@ class ApplicationDetailView(APIView):
                 status=status.HTTP_200_OK,
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ApplicationBulkStatusView(APIView):
+    """
+    POST: Set one status on many applications (employer only)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Update the status of every application in ``ids``"""
+        if request.user.user_type != "employer":
+            return Response(
+                {"error": "Only employers can update application status"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = ApplicationBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data["ids"]
+        new_status = serializer.validated_data["status"]
+
+        with transaction.atomic():
+            # Ownership check and everything the emails need, in one query
+            rows = list(
+                Application.objects.filter(
+                    id__in=ids, opportunity__employer__user=request.user
+                ).values(
+                    "id",
+                    "status",
+                    "youth__email",
+                    "youth__first_name",
+                    "youth__username",
+                    "opportunity__title",
+                    "opportunity__employer__company_name",
+                )
+            )
+            if len(rows) != len(ids):
+                owned = {row["id"] for row in rows}
+                return Response(
+                    {
+                        "error": "You can only update applications for your opportunities",
+                        "ids": [pk for pk in ids if pk not in owned],
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+            # update() skips save() and its signals: one statement for all
+            changed = [row for row in rows if row["status"] != new_status]
+            if changed:
+                Application.objects.filter(
+                    id__in=[row["id"] for row in changed]
+                ).update(status=new_status, updated_at=timezone.now())
+
+            if new_status in Application.NOTIFIED_STATUSES:
+                messages = [
+                    EmailService.build_application_status_update(
+                        user_email=row["youth__email"],
+                        user_name=row["youth__first_name"] or row["youth__username"],
+                        opportunity_title=row["opportunity__title"],
+                        status=new_status,
+                        employer_name=row["opportunity__employer__company_name"],
+                    )
+                    for row in changed
+                ]
+                # Batched Resend calls, in the background after commit
+                schedule_application_status_emails(messages)
+
+        return Response(
+            {
+                "message": f"{len(changed)} applications updated to {new_status}",
+                "updated": [row["id"] for row in changed],
+                "unchanged": [row["id"] for row in rows if row["status"] == new_status],
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -185,9 +185,55 @@ DEFAULT_FROM_EMAIL = "OpportunityHub Kenya <onboarding@resend.dev>"
 # Email timeout
 EMAIL_TIMEOUT = 10  # seconds
 
+# Bulk status emails are sent on a background thread pool, each Resend batch
+# tried up to EMAIL_SEND_ATTEMPTS times
+EMAIL_RUN_ASYNC = True
+EMAIL_WORKER_THREADS = 1
+EMAIL_SEND_ATTEMPTS = 3
+
 # Admin emails (for error notifications)
 ADMINS = [("Admin", "admin@opportunityhub.co.ke")]
 
+# ==================== CACHE CONFIGURATION ====================
+
+# Local memory by default; set REDIS_URL to share the cache between workers
+REDIS_URL = os.environ.get("REDIS_URL", "")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "opportunityhub",
+        }
+    }
+
+# Seconds facet counts are served from cache (also invalidated on any
+# opportunity change)
+FACETS_CACHE_TIMEOUT = 300
+
+# Seconds anonymous opportunity list/detail responses are served from cache
+# (also invalidated when the opportunity or its employer changes)
+OPPORTUNITY_CACHE_TIMEOUT = 600
+
+# ==================== OPPORTUNITY IMPORT ====================
+
+# Rows validated and inserted per transaction by the bulk import endpoint
+# and the import_opportunities command
+OPPORTUNITY_IMPORT_CHUNK_SIZE = 500
+
+# ==================== IDEMPOTENCY KEYS ====================
+
+# Seconds a stored Idempotency-Key response is replayed for; older keys can
+# be reused and are deleted by the purge_idempotency_keys command
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
 # ==================== LOGGING CONFIGURATION ====================
 # Create logs directory if it doesn't exist
 LOGS_DIR = BASE_DIR / "logs"
@@ -228,5 +274,34 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "matching": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
+
+# ==================== MATCHING CONFIGURATION ====================
+
+# Number of recommendations stored per youth profile
+MATCH_TOP_K = 50
+
+# Matches scoring below this (0-100) are not stored; postings that list
+# skills score 0 for a youth with none of them, whatever this is set to
+MATCH_MIN_SCORE = 40
+
+# Number of candidates stored per opportunity for employers' ranked lists
+MATCH_CANDIDATE_LIMIT = 500
+
+# Re-scoring after profile/opportunity edits runs on a background thread pool
+MATCH_RUN_ASYNC = True
+MATCH_WORKER_THREADS = 2
+
+# Match digests: only matches at or above this score are emailed, at most
+# MATCH_DIGEST_MAX_ITEMS per digest
+MATCH_DIGEST_MIN_SCORE = 60
+MATCH_DIGEST_MAX_ITEMS = 10
+
+# Base URL used for links in outgoing emails
+SITE_URL = os.environ.get("SITE_URL", "http://127.0.0.1:8000")
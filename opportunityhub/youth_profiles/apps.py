@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class YouthProfilesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "youth_profiles"
+
+    def ready(self):
+        import youth_profiles.signals
@@ -1,5 +1,6 @@
 from django.db import models
 from accounts.models import User
+from core.tracking import LoadedValuesMixin
 
 
 class Skill(models.Model):
@@ -28,11 +29,14 @@ class Skill(models.Model):
         return self.name
 
 
-class YouthProfile(models.Model):
+class YouthProfile(LoadedValuesMixin, models.Model):
     """
     Extended profile for youth users
     """
 
+    # The fields match scores depend on (see matching.signals)
+    tracked_fields = ["county", "preferred_work_type", "years_of_experience"]
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
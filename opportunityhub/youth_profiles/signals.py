@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from accounts.models import User
+from .models import Experience, Skill, YouthProfile, YouthSkill
+
+
+def touch_profiles(**filters):
+    """
+    Bump updated_at without save(): no signals, no rematch
+    """
+    YouthProfile.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=YouthSkill)
+@receiver(post_delete, sender=YouthSkill)
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def touch_profile_on_child_change(sender, instance, **kwargs):
+    """
+    Skills and experiences are part of the profile response, so changing
+    them must change its ETag / Last-Modified
+    """
+    touch_profiles(pk=instance.youth_profile_id)
+
+
+@receiver(post_save, sender=Skill)
+def touch_profiles_on_skill_rename(sender, instance, created, **kwargs):
+    if not created:
+        touch_profiles(youthskill__skill=instance)
+
+
+@receiver(post_save, sender=User)
+def touch_profile_on_user_change(sender, instance, created, update_fields, **kwargs):
+    """
+    The profile response embeds the user account. Logins only touch
+    last_login, which is not shown.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    touch_profiles(user=instance)
@@ -1,3 +1,72 @@
-from django.test import TestCase
+from unittest.mock import patch
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from .models import Experience, Skill, YouthProfile, YouthSkill
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class YouthProfileConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # bulk_create: no welcome email
+        (cls.user,) = User.objects.bulk_create(
+            [User(username="youth", password="!", user_type="youth")]
+        )
+        cls.profile = YouthProfile.objects.create(user=cls.user, county="Nairobi")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get_etag(self):
+        response = self.client.get("/api/youth/profile/")
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_matching_etag_returns_304(self):
+        etag = self.get_etag()
+        with self.assertNumQueries(3):  # session, user, updated_at lookup
+            response = self.client.get("/api/youth/profile/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_follows_skills_experiences_and_account(self):
+        etag = self.get_etag()
+        skill = Skill.objects.create(name="Python")
+        YouthSkill.objects.create(youth_profile=self.profile, skill=skill)
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        Experience.objects.create(
+            youth_profile=self.profile,
+            title="Intern",
+            company="Acme",
+            start_date="2024-01-01",
+        )
+        self.assertNotEqual(self.get_etag(), etag)
+
+        etag = self.get_etag()
+        self.user.first_name = "Wanjiru"
+        self.user.save()
+        self.assertNotEqual(self.get_etag(), etag)
+
+
+@override_settings(MATCH_RUN_ASYNC=False)
+class YouthProfileRematchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        (user,) = User.objects.bulk_create(
+            [User(username="youth", password="!", user_type="youth")]
+        )
+        cls.profile = YouthProfile.objects.create(user=user, county="Nairobi")
+
+    @patch("matching.signals.schedule_profile_rematch")
+    def test_only_scoring_fields_trigger_a_rematch(self, schedule):
+        profile = YouthProfile.objects.get(pk=self.profile.pk)
+        profile.city = "Westlands"
+        profile.save()
+        schedule.assert_not_called()
+
+        profile.county = "Kiambu"
+        profile.save()
+        schedule.assert_called_once_with(profile.pk)
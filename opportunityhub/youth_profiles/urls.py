@@ -8,6 +8,7 @@ from .views import (
     ExperienceListCreateView,
     ExperienceDetailView,
 )
+from matching.views import RecommendationListView
 
 urlpatterns = [
     # Youth Profile
@@ -17,6 +18,12 @@ urlpatterns = [
     path("skills/", YouthSkillListView.as_view(), name="youth-skill-list"),
     path("skills/add/", YouthSkillAddView.as_view(), name="youth-skill-add"),
     path("skills/<int:pk>/", YouthSkillDetailView.as_view(), name="youth-skill-detail"),
+    # Recommendations
+    path(
+        "recommendations/",
+        RecommendationListView.as_view(),
+        name="youth-recommendations",
+    ),
     # Experience Management
     path(
         "experience/", ExperienceListCreateView.as_view(), name="experience-list-create"
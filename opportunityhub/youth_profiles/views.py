@@ -3,6 +3,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
+from core.conditional import conditional_get
 
 from .models import YouthProfile, Skill, YouthSkill, Experience
 from .serializers import (
@@ -14,6 +15,12 @@ from .serializers import (
 )
 
 
+def youth_profile_timestamps(request):
+    return YouthProfile.objects.filter(user=request.user).values_list(
+        "updated_at", flat=True
+    )[:1]
+
+
 class YouthProfileView(generics.RetrieveUpdateAPIView):
     """
     GET/PUT /api/youth/profile/
@@ -29,6 +36,10 @@ class YouthProfileView(generics.RetrieveUpdateAPIView):
         )
         return youth_profile
 
+    @conditional_get(youth_profile_timestamps)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def update(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = YouthProfileCreateSerializer(